@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import logging
+from datetime import datetime, timedelta
 
 import voluptuous as vol
 from homeassistant.config_entries import ConfigEntry, ConfigEntryState
@@ -12,52 +13,104 @@ from homeassistant.core import (
     ServiceCall,
     ServiceResponse,
     SupportsResponse,
+    callback,
 )
 from homeassistant.exceptions import ServiceValidationError
 from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.storage import STORAGE_DIR, Store
 from homeassistant.helpers.typing import ConfigType
 
+from . import websocket_api
 from .const import (
+    ATTR_BARCODES,
     ATTR_BRANDS,
     ATTR_CATEGORIES,
+    ATTR_GROUP_BY,
     ATTR_KEYWORDS,
     ATTR_LIMIT,
+    ATTR_NAME,
     ATTR_PRODUCT_NAMES,
+    ATTR_QUERIES,
     DOMAIN,
+    MAX_RECENT_RECALLS,
+    RECONCILE_CHECK_INTERVAL,
+    SERVICE_CHECK_BARCODE,
+    SERVICE_GET_RECENT_RECALLS,
+    SERVICE_RECALL_STATISTICS,
     SERVICE_SEARCH_RECALLS,
+    SERVICE_SEARCH_RECALLS_BATCH,
+    STORE_FILENAME,
 )
 from .coordinator import RappelConsoCoordinator
+from .gtin import normalize_gtin
+from .known_ids import STORAGE_KEY as KNOWN_IDS_STORAGE_KEY
+from .known_ids import STORAGE_VERSION as KNOWN_IDS_STORAGE_VERSION
+from .search import GROUP_BY_FIELDS, SearchCriteria
+from .store import RecallStore
 
 _LOGGER = logging.getLogger(__name__)
 
 PLATFORMS: list[Platform] = [Platform.SENSOR]
 
+SEARCH_RECALLS_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_PRODUCT_NAMES): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional(ATTR_BRANDS): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional(ATTR_CATEGORIES): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional(ATTR_KEYWORDS): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional(ATTR_LIMIT, default=100): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=1000)
+        ),
+    }
+)
+
+RECALL_STATISTICS_SCHEMA = SEARCH_RECALLS_SCHEMA.extend(
+    {vol.Required(ATTR_GROUP_BY): vol.In(list(GROUP_BY_FIELDS))}
+)
+
+
+def _get_coordinator(hass: HomeAssistant) -> RappelConsoCoordinator:
+    """Return the coordinator of the first loaded config entry."""
+    # Get all loaded config entries
+    entries = hass.config_entries.async_entries(DOMAIN)
+    if not entries:
+        raise ServiceValidationError(
+            translation_domain=DOMAIN,
+            translation_key="no_config_entry",
+        )
+
+    # Get the first loaded entry's coordinator
+    entry = next((e for e in entries if e.state == ConfigEntryState.LOADED), None)
+    if not entry:
+        raise ServiceValidationError(
+            translation_domain=DOMAIN,
+            translation_key="config_entry_not_loaded",
+        )
+
+    coordinator: RappelConsoCoordinator = hass.data[DOMAIN][entry.entry_id]
+    return coordinator
+
 
 async def async_setup(  # pylint: disable=unused-argument
     hass: HomeAssistant,
     config: ConfigType,  # noqa: ARG001
 ) -> bool:
     """Set up the Rappel Conso integration."""
+    _async_register_services(hass)
+    _async_register_statistics_service(hass)
+    websocket_api.async_setup(hass)
 
-    async def handle_search_recalls(call: ServiceCall) -> ServiceResponse:
-        """Handle the search_recalls service call."""
-        # Get all loaded config entries
-        entries = hass.config_entries.async_entries(DOMAIN)
-        if not entries:
-            raise ServiceValidationError(
-                translation_domain=DOMAIN,
-                translation_key="no_config_entry",
-            )
+    return True
 
-        # Get the first loaded entry's coordinator
-        entry = next((e for e in entries if e.state == ConfigEntryState.LOADED), None)
-        if not entry:
-            raise ServiceValidationError(
-                translation_domain=DOMAIN,
-                translation_key="config_entry_not_loaded",
-            )
 
-        coordinator: RappelConsoCoordinator = hass.data[DOMAIN][entry.entry_id]
+@callback
+def _async_register_services(hass: HomeAssistant) -> None:
+    """Register the service actions."""
+
+    async def handle_search_recalls(call: ServiceCall) -> ServiceResponse:
+        """Handle the search_recalls service call."""
+        coordinator = _get_coordinator(hass)
 
         # Extract service parameters
         product_names = call.data.get(ATTR_PRODUCT_NAMES)
@@ -95,37 +148,226 @@ async def async_setup(  # pylint: disable=unused-argument
                 translation_placeholders={"error": str(err)},
             ) from err
 
-    # Define service schema
-    service_schema = vol.Schema(
-        {
-            vol.Optional(ATTR_PRODUCT_NAMES): vol.All(cv.ensure_list, [cv.string]),
-            vol.Optional(ATTR_BRANDS): vol.All(cv.ensure_list, [cv.string]),
-            vol.Optional(ATTR_CATEGORIES): vol.All(cv.ensure_list, [cv.string]),
-            vol.Optional(ATTR_KEYWORDS): vol.All(cv.ensure_list, [cv.string]),
-            vol.Optional(ATTR_LIMIT, default=100): vol.All(
-                vol.Coerce(int), vol.Range(min=1, max=1000)
+    async def handle_search_recalls_batch(call: ServiceCall) -> ServiceResponse:
+        """Handle the search_recalls_batch service call."""
+        coordinator = _get_coordinator(hass)
+
+        queries: dict[str, SearchCriteria] = {}
+        for query in call.data[ATTR_QUERIES]:
+            name = query[ATTR_NAME]
+            if name in queries:
+                raise ServiceValidationError(
+                    translation_domain=DOMAIN,
+                    translation_key="duplicate_query_name",
+                    translation_placeholders={"name": name},
+                )
+            criteria = SearchCriteria.from_lists(
+                product_names=query.get(ATTR_PRODUCT_NAMES),
+                brands=query.get(ATTR_BRANDS),
+                categories=query.get(ATTR_CATEGORIES),
+                keywords=query.get(ATTR_KEYWORDS),
+            )
+            if not criteria:
+                raise ServiceValidationError(
+                    translation_domain=DOMAIN,
+                    translation_key="query_without_criteria",
+                    translation_placeholders={"name": name},
+                )
+            queries[name] = criteria
+
+        try:
+            results = await coordinator.async_search_recalls_batch(
+                queries, limit=call.data[ATTR_LIMIT]
+            )
+        except Exception as err:
+            raise ServiceValidationError(
+                translation_domain=DOMAIN,
+                translation_key="search_failed",
+                translation_placeholders={"error": str(err)},
+            ) from err
+
+        return {
+            "queries": {
+                name: {"recalls": recalls, "count": len(recalls)}
+                for name, recalls in results.items()
+            },
+            "recall_count": len(
+                {recall["id"] for recalls in results.values() for recall in recalls}
             ),
         }
-    )
 
-    # Register the service
+    async def handle_check_barcode(call: ServiceCall) -> ServiceResponse:
+        """Handle the check_barcode service call."""
+        coordinator = _get_coordinator(hass)
+        barcodes: list[str] = call.data[ATTR_BARCODES]
+
+        try:
+            recalls_by_barcode = await coordinator.async_check_barcodes(barcodes)
+        except Exception as err:
+            raise ServiceValidationError(
+                translation_domain=DOMAIN,
+                translation_key="search_failed",
+                translation_placeholders={"error": str(err)},
+            ) from err
+
+        results = [
+            {
+                "barcode": barcode,
+                "valid": normalize_gtin(barcode) is not None,
+                "recalled": bool(recalls),
+                "recalls": recalls,
+            }
+            for barcode, recalls in recalls_by_barcode.items()
+        ]
+        return {
+            "barcodes": results,
+            "recalled_count": sum(1 for result in results if result["recalled"]),
+        }
+
+    async def handle_get_recent_recalls(call: ServiceCall) -> ServiceResponse:
+        """Handle the get_recent_recalls service call."""
+        coordinator = _get_coordinator(hass)
+
+        try:
+            recalls = await coordinator.async_get_recent_recalls(call.data[ATTR_LIMIT])
+        except Exception as err:
+            raise ServiceValidationError(
+                translation_domain=DOMAIN,
+                translation_key="search_failed",
+                translation_placeholders={"error": str(err)},
+            ) from err
+
+        return {"recalls": recalls, "count": len(recalls)}
+
+    # Register the services
     hass.services.async_register(
         DOMAIN,
         SERVICE_SEARCH_RECALLS,
         handle_search_recalls,
-        schema=service_schema,
+        schema=SEARCH_RECALLS_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SEARCH_RECALLS_BATCH,
+        handle_search_recalls_batch,
+        schema=vol.Schema(
+            {
+                vol.Required(ATTR_QUERIES): vol.All(
+                    cv.ensure_list,
+                    [
+                        vol.Schema(
+                            {
+                                vol.Required(ATTR_NAME): cv.string,
+                                vol.Optional(ATTR_PRODUCT_NAMES): vol.All(
+                                    cv.ensure_list, [cv.string]
+                                ),
+                                vol.Optional(ATTR_BRANDS): vol.All(
+                                    cv.ensure_list, [cv.string]
+                                ),
+                                vol.Optional(ATTR_CATEGORIES): vol.All(
+                                    cv.ensure_list, [cv.string]
+                                ),
+                                vol.Optional(ATTR_KEYWORDS): vol.All(
+                                    cv.ensure_list, [cv.string]
+                                ),
+                            }
+                        )
+                    ],
+                    vol.Length(min=1),
+                ),
+                vol.Optional(ATTR_LIMIT, default=100): vol.All(
+                    vol.Coerce(int), vol.Range(min=1, max=1000)
+                ),
+            }
+        ),
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_CHECK_BARCODE,
+        handle_check_barcode,
+        schema=vol.Schema(
+            {
+                vol.Required(ATTR_BARCODES): vol.All(
+                    cv.ensure_list, [cv.string], vol.Length(min=1)
+                ),
+            }
+        ),
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_RECENT_RECALLS,
+        handle_get_recent_recalls,
+        schema=vol.Schema(
+            {
+                vol.Optional(ATTR_LIMIT, default=MAX_RECENT_RECALLS): vol.All(
+                    vol.Coerce(int), vol.Range(min=1, max=1000)
+                ),
+            }
+        ),
         supports_response=SupportsResponse.ONLY,
     )
 
-    return True
+
+@callback
+def _async_register_statistics_service(hass: HomeAssistant) -> None:
+    """Register the recall_statistics service action."""
+
+    async def handle_recall_statistics(call: ServiceCall) -> ServiceResponse:
+        """Handle the recall_statistics service call."""
+        coordinator = _get_coordinator(hass)
+        criteria = SearchCriteria.from_lists(
+            product_names=call.data.get(ATTR_PRODUCT_NAMES),
+            brands=call.data.get(ATTR_BRANDS),
+            categories=call.data.get(ATTR_CATEGORIES),
+            keywords=call.data.get(ATTR_KEYWORDS),
+        )
+
+        try:
+            groups = await coordinator.async_get_statistics(
+                call.data[ATTR_GROUP_BY], criteria, call.data[ATTR_LIMIT]
+            )
+        except Exception as err:
+            raise ServiceValidationError(
+                translation_domain=DOMAIN,
+                translation_key="statistics_failed",
+                translation_placeholders={"error": str(err)},
+            ) from err
+
+        return {
+            "group_by": call.data[ATTR_GROUP_BY],
+            "groups": groups,
+            "count": len(groups),
+        }
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_RECALL_STATISTICS,
+        handle_recall_statistics,
+        schema=RECALL_STATISTICS_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Rappel Conso from a config entry."""
-    coordinator = RappelConsoCoordinator(hass)
+    coordinator = RappelConsoCoordinator(hass, entry)
+
+    # Open the local recall store before syncing into it
+    await coordinator.async_load()
 
-    # Fetch initial data
-    await coordinator.async_config_entry_first_refresh()
+    # Start from the last synced data when there is some, and only wait for
+    # the API on the very first setup
+    restored = await coordinator.async_restore_data()
+    if not restored:
+        try:
+            await coordinator.async_config_entry_first_refresh()
+        except Exception:
+            await coordinator.async_shutdown()
+            raise
 
     # Store coordinator
     hass.data.setdefault(DOMAIN, {})
@@ -134,9 +376,44 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     # Set up platforms
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
+    if restored:
+        entry.async_create_background_task(
+            hass, coordinator.async_refresh(), f"{DOMAIN} refresh"
+        )
+
+    # Download the rest of the dataset once, for local searches
+    if not coordinator.mirror_complete:
+        entry.async_create_background_task(
+            hass, coordinator.async_bootstrap(), f"{DOMAIN} bootstrap"
+        )
+
+    # Look for changes deep in the history, rarely and apart from the polls
+    @callback
+    def _async_check_reconcile(_now: datetime) -> None:
+        if coordinator.reconcile_due():
+            entry.async_create_background_task(
+                hass, coordinator.async_reconcile(), f"{DOMAIN} reconcile"
+            )
+
+    entry.async_on_unload(
+        async_track_time_interval(
+            hass,
+            _async_check_reconcile,
+            timedelta(seconds=RECONCILE_CHECK_INTERVAL),
+        )
+    )
+
+    # Apply option changes by reloading the entry
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
+
     return True
 
 
+async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload the config entry when its options change."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
@@ -146,3 +423,14 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         await coordinator.async_shutdown()
 
     return unload_ok
+
+
+async def async_remove_entry(  # pylint: disable=unused-argument
+    hass: HomeAssistant,
+    entry: ConfigEntry,  # noqa: ARG001
+) -> None:
+    """Delete the local mirror and the known recall IDs with the entry."""
+    await RecallStore(
+        hass, hass.config.path(STORAGE_DIR, STORE_FILENAME)
+    ).async_remove()
+    await Store(hass, KNOWN_IDS_STORAGE_VERSION, KNOWN_IDS_STORAGE_KEY).async_remove()
@@ -0,0 +1,251 @@
+"""Rate-limited access to the Rappel Conso API."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+from contextlib import AbstractAsyncContextManager
+from email.utils import parsedate_to_datetime
+from http import HTTPStatus
+from importlib.util import find_spec
+from typing import Any
+
+import httpx
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.httpx_client import create_async_httpx_client
+from homeassistant.util import dt as dt_util
+from homeassistant.util.ssl import client_context
+
+from .circuit import STATE_HALF_OPEN, CircuitBreaker
+from .const import (
+    API_CIRCUIT_FAILURES,
+    API_CIRCUIT_RESET,
+    API_KEEPALIVE_EXPIRY,
+    API_MAX_CONNECTIONS,
+    API_MAX_RETRIES,
+    API_MAX_RETRY_AFTER,
+    API_RATE_BURST,
+    API_RATE_LIMIT,
+    API_RETRY_BACKOFF,
+    API_TIMEOUT,
+    DOMAIN,
+)
+from .ratelimit import TokenBucket
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_API = f"{DOMAIN}_api"
+
+# HTTP/2 needs the h2 package, a requirement that may still be missing in
+# development environments
+HTTP2_AVAILABLE = find_spec("h2") is not None
+
+# Statuses worth retrying a GET for
+RETRY_STATUSES = frozenset(
+    {
+        HTTPStatus.TOO_MANY_REQUESTS,
+        HTTPStatus.BAD_GATEWAY,
+        HTTPStatus.SERVICE_UNAVAILABLE,
+        HTTPStatus.GATEWAY_TIMEOUT,
+    }
+)
+
+
+def get_api(hass: HomeAssistant) -> RappelConsoApi:
+    """Return the API access shared by every caller."""
+    if DATA_API not in hass.data:
+        # Home Assistant's client settings and shutdown, with our own pool
+        transport = httpx.AsyncHTTPTransport(
+            verify=client_context(),
+            http2=HTTP2_AVAILABLE,
+            limits=httpx.Limits(
+                max_connections=API_MAX_CONNECTIONS,
+                max_keepalive_connections=API_MAX_CONNECTIONS,
+                keepalive_expiry=API_KEEPALIVE_EXPIRY,
+            ),
+        )
+        client = create_async_httpx_client(
+            hass, transport=transport, timeout=API_TIMEOUT, follow_redirects=True
+        )
+        hass.data[DATA_API] = RappelConsoApi(
+            client,
+            TokenBucket(API_RATE_LIMIT, API_RATE_BURST),
+            CircuitBreaker(API_CIRCUIT_FAILURES, API_CIRCUIT_RESET),
+        )
+    api: RappelConsoApi = hass.data[DATA_API]
+    return api
+
+
+class ApiUnavailableError(httpx.TransportError):
+    """Request not sent because the circuit breaker is open."""
+
+    def __init__(self) -> None:
+        """Initialize the error."""
+        super().__init__("Rappel Conso API unavailable, circuit breaker open")
+
+
+def is_unavailable(err: httpx.HTTPError) -> bool:
+    """Return True when an error tells the API is down, not the request wrong."""
+    if isinstance(err, httpx.HTTPStatusError):
+        return (
+            err.response.status_code >= HTTPStatus.INTERNAL_SERVER_ERROR
+            or err.response.status_code == HTTPStatus.TOO_MANY_REQUESTS
+        )
+    return isinstance(err, httpx.TransportError)
+
+
+def _retry_after(response: httpx.Response) -> float | None:
+    """Return the delay asked by a Retry-After header, in seconds."""
+    value = response.headers.get("Retry-After")
+    if not isinstance(value, str):
+        return None
+    if value.strip().isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, (retry_at - dt_util.utcnow()).total_seconds())
+
+
+class RappelConsoApi:
+    """Send API requests within a shared rate limit, retrying GETs.
+
+    Every request waits for a token of the shared bucket. GETs failing with a
+    transport error or a throttling or gateway status are retried a few times,
+    after the delay asked by ``Retry-After`` (which also holds every other
+    request) or a jittered exponential back-off. GETs still failing count
+    towards the circuit breaker, which then rejects requests for a while.
+    """
+
+    def __init__(
+        self, client: httpx.AsyncClient, limiter: TokenBucket, breaker: CircuitBreaker
+    ) -> None:
+        """Initialize the API access."""
+        self.client = client
+        self.limiter = limiter
+        self.breaker = breaker
+        self.requests = 0
+        self.retries = 0
+        self.rate_limited = 0
+        # Connections opened, so requests - connections were reused ones
+        self.connections = 0
+        self.tls_handshakes = 0
+        self.http2_responses = 0
+
+    @property
+    def reused_connections(self) -> int:
+        """Return the number of requests sent on an already open connection."""
+        return max(0, self.requests - self.connections)
+
+    async def _trace(self, event_name: str, _info: dict[str, Any]) -> None:
+        """Count the connections opened by the pool."""
+        if event_name == "connection.connect_tcp.complete":
+            self.connections += 1
+        elif event_name == "connection.start_tls.complete":
+            self.tls_handshakes += 1
+
+    def _count_response(self, response: httpx.Response) -> None:
+        """Count the responses received over HTTP/2."""
+        if response.http_version == "HTTP/2":
+            self.http2_responses += 1
+
+    async def get(
+        self,
+        url: str,
+        *,
+        params: dict[str, Any],
+        headers: dict[str, str] | None = None,
+        max_retries: int = API_MAX_RETRIES,
+        timeout: float | None = None,
+    ) -> httpx.Response:
+        """Send a GET request.
+
+        Setup checks and action calls waiting for a response pass fewer
+        ``max_retries`` and a shorter ``timeout`` than polling, so that an
+        unresponsive API fails them quickly.
+
+        Returns:
+            The response, whose status is left to the caller to check
+
+        Raises:
+            ApiUnavailableError: If the circuit breaker is open
+            httpx.TransportError: If the last attempt failed to connect
+        """
+        if not self.breaker.allow():
+            raise ApiUnavailableError
+        # The probe of a half-open circuit is a single attempt
+        retry_limit = 0 if self.breaker.state == STATE_HALF_OPEN else max_retries
+        attempt = 0
+        options: dict[str, Any] = {} if timeout is None else {"timeout": timeout}
+        while True:
+            await self.limiter.acquire()
+            self.requests += 1
+            try:
+                response = await self.client.get(
+                    url,
+                    params=params,
+                    headers=headers,
+                    extensions={"trace": self._trace},
+                    **options,
+                )
+            except httpx.TransportError as err:
+                if attempt >= retry_limit:
+                    self.breaker.record_failure()
+                    raise
+                delay = self._backoff(attempt)
+                _LOGGER.debug("Retrying in %.1f s after %s", delay, err)
+            else:
+                self._count_response(response)
+                if response.status_code not in RETRY_STATUSES:
+                    if response.status_code >= HTTPStatus.INTERNAL_SERVER_ERROR:
+                        self.breaker.record_failure()
+                    else:
+                        self.breaker.record_success()
+                    return response
+                retry_after = _retry_after(response)
+                if response.status_code == HTTPStatus.TOO_MANY_REQUESTS:
+                    self.rate_limited += 1
+                if attempt >= retry_limit or (
+                    retry_after is not None and retry_after > API_MAX_RETRY_AFTER
+                ):
+                    self.breaker.record_failure()
+                    return response
+                if retry_after is not None:
+                    # Every request waits, this one in the limiter queue
+                    self.limiter.pause(retry_after)
+                    delay = 0.0
+                else:
+                    delay = self._backoff(attempt)
+                _LOGGER.debug(
+                    "Retrying in %.1f s after HTTP %s", delay, response.status_code
+                )
+
+            attempt += 1
+            self.retries += 1
+            await asyncio.sleep(delay)
+
+    async def acquire(self) -> None:
+        """Wait for the rate limit before a request not sent by :meth:`get`.
+
+        Raises:
+            ApiUnavailableError: If the circuit breaker is not closed
+        """
+        if not self.breaker.is_closed:
+            raise ApiUnavailableError
+        await self.limiter.acquire()
+        self.requests += 1
+
+    def stream(
+        self, url: str, *, params: dict[str, Any]
+    ) -> AbstractAsyncContextManager[httpx.Response]:
+        """Stream a GET response, once :meth:`acquire` returned."""
+        return self.client.stream(
+            "GET", url, params=params, extensions={"trace": self._trace}
+        )
+
+    @staticmethod
+    def _backoff(attempt: int) -> float:
+        """Return a full-jitter exponential back-off delay."""
+        return random.uniform(0, API_RETRY_BACKOFF * 2**attempt)  # noqa: S311
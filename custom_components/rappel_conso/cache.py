@@ -0,0 +1,103 @@
+"""Result cache with request coalescing for Rappel Conso searches."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any
+
+SearchResults = list[dict[str, Any]]
+
+
+class SingleFlightCache:
+    """LRU cache with a TTL that shares in-flight fetches of the same key.
+
+    Concurrent callers asking for a key that is being fetched await the same
+    future instead of starting their own fetch.
+    """
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        """Initialize the cache."""
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict[Hashable, tuple[float, SearchResults]] = (
+            OrderedDict()
+        )
+        self._in_flight: dict[Hashable, asyncio.Future[SearchResults]] = {}
+        # Fetches started before an invalidation must not repopulate the cache
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def __len__(self) -> int:
+        """Return the number of cached entries."""
+        return len(self._entries)
+
+    def _get(self, key: Hashable) -> tuple[bool, SearchResults | None]:
+        """Return whether a fresh entry exists, and its value."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        expires, value = entry
+        if expires < time.monotonic():
+            del self._entries[key]
+            return False, None
+        self._entries.move_to_end(key)
+        return True, value
+
+    def _set(self, key: Hashable, value: SearchResults) -> None:
+        """Store a value, evicting the least recently used entries."""
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    async def async_get_or_fetch(
+        self, key: Hashable, fetch: Callable[[], Awaitable[SearchResults]]
+    ) -> SearchResults:
+        """Return the cached value of a key, fetching it at most once."""
+        found, value = self._get(key)
+        if found:
+            self.hits += 1
+            return value  # type: ignore[return-value]
+
+        if (future := self._in_flight.get(key)) is not None:
+            self.coalesced += 1
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                task = asyncio.current_task()
+                if not future.cancelled() or (task and task.cancelling()):
+                    raise
+            # The caller doing the fetch was cancelled: fetch again
+            return await self.async_get_or_fetch(key, fetch)
+
+        self.misses += 1
+        generation = self._generation
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            result = await fetch()
+        except Exception as err:
+            future.set_exception(err)
+            # Waiters re-raise it; mark it retrieved for the no-waiter case
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            if generation == self._generation:
+                self._set(key, result)
+            return result
+        finally:
+            self._in_flight.pop(key, None)
+            if not future.done():
+                # Cancelled, so waiters do not wait for it forever
+                future.cancel()
+
+    def clear(self) -> None:
+        """Drop every cached entry."""
+        self._entries.clear()
+        self._generation += 1
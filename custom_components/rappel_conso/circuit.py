@@ -0,0 +1,66 @@
+"""Circuit breaker failing API requests fast while the API is down."""
+
+from __future__ import annotations
+
+import time
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Stop sending requests after consecutive failures.
+
+    The circuit opens after ``failure_threshold`` failed requests in a row.
+    While open, requests are rejected; once ``reset_timeout`` seconds have
+    passed, a single request is let through to probe the API. Its success
+    closes the circuit, its failure opens it for another ``reset_timeout``.
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float) -> None:
+        """Initialize a closed circuit."""
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = STATE_CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self.trips = 0
+        self.rejected = 0
+
+    @property
+    def is_closed(self) -> bool:
+        """Return True when requests are sent normally."""
+        return self.state == STATE_CLOSED
+
+    def allow(self) -> bool:
+        """Return True when a request may be sent.
+
+        Once the reset timeout has passed, the first caller gets the half-open
+        probe and the others keep being rejected until its outcome is recorded.
+        """
+        if self.state == STATE_CLOSED:
+            return True
+        # A probe whose outcome never came, e.g. cancelled, is replaced after
+        # another reset timeout
+        now = time.monotonic()
+        if now - self._opened_at >= self.reset_timeout:
+            self.state = STATE_HALF_OPEN
+            self._opened_at = now
+            return True
+        self.rejected += 1
+        return False
+
+    def record_success(self) -> None:
+        """Close the circuit after a successful request."""
+        self.state = STATE_CLOSED
+        self._failures = 0
+
+    def record_failure(self) -> None:
+        """Count a failed request, opening the circuit past the threshold."""
+        self._failures += 1
+        if self.state == STATE_HALF_OPEN or self._failures >= self.failure_threshold:
+            if self.state == STATE_CLOSED:
+                self.trips += 1
+            self.state = STATE_OPEN
+            self._opened_at = time.monotonic()
@@ -8,32 +8,56 @@ from typing import Any
 import httpx
 import voluptuous as vol
 from homeassistant import config_entries
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.data_entry_flow import FlowResult
-
-from .const import DOMAIN, NAME
+from homeassistant.helpers import selector
+
+from .api import get_api
+from .const import (
+    API_CHECK_TIMEOUT,
+    CONF_COMPACT_ATTRIBUTES,
+    CONF_COUNTERS,
+    CONF_DIGEST_WINDOW,
+    CONF_EVENT_MODE,
+    CONF_MAX_CONCURRENCY,
+    CONF_MAX_SCAN_INTERVAL,
+    CONF_MIN_SCAN_INTERVAL,
+    CONF_WATCHLISTS,
+    DEFAULT_DIGEST_WINDOW,
+    DEFAULT_EVENT_MODE,
+    DEFAULT_MAX_CONCURRENCY,
+    DEFAULT_MAX_SCAN_INTERVAL,
+    DEFAULT_MIN_SCAN_INTERVAL,
+    DOMAIN,
+    EVENT_MODES,
+    NAME,
+)
+from .counters import validate_counters
+from .watchlist import validate_watchlists
 
 _LOGGER = logging.getLogger(__name__)
 
 
-async def validate_connection(_hass: HomeAssistant) -> dict[str, Any]:
+async def validate_connection(hass: HomeAssistant) -> dict[str, Any]:
     """Validate that we can connect to the API."""
     from .const import API_ENDPOINT
 
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(
-                API_ENDPOINT,
-                params={"limit": 1},
-            )
-            response.raise_for_status()
-            data = response.json()
+        # A single short attempt, so the setup form does not hang
+        response = await get_api(hass).get(
+            API_ENDPOINT,
+            params={"limit": 1},
+            max_retries=0,
+            timeout=API_CHECK_TIMEOUT,
+        )
+        response.raise_for_status()
+        data = response.json()
 
-            if "total_count" not in data:
-                msg = "Invalid API response structure"
-                raise ValueError(msg)
+        if "total_count" not in data:
+            msg = "Invalid API response structure"
+            raise ValueError(msg)
 
-            return {"total_recalls": data["total_count"]}
+        return {"total_recalls": data["total_count"]}
 
     except httpx.HTTPError:
         _LOGGER.exception("HTTP error connecting to Rappel Conso API")
@@ -48,6 +72,14 @@ class RappelConsoConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> RappelConsoOptionsFlow:
+        """Get the options flow for this handler."""
+        return RappelConsoOptionsFlow(config_entry)
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
@@ -83,3 +115,114 @@ class RappelConsoConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 "name": NAME,
             },
         )
+
+
+class RappelConsoOptionsFlow(config_entries.OptionsFlow):
+    """Handle Rappel Conso options."""
+
+    def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
+        """Initialize the options flow."""
+        self._entry = config_entry
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Manage the options."""
+        errors: dict[str, str] = {}
+
+        if user_input is not None:
+            try:
+                user_input[CONF_WATCHLISTS] = validate_watchlists(
+                    user_input.get(CONF_WATCHLISTS)
+                )
+            except vol.Invalid:
+                errors[CONF_WATCHLISTS] = "invalid_watchlists"
+            try:
+                user_input[CONF_COUNTERS] = validate_counters(
+                    user_input.get(CONF_COUNTERS)
+                )
+            except vol.Invalid:
+                errors[CONF_COUNTERS] = "invalid_counters"
+            if user_input[CONF_MIN_SCAN_INTERVAL] > user_input[CONF_MAX_SCAN_INTERVAL]:
+                errors["base"] = "min_above_max_interval"
+            if not errors:
+                return self.async_create_entry(title="", data=user_input)
+
+        options = user_input or self._entry.options
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(
+                        CONF_MAX_CONCURRENCY,
+                        default=options.get(
+                            CONF_MAX_CONCURRENCY, DEFAULT_MAX_CONCURRENCY
+                        ),
+                    ): selector.NumberSelector(
+                        selector.NumberSelectorConfig(
+                            min=1, max=10, mode=selector.NumberSelectorMode.BOX
+                        )
+                    ),
+                    vol.Required(
+                        CONF_MIN_SCAN_INTERVAL,
+                        default=options.get(
+                            CONF_MIN_SCAN_INTERVAL, DEFAULT_MIN_SCAN_INTERVAL
+                        ),
+                    ): selector.NumberSelector(
+                        selector.NumberSelectorConfig(
+                            min=5,
+                            max=1440,
+                            unit_of_measurement="min",
+                            mode=selector.NumberSelectorMode.BOX,
+                        )
+                    ),
+                    vol.Required(
+                        CONF_MAX_SCAN_INTERVAL,
+                        default=options.get(
+                            CONF_MAX_SCAN_INTERVAL, DEFAULT_MAX_SCAN_INTERVAL
+                        ),
+                    ): selector.NumberSelector(
+                        selector.NumberSelectorConfig(
+                            min=5,
+                            max=1440,
+                            unit_of_measurement="min",
+                            mode=selector.NumberSelectorMode.BOX,
+                        )
+                    ),
+                    vol.Required(
+                        CONF_COMPACT_ATTRIBUTES,
+                        default=options.get(CONF_COMPACT_ATTRIBUTES, False),
+                    ): selector.BooleanSelector(),
+                    vol.Required(
+                        CONF_EVENT_MODE,
+                        default=options.get(CONF_EVENT_MODE, DEFAULT_EVENT_MODE),
+                    ): selector.SelectSelector(
+                        selector.SelectSelectorConfig(
+                            options=list(EVENT_MODES),
+                            translation_key=CONF_EVENT_MODE,
+                            mode=selector.SelectSelectorMode.DROPDOWN,
+                        )
+                    ),
+                    vol.Required(
+                        CONF_DIGEST_WINDOW,
+                        default=options.get(CONF_DIGEST_WINDOW, DEFAULT_DIGEST_WINDOW),
+                    ): selector.NumberSelector(
+                        selector.NumberSelectorConfig(
+                            min=5,
+                            max=1440,
+                            unit_of_measurement="min",
+                            mode=selector.NumberSelectorMode.BOX,
+                        )
+                    ),
+                    vol.Optional(
+                        CONF_WATCHLISTS,
+                        default=options.get(CONF_WATCHLISTS, []),
+                    ): selector.ObjectSelector(),
+                    vol.Optional(
+                        CONF_COUNTERS,
+                        default=options.get(CONF_COUNTERS, []),
+                    ): selector.ObjectSelector(),
+                }
+            ),
+            errors=errors,
+        )
@@ -7,26 +7,116 @@ NAME = "Rappel Conso"
 API_BASE_URL = "https://data.economie.gouv.fr/api/explore/v2.1"
 API_DATASET = "rappelconso-v2-gtin-espaces"
 API_ENDPOINT = f"{API_BASE_URL}/catalog/datasets/{API_DATASET}/records"
+API_EXPORT_ENDPOINT = f"{API_BASE_URL}/catalog/datasets/{API_DATASET}/exports/jsonl"
 
 # Update configuration
 DEFAULT_SCAN_INTERVAL = 3600  # 1 hour in seconds
+DEFAULT_MIN_SCAN_INTERVAL = 15  # Minutes between polls while recalls are published
+DEFAULT_MAX_SCAN_INTERVAL = 360  # Minutes between polls at quiet times
+CADENCE_SAMPLE_SIZE = 2000  # Stored recalls used to learn the publication cadence
 FETCH_LIMIT = 100  # Number of records to fetch per API call
 MAX_RECENT_RECALLS = 50  # Maximum number of recalls to keep in sensor attributes
 MAX_CACHE_SIZE = 1000  # Maximum recall IDs to keep in cache
+KNOWN_IDS_SAVE_DELAY = 30  # Seconds to batch saves of the known recall IDs
+MAX_SYNC_OFFSET = 10000  # API rejects offset + limit above this value
+DEFAULT_MAX_CONCURRENCY = 4  # Pages fetched in parallel when catching up
+API_RATE_LIMIT = 4.0  # Sustained API requests per second
+API_RATE_BURST = 4  # API requests allowed in a burst
+API_MAX_RETRIES = 3  # Retries of a GET failing with a transient error
+API_RETRY_BACKOFF = 1.0  # Seconds, doubled at each retry and jittered
+API_MAX_RETRY_AFTER = 60  # Longest Retry-After delay waited for, in seconds
+API_CIRCUIT_FAILURES = 3  # Failed requests in a row before the API is given up on
+API_CIRCUIT_RESET = 300  # Seconds before a single request probes the API again
+API_TIMEOUT = 30.0  # Seconds before an API request times out
+API_CHECK_TIMEOUT = 10.0  # Seconds before the setup connection check gives up
+API_SERVICE_TIMEOUT = 10.0  # Seconds before a request answering an action times out
+API_SERVICE_RETRIES = 1  # Retries of a request answering an action
+API_MAX_CONNECTIONS = 10  # Pooled connections, enough for the parallel page fetches
+API_KEEPALIVE_EXPIRY = 60.0  # Seconds an idle connection is kept for reuse
+SEARCH_CACHE_SIZE = 128  # Search results kept in memory
+SEARCH_CACHE_TTL = 300  # Seconds a search result stays cached
+STATISTICS_CACHE_SIZE = 64  # Statistics results kept in memory
+STATISTICS_CACHE_TTL = 21600  # Seconds statistics stay cached without new recalls
+BATCH_MAX_CONDITIONS = 50  # ODSQL conditions per batch search request
+DECODE_EXECUTOR_THRESHOLD = 64 * 1024  # Response bytes decoded off the event loop
+BOOTSTRAP_BATCH_SIZE = 500  # Exported recalls written to the mirror at once
+RECONCILE_INTERVAL = 86400  # Seconds between reconciliations with the API
+RECONCILE_CHECK_INTERVAL = 3600  # Seconds between checks for a due reconciliation
+API_GROUP_BY_LIMIT = 20000  # Maximum groups returned by an aggregation query
+MAX_COUNTER_DAYS = 365  # Longest window of a recall counter sensor, in days
+DEFAULT_DIGEST_WINDOW = 60  # Minutes of new recalls gathered in a digest event
+
+# Local storage
+STORE_FILENAME = f"{DOMAIN}.db"  # SQLite mirror, under the .storage directory
+
+# Options
+CONF_MAX_CONCURRENCY = "max_concurrency"
+CONF_MIN_SCAN_INTERVAL = "min_scan_interval"
+CONF_MAX_SCAN_INTERVAL = "max_scan_interval"
+CONF_COMPACT_ATTRIBUTES = "compact_attributes"
+CONF_WATCHLISTS = "watchlists"
+CONF_EVENT_MODE = "event_mode"
+CONF_DIGEST_WINDOW = "digest_window"
+CONF_COUNTERS = "counters"
+
+# How new recalls are reported on the event bus: one event per recall, one
+# event per refresh, or one event per digest window
+EVENT_MODE_RECALL = "recall"
+EVENT_MODE_BATCH = "batch"
+EVENT_MODE_DIGEST = "digest"
+EVENT_MODES = (EVENT_MODE_RECALL, EVENT_MODE_BATCH, EVENT_MODE_DIGEST)
+DEFAULT_EVENT_MODE = EVENT_MODE_RECALL
+
+# Events
+EVENT_NEW_RECALL = f"{DOMAIN}_new_recall"
+EVENT_NEW_RECALLS = f"{DOMAIN}_new_recalls"
+EVENT_RECALL_UPDATED = f"{DOMAIN}_recall_updated"
+EVENT_WATCH_MATCH = f"{DOMAIN}_watch_match"
 
 # Sensor configuration
 SENSOR_NAME = "Rappel Conso"
 SENSOR_ICON = "mdi:alert-circle"
+COUNTER_SENSOR_ICON = "mdi:counter"
 ATTRIBUTION = "Data from data.gouv.fr - RappelConso"
+# Recall fields kept in the sensor attributes in compact mode
+COMPACT_RECALL_FIELDS = ("id", "product_name", "publication_date")
 
 # API parameters
 API_ORDER_BY = "date_publication DESC"
 API_LIMIT_PARAM = "limit"
 API_OFFSET_PARAM = "offset"
 API_ORDER_PARAM = "order_by"
+API_SELECT_PARAM = "select"
+API_GROUP_BY_PARAM = "group_by"
+
+# Fields fetched by the change probe run before each sync
+PROBE_SELECT = "id,rappel_guid"
+
+# Fields fetched when polling: what events, sensor attributes and the local
+# search and GTIN indexes need. Other fields are fetched on demand.
+POLL_FIELDS = (
+    "id",
+    "numero_fiche",
+    "numero_version",
+    "rappel_guid",
+    "libelle",
+    "categorie_produit",
+    "sous_categorie_produit",
+    "marque_produit",
+    "motif_rappel",
+    "risques_encourus",
+    "date_publication",
+    "lien_vers_la_fiche_rappel",
+    "identification_produits",
+)
+POLL_SELECT = ",".join(POLL_FIELDS)
 
 # Service configuration
 SERVICE_SEARCH_RECALLS = "search_recalls"
+SERVICE_CHECK_BARCODE = "check_barcode"
+SERVICE_SEARCH_RECALLS_BATCH = "search_recalls_batch"
+SERVICE_GET_RECENT_RECALLS = "get_recent_recalls"
+SERVICE_RECALL_STATISTICS = "recall_statistics"
 
 # Service parameters
 ATTR_PRODUCT_NAMES = "product_names"
@@ -34,3 +124,13 @@ ATTR_BRANDS = "brands"
 ATTR_CATEGORIES = "categories"
 ATTR_KEYWORDS = "keywords"
 ATTR_LIMIT = "limit"
+ATTR_BARCODES = "barcodes"
+ATTR_QUERIES = "queries"
+ATTR_NAME = "name"
+ATTR_GTINS = "gtins"
+ATTR_GROUP_BY = "group_by"
+ATTR_DAYS = "days"
+ATTR_RISKS = "risks"
+
+# Dispatcher signal sent with the changes of the recent recalls after a refresh
+SIGNAL_RECENT_RECALLS_CHANGED = f"{DOMAIN}_recent_recalls_changed"
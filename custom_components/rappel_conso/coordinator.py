@@ -2,81 +2,270 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
-from datetime import timedelta
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from http import HTTPStatus
 from typing import Any
 
 import httpx
+from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.json import json_dumps
+from homeassistant.helpers.storage import STORAGE_DIR
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 from homeassistant.util import dt as dt_util
+from homeassistant.util.json import json_loads
 
+from .api import get_api, is_unavailable
+from .cache import SingleFlightCache
 from .const import (
     API_ENDPOINT,
+    API_EXPORT_ENDPOINT,
+    API_GROUP_BY_LIMIT,
+    API_GROUP_BY_PARAM,
     API_LIMIT_PARAM,
     API_OFFSET_PARAM,
     API_ORDER_BY,
     API_ORDER_PARAM,
+    API_SELECT_PARAM,
+    API_SERVICE_RETRIES,
+    API_SERVICE_TIMEOUT,
+    BATCH_MAX_CONDITIONS,
+    BOOTSTRAP_BATCH_SIZE,
+    CADENCE_SAMPLE_SIZE,
+    CONF_COUNTERS,
+    CONF_DIGEST_WINDOW,
+    CONF_EVENT_MODE,
+    CONF_MAX_CONCURRENCY,
+    CONF_MAX_SCAN_INTERVAL,
+    CONF_MIN_SCAN_INTERVAL,
+    CONF_WATCHLISTS,
+    DECODE_EXECUTOR_THRESHOLD,
+    DEFAULT_DIGEST_WINDOW,
+    DEFAULT_EVENT_MODE,
+    DEFAULT_MAX_CONCURRENCY,
+    DEFAULT_MAX_SCAN_INTERVAL,
+    DEFAULT_MIN_SCAN_INTERVAL,
     DEFAULT_SCAN_INTERVAL,
     DOMAIN,
+    EVENT_MODE_BATCH,
+    EVENT_MODE_DIGEST,
+    EVENT_MODE_RECALL,
+    EVENT_NEW_RECALL,
+    EVENT_NEW_RECALLS,
+    EVENT_RECALL_UPDATED,
+    EVENT_WATCH_MATCH,
     FETCH_LIMIT,
+    KNOWN_IDS_SAVE_DELAY,
     MAX_CACHE_SIZE,
     MAX_RECENT_RECALLS,
+    MAX_SYNC_OFFSET,
+    POLL_SELECT,
+    PROBE_SELECT,
+    RECONCILE_INTERVAL,
+    SEARCH_CACHE_SIZE,
+    SEARCH_CACHE_TTL,
+    SIGNAL_RECENT_RECALLS_CHANGED,
+    STATISTICS_CACHE_SIZE,
+    STATISTICS_CACHE_TTL,
+    STORE_FILENAME,
 )
-from .models import APIResponse
+from .counters import RecallCounter, validate_counters
+from .events import RecallDigest, recall_event_data
+from .gtin import GtinIndex, extract_gtins, normalize_gtin
+from .known_ids import KnownRecallIds
+from .models import RecallPage, decode_recall
+from .scheduler import AdaptiveScheduler
+from .search import GROUP_BY_FIELDS, TIME_GROUPS, SearchCriteria, plan_batch
+from .store import (
+    META_BOOTSTRAP,
+    META_LAST_UPDATE,
+    META_PROBE,
+    META_RECONCILE,
+    RecallStore,
+    RecallUpdate,
+)
+from .watchlist import WatchlistMatcher, validate_watchlists
 
 _LOGGER = logging.getLogger(__name__)
 
 
+def _month_range(month: str) -> tuple[str, str]:
+    """Return the first day of a YYYY-MM month and of the next one."""
+    year, number = (int(part) for part in month.split("-"))
+    year, number = (year + 1, 1) if number == 12 else (year, number + 1)  # noqa: PLR2004
+    return f"{month}-01", f"{year:04d}-{number:02d}-01"
+
+
 class RappelConsoCoordinator(DataUpdateCoordinator[dict[str, Any]]):
     """Coordinator to fetch Rappel Conso data."""
 
-    def __init__(self, hass: HomeAssistant) -> None:
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
         """Initialize the coordinator."""
+        self.scheduler = AdaptiveScheduler(
+            min_interval=timedelta(
+                minutes=entry.options.get(
+                    CONF_MIN_SCAN_INTERVAL, DEFAULT_MIN_SCAN_INTERVAL
+                )
+            ),
+            max_interval=timedelta(
+                minutes=entry.options.get(
+                    CONF_MAX_SCAN_INTERVAL, DEFAULT_MAX_SCAN_INTERVAL
+                )
+            ),
+            default_interval=timedelta(seconds=DEFAULT_SCAN_INTERVAL),
+        )
         super().__init__(
             hass,
             _LOGGER,
             name=DOMAIN,
-            update_interval=timedelta(seconds=DEFAULT_SCAN_INTERVAL),
+            update_interval=self.scheduler.interval,
         )
-        self._known_recall_ids: set[int] = set()
-        self._client: httpx.AsyncClient | None = None
-
-    async def _get_client(self) -> httpx.AsyncClient:
-        """Get or create HTTP client."""
-        if self._client is None:
-            self._client = httpx.AsyncClient(
-                timeout=30.0,
-                follow_redirects=True,
-            )
-        return self._client
+        self.max_concurrency = int(
+            entry.options.get(CONF_MAX_CONCURRENCY, DEFAULT_MAX_CONCURRENCY)
+        )
+        self.api = get_api(hass)
+        # Options are validated by the options flow
+        self.watchlists = WatchlistMatcher(
+            validate_watchlists(entry.options.get(CONF_WATCHLISTS, []))
+        )
+        self.watch_matches = 0
+        self.updated_recalls = 0
+        self.counters = [
+            RecallCounter(counter)
+            for counter in validate_counters(entry.options.get(CONF_COUNTERS, []))
+        ]
+        self.event_mode = entry.options.get(CONF_EVENT_MODE, DEFAULT_EVENT_MODE)
+        self.digest = RecallDigest(
+            hass,
+            timedelta(
+                minutes=entry.options.get(CONF_DIGEST_WINDOW, DEFAULT_DIGEST_WINDOW)
+            ),
+        )
+        self._known_recall_ids = KnownRecallIds(
+            hass, MAX_CACHE_SIZE, KNOWN_IDS_SAVE_DELAY
+        )
+        self.store = RecallStore(hass, hass.config.path(STORAGE_DIR, STORE_FILENAME))
+        self.gtin_index = GtinIndex()
+        self.mirror_complete = False
+        self.bootstrap_done = False
+        self.search_cache = SingleFlightCache(SEARCH_CACHE_SIZE, SEARCH_CACHE_TTL)
+        self.statistics_cache = SingleFlightCache(
+            STATISTICS_CACHE_SIZE, STATISTICS_CACHE_TTL
+        )
+        self._probe_state: dict[str, Any] = {}
+        self.probe_hits = 0
+        self.probe_misses = 0
+        self.bytes_received = 0
+        self.last_poll_bytes = 0
+        self.loop_time = 0.0
+        self.last_poll_loop_time = 0.0
+        self.executor_decodes = 0
+        self.last_reconcile: datetime | None = None
+        self.reconciled_months = 0
+        self.reconcile_removed = 0
+        self._reconciling = False
+
+    async def async_load(self) -> None:
+        """Open the local recall store and load its GTIN index."""
+        await self.store.async_open()
+        await self._known_recall_ids.async_load()
+        for gtin, recall_id in await self.store.async_get_gtins():
+            self.gtin_index.add(gtin, recall_id)
+        self.mirror_complete = await self.store.async_is_complete()
+        if checkpoint := await self.store.async_get_meta(META_BOOTSTRAP):
+            self.bootstrap_done = bool(json_loads(checkpoint).get("done"))
+        self.scheduler.observe(
+            await self.store.async_get_publication_dates(CADENCE_SAMPLE_SIZE)
+        )
+        if probe := await self.store.async_get_meta(META_PROBE):
+            self._probe_state = json_loads(probe)
+        if reconciled := await self.store.async_get_meta(META_RECONCILE):
+            self.last_reconcile = dt_util.parse_datetime(reconciled)
+        await self._async_seed_counters()
+
+    async def _async_seed_counters(self) -> None:
+        """Count the stored recalls of the counter windows from scratch."""
+        if not self.counters:
+            return
+        # A day of margin for the publication time zone
+        days = max(counter.days for counter in self.counters) + 1
+        since = (dt_util.utcnow() - timedelta(days=days)).date().isoformat()
+        recalls = await self.store.async_get_published_since(since)
+        with self._on_loop():
+            for counter in self.counters:
+                counter.reset()
+                counter.observe(recalls)
+
+    async def async_restore_data(self) -> bool:
+        """Restore the data of the last sync from the local mirror.
+
+        Returns:
+            True when a previous sync was restored
+        """
+        if await self.store.async_get_watermark() is None:
+            return False
+
+        self.async_set_updated_data(
+            {
+                "total_count": await self.store.async_get_total_count(),
+                "recent_recalls": await self.store.async_get_recent(MAX_RECENT_RECALLS),
+                "new_recalls_count": 0,
+                "last_update": await self.store.async_get_meta(META_LAST_UPDATE),
+            }
+        )
+        return True
 
     def _fire_new_recall_events(
         self, all_recalls: list[dict[str, Any]], new_recall_ids: set[int]
     ) -> None:
-        """Fire events for each new recall."""
+        """Report new recalls as configured, and each watchlist they match."""
+        events = []
         for recall in all_recalls:
-            if recall.get("id") in new_recall_ids:
+            if recall.get("id") not in new_recall_ids:
+                continue
+            event_data = recall_event_data(recall)
+            events.append(event_data)
+            if self.event_mode == EVENT_MODE_RECALL:
+                self.hass.bus.async_fire(EVENT_NEW_RECALL, event_data)
+            if not self.watchlists:
+                continue
+            for name, matched in self.watchlists.match(recall).items():
+                self.watch_matches += 1
                 self.hass.bus.async_fire(
-                    "rappel_conso_new_recall",
-                    {
-                        "recall_id": recall.get("id"),
-                        "sheet_number": recall.get("sheet_number"),
-                        "version_number": recall.get("version_number"),
-                        "recall_guid": recall.get("recall_guid"),
-                        "product_name": recall.get("product_name"),
-                        "category": recall.get("category"),
-                        "subcategory": recall.get("subcategory"),
-                        "brand": recall.get("brand"),
-                        "publication_date": recall.get("publication_date"),
-                        "recall_reason": recall.get("recall_reason"),
-                        "risks": recall.get("risks"),
-                        "recall_link": recall.get("recall_link"),
-                    },
+                    EVENT_WATCH_MATCH,
+                    {**event_data, "watchlist": name, "matched": sorted(matched)},
                 )
-        _LOGGER.debug("Fired %d new recall events", len(new_recall_ids))
 
-    async def async_search_recalls(  # pylint: disable=too-many-locals,too-many-positional-arguments
+        if self.event_mode == EVENT_MODE_BATCH:
+            self.hass.bus.async_fire(
+                EVENT_NEW_RECALLS, {"recalls": events, "count": len(events)}
+            )
+        elif self.event_mode == EVENT_MODE_DIGEST:
+            self.digest.add(events)
+        _LOGGER.debug("Reported %d new recalls", len(events))
+
+    def _fire_recall_updated_events(self, updates: list[RecallUpdate]) -> None:
+        """Fire an event for each recall whose content changed."""
+        for update in updates:
+            self.updated_recalls += 1
+            self.hass.bus.async_fire(
+                EVENT_RECALL_UPDATED,
+                {
+                    **recall_event_data(update.recall),
+                    "previous_recall_id": update.previous_id,
+                    "changed_fields": sorted(update.changes),
+                    "changes": update.changes,
+                },
+            )
+        _LOGGER.debug("Fired %d recall updated events", len(updates))
+
+    async def async_search_recalls(  # pylint: disable=too-many-positional-arguments
         self,
         product_names: list[str] | None = None,
         brands: list[str] | None = None,
@@ -86,7 +275,8 @@ class RappelConsoCoordinator(DataUpdateCoordinator[dict[str, Any]]):
     ) -> list[dict[str, Any]]:
         """Search for recalls matching the given criteria.
 
-        Uses ODSQL (Opendatasoft Query Language) for the where clause.
+        Answers from the local mirror when it holds the whole dataset, and
+        otherwise uses ODSQL (Opendatasoft Query Language) for the where clause.
         Documentation: https://help.opendatasoft.com/apis/ods-explore-v2/
 
         Args:
@@ -105,187 +295,1007 @@ class RappelConsoCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         Raises:
             httpx.HTTPError: If API request fails
         """
-        import urllib.parse
+        criteria = SearchCriteria.from_lists(
+            product_names=product_names,
+            brands=brands,
+            categories=categories,
+            keywords=keywords,
+        ).normalized()
+        limit = min(limit, 1000)  # API max limit
 
-        client = await self._get_client()
+        # Identical searches share one cached result, and concurrent ones a
+        # single request; the cache is cleared when new recalls arrive.
+        results = await self.search_cache.async_get_or_fetch(
+            (criteria, limit), lambda: self._async_search(criteria, limit)
+        )
+        return list(results)
+
+    async def _async_search(
+        self, criteria: SearchCriteria, limit: int
+    ) -> list[dict[str, Any]]:
+        """Search the local mirror or the API, bypassing the result cache."""
+        if self.mirror_complete:
+            # Stored summaries are answered as they are while the API is down
+            results = await self._async_get_stored_details(
+                await self.store.async_search(criteria, limit)
+            )
+            _LOGGER.debug(
+                "Found %d recalls matching search criteria in local mirror",
+                len(results),
+            )
+            return results
 
         # Build API query parameters
         params = {
-            API_LIMIT_PARAM: min(limit, 1000),  # API max limit
+            API_LIMIT_PARAM: limit,
             API_OFFSET_PARAM: 0,
             API_ORDER_PARAM: API_ORDER_BY,
         }
 
-        # Build ODSQL where clause
-        # Note: ODSQL supports SQL-like LIKE operator with wildcards (%)
-        # Case-insensitive by default
-        where_clauses = []
-
-        if product_names:
-            # Search in libelle field (product name)
-            # Use LIKE with wildcards for partial matching
-            product_conditions = " OR ".join(
-                f"libelle like '%{urllib.parse.quote(name, safe='')}%'"
-                for name in product_names
+        where = criteria.to_where()
+        if where:
+            params["where"] = where
+
+        _LOGGER.debug("Searching recalls with params: %s", params)
+
+        try:
+            response = await self.api.get(
+                API_ENDPOINT,
+                params=params,
+                max_retries=API_SERVICE_RETRIES,
+                timeout=API_SERVICE_TIMEOUT,
+            )
+            response.raise_for_status()
+
+            # Convert to English field names
+            api_response = await self._async_decode(response)
+            results = api_response.results
+
+            _LOGGER.info(
+                "Found %d recalls matching search criteria (total: %d)",
+                len(results),
+                api_response.total_count,
             )
-            where_clauses.append(f"({product_conditions})")
 
-        if brands:
-            # Search in marque_produit field (brand)
-            brand_conditions = " OR ".join(
-                f"marque_produit like '%{urllib.parse.quote(brand, safe='')}%'"
-                for brand in brands
+            return results  # noqa: TRY300
+
+        except httpx.HTTPError as err:
+            if not is_unavailable(err):
+                _LOGGER.exception("Error searching recalls")
+                raise
+            # Answer from the recalls synced so far rather than failing
+            _LOGGER.warning("Searching the local mirror, API unavailable: %s", err)
+            return await self._async_get_stored_details(
+                await self.store.async_search(criteria, limit)
             )
-            where_clauses.append(f"({brand_conditions})")
 
-        if categories:
-            # Search in categorie_produit field (exact match)
-            category_conditions = " OR ".join(
-                f"categorie_produit='{urllib.parse.quote(cat, safe='')}'"
-                for cat in categories
+    async def async_search_recalls_batch(
+        self, queries: dict[str, SearchCriteria], limit: int = 100
+    ) -> dict[str, list[dict[str, Any]]]:
+        """Search for recalls matching each of several named queries.
+
+        Queries are answered together: from the local mirror when it holds the
+        whole dataset, and otherwise from as few API requests as possible, each
+        selecting a superset of the results of several queries that is then
+        matched locally. The full record of each matching recall is fetched
+        once, however many queries it matches.
+
+        Args:
+            queries: Search criteria by query name
+            limit: Maximum number of recalls to return per query
+
+        Returns:
+            Matching recalls with English field names, by query name
+
+        Raises:
+            httpx.HTTPError: If API request fails
+        """
+        normalized = {name: criteria.normalized() for name, criteria in queries.items()}
+        distinct = list(dict.fromkeys(normalized.values()))
+        limit = min(limit, 1000)
+
+        if self.mirror_complete:
+            ids_by_criteria, recalls = await self._async_search_batch_local(
+                distinct, limit
             )
-            where_clauses.append(f"({category_conditions})")
-
-        if keywords:
-            # Search across multiple fields for maximum flexibility
-            keyword_conditions = []
-            for keyword in keywords:
-                escaped_keyword = urllib.parse.quote(keyword, safe="")
-                keyword_conditions.append(
-                    f"(libelle like '%{escaped_keyword}%' OR "
-                    f"marque_produit like '%{escaped_keyword}%' OR "
-                    f"sous_categorie_produit like '%{escaped_keyword}%' OR "
-                    f"motif_rappel like '%{escaped_keyword}%')"
+            recalls = await self._async_get_stored_details(recalls)
+        else:
+            try:
+                ids_by_criteria, recalls = await self._async_fetch_batch(
+                    distinct, limit
+                )
+                recalls = await self.async_get_details(recalls, stored=False)
+            except httpx.HTTPError as err:
+                if not is_unavailable(err):
+                    raise
+                _LOGGER.warning("Searching the local mirror, API unavailable: %s", err)
+                ids_by_criteria, recalls = await self._async_search_batch_local(
+                    distinct, limit
                 )
-            where_clauses.append(f"({' OR '.join(keyword_conditions)})")
+                recalls = await self._async_get_stored_details(recalls)
 
-        # Combine all where clauses with AND
-        if where_clauses:
-            params["where"] = " AND ".join(where_clauses)
+        recalls_by_id = {recall["id"]: recall for recall in recalls}
+        _LOGGER.debug(
+            "Found %d recalls matching %d batch queries",
+            len(recalls_by_id),
+            len(queries),
+        )
+        return {
+            name: [
+                recalls_by_id[recall_id]
+                for recall_id in ids_by_criteria[criteria]
+                if recall_id in recalls_by_id
+            ]
+            for name, criteria in normalized.items()
+        }
 
-        _LOGGER.debug("Searching recalls with params: %s", params)
+    async def _async_search_batch_local(
+        self, queries: list[SearchCriteria], limit: int
+    ) -> tuple[dict[SearchCriteria, list[int]], list[dict[str, Any]]]:
+        """Search the local mirror for normalized queries.
+
+        Returns:
+            The matching recall IDs of each query, newest first, and the
+            matching recalls
+        """
+        ids_by_criteria = dict(
+            zip(
+                queries,
+                await self.store.async_search_ids(queries, limit),
+                strict=True,
+            )
+        )
+        matched_ids = set().union(*ids_by_criteria.values())
+        return ids_by_criteria, await self.store.async_get_many(sorted(matched_ids))
+
+    async def _async_fetch_batch(
+        self, queries: list[SearchCriteria], limit: int
+    ) -> tuple[dict[SearchCriteria, list[int]], list[dict[str, Any]]]:
+        """Fetch the summaries of the recalls matching normalized queries.
+
+        Returns:
+            The matching recall IDs of each query, newest first, and the
+            matching recalls
+        """
+        ids_by_criteria: dict[SearchCriteria, list[int]] = {}
+        matched: dict[int, dict[str, Any]] = {}
+
+        for where, covered in plan_batch(queries, BATCH_MAX_CONDITIONS):
+            for criteria in covered:
+                ids_by_criteria[criteria] = []
+
+            def match_page(
+                page: list[dict[str, Any]],
+                covered: list[SearchCriteria] = covered,
+            ) -> bool:
+                """Match a page against the covered queries, True when done."""
+                for recall in page:
+                    for criteria in covered:
+                        ids = ids_by_criteria[criteria]
+                        if len(ids) < limit and criteria.matches(recall):
+                            ids.append(recall["id"])
+                            matched.setdefault(recall["id"], recall)
+                return all(len(ids_by_criteria[c]) >= limit for c in covered)
+
+            try:
+                await self._async_fetch_pages(where=where, until=match_page)
+            except httpx.HTTPError:
+                _LOGGER.exception("Error searching recalls")
+                raise
+
+        # Not stored: a search result newer than the last sync would move the
+        # watermark past recalls the next poll has not fetched yet
+        return ids_by_criteria, list(matched.values())
+
+    async def async_get_statistics(
+        self, group_by: str, criteria: SearchCriteria, limit: int
+    ) -> list[dict[str, Any]]:
+        """Count the recalls matching criteria per value of a dimension.
+
+        Only the groups are transferred: the counts come from the local mirror
+        when it holds the whole dataset, and otherwise from a group_by query
+        to the API. Results are kept until a refresh changes the dataset.
+
+        Args:
+            group_by: Dimension of :data:`GROUP_BY_FIELDS`
+            criteria: Filters, as for :meth:`async_search_recalls`
+            limit: Maximum number of groups to return
+
+        Returns:
+            Groups as ``value`` and ``count``, newest first for time dimensions
+            and largest first otherwise
+
+        Raises:
+            httpx.HTTPError: If API request fails
+        """
+        criteria = criteria.normalized()
+        groups = await self.statistics_cache.async_get_or_fetch(
+            (group_by, criteria, limit),
+            lambda: self._async_statistics(group_by, criteria, limit),
+        )
+        return list(groups)
+
+    async def _async_statistics(
+        self, group_by: str, criteria: SearchCriteria, limit: int
+    ) -> list[dict[str, Any]]:
+        """Count recalls in the local mirror or with the API, bypassing the cache."""
+        if self.mirror_complete:
+            return await self.store.async_count_groups(group_by, criteria, limit)
+
+        params: dict[str, Any] = {
+            API_SELECT_PARAM: "count(*) as count",
+            API_GROUP_BY_PARAM: f"{GROUP_BY_FIELDS[group_by][0]} as value",
+            API_ORDER_PARAM: (
+                "value DESC" if group_by in TIME_GROUPS else "count DESC, value"
+            ),
+            API_LIMIT_PARAM: limit,
+        }
+        if where := criteria.to_where():
+            params["where"] = where
 
         try:
-            response = await client.get(API_ENDPOINT, params=params)
+            response = await self.api.get(
+                API_ENDPOINT,
+                params=params,
+                max_retries=API_SERVICE_RETRIES,
+                timeout=API_SERVICE_TIMEOUT,
+            )
             response.raise_for_status()
+        except httpx.HTTPError as err:
+            if not is_unavailable(err):
+                raise
+            # Count the recalls synced so far rather than failing
+            _LOGGER.warning(
+                "Counting recalls in local mirror, API unavailable: %s", err
+            )
+            return await self.store.async_count_groups(group_by, criteria, limit)
+        self._count_bytes(response)
+        return [
+            {"value": row.get("value"), "count": row.get("count", 0)}
+            for row in response.json().get("results", [])
+        ]
 
-            data = response.json()
-            api_response = APIResponse(**data)
+    async def async_get_recent_recalls(self, limit: int) -> list[dict[str, Any]]:
+        """Return the most recent recalls with all their fields.
 
-            # Convert to English field names
-            results = [recall.to_english_dict() for recall in api_response.results]
+        Raises:
+            httpx.HTTPError: If API request fails
+        """
+        return await self._async_get_stored_details(
+            await self.store.async_get_recent(limit)
+        )
 
-            _LOGGER.info(
-                "Found %d recalls matching search criteria (total: %d)",
-                len(results),
-                api_response.total_count,
+    async def async_check_barcodes(
+        self, barcodes: list[str]
+    ) -> dict[str, list[dict[str, Any]]]:
+        """Return the recalls listing each barcode.
+
+        Barcodes are normalized to GTIN-14; invalid ones map to no recall.
+        Lookups use the local GTIN index, or the API while the mirror is
+        incomplete.
+
+        Raises:
+            httpx.HTTPError: If API request fails
+        """
+        gtins = {barcode: normalize_gtin(barcode) for barcode in barcodes}
+        valid_gtins = {gtin for gtin in gtins.values() if gtin}
+
+        use_index = self.mirror_complete
+        if not use_index:
+            try:
+                recalls = await self._async_fetch_by_gtins(valid_gtins)
+            except httpx.HTTPError as err:
+                if not is_unavailable(err):
+                    raise
+                # Look up the recalls synced so far rather than failing
+                _LOGGER.warning("Using the local GTIN index, API unavailable: %s", err)
+                use_index = True
+            else:
+                ids_by_gtin = {gtin: set() for gtin in valid_gtins}
+                for recall in recalls:
+                    for gtin in extract_gtins(recall.get("product_identification")):
+                        if gtin in ids_by_gtin:
+                            ids_by_gtin[gtin].add(recall["id"])
+
+        if use_index:
+            ids_by_gtin = {gtin: self.gtin_index.lookup(gtin) for gtin in valid_gtins}
+            matched_ids = set().union(*ids_by_gtin.values())
+            recalls = (
+                await self._async_get_stored_details(
+                    await self.store.async_get_many(sorted(matched_ids))
+                )
+                if matched_ids
+                else []
             )
 
-            return results  # noqa: TRY300
+        return {
+            barcode: [recall for recall in recalls if recall["id"] in ids_by_gtin[gtin]]
+            if gtin
+            else []
+            for barcode, gtin in gtins.items()
+        }
 
+    async def _async_fetch_by_gtins(self, gtins: set[str]) -> list[dict[str, Any]]:
+        """Fetch the recalls whose product identification mentions a GTIN."""
+        if not gtins:
+            return []
+
+        # Identifications hold GTIN-13 or shorter forms without padding zeros
+        where = " OR ".join(
+            f"identification_produits like '%{gtin.lstrip('0')}%'"
+            for gtin in sorted(gtins)
+        )
+        params = {
+            API_LIMIT_PARAM: FETCH_LIMIT,
+            API_ORDER_PARAM: API_ORDER_BY,
+            "where": where,
+        }
+
+        try:
+            response = await self.api.get(
+                API_ENDPOINT,
+                params=params,
+                max_retries=API_SERVICE_RETRIES,
+                timeout=API_SERVICE_TIMEOUT,
+            )
+            response.raise_for_status()
         except httpx.HTTPError:
-            _LOGGER.exception("Error searching recalls")
+            _LOGGER.exception("Error looking up barcodes")
             raise
 
-    async def _async_update_data(self) -> dict[str, Any]:
-        """Fetch data from API."""
-        try:
-            client = await self._get_client()
-
-            # Fetch first page of results
-            all_recalls: list[dict[str, Any]] = []
-            offset = 0
-            new_recall_ids: set[int] = set()
-            total_count = 0
-
-            while True:
-                params = {
-                    API_LIMIT_PARAM: FETCH_LIMIT,
-                    API_OFFSET_PARAM: offset,
-                    API_ORDER_PARAM: API_ORDER_BY,
-                }
+        return (await self._async_decode(response)).results
 
-                _LOGGER.debug(
-                    "Fetching recalls: offset=%d, limit=%d", offset, FETCH_LIMIT
-                )
+    async def async_get_details(
+        self, recalls: list[dict[str, Any]], *, stored: bool = True
+    ) -> list[dict[str, Any]]:
+        """Return recalls with all their fields.
+
+        Recalls stored from the polling projection are fetched in batches by id
+        and saved back to the store, so each one is downloaded in full once.
+        With ``stored`` False, the recalls are API summaries that may not be in
+        the store: the ones missing from it are fetched but not stored, as only
+        a sync adds recalls to the mirror and moves its watermark.
 
-                response = await client.get(API_ENDPOINT, params=params)
+        Raises:
+            httpx.HTTPError: If API request fails
+        """
+        recall_ids = [recall["id"] for recall in recalls]
+        undetailed = await self.store.async_get_undetailed(recall_ids)
+        if stored:
+            full: dict[int, dict[str, Any]] = {}
+            missing = undetailed
+        else:
+            full = {
+                recall["id"]: recall
+                for recall in await self.store.async_get_detailed(recall_ids)
+            }
+            missing = sorted(set(recall_ids) - full.keys())
+        if not missing:
+            return [full.get(recall["id"], recall) for recall in recalls]
+
+        detailed: dict[int, dict[str, Any]] = {}
+        for start in range(0, len(missing), FETCH_LIMIT):
+            batch = missing[start : start + FETCH_LIMIT]
+            params = {
+                API_LIMIT_PARAM: FETCH_LIMIT,
+                "where": " OR ".join(f"id={recall_id}" for recall_id in batch),
+            }
+            try:
+                response = await self.api.get(
+                    API_ENDPOINT,
+                    params=params,
+                    max_retries=API_SERVICE_RETRIES,
+                    timeout=API_SERVICE_TIMEOUT,
+                )
                 response.raise_for_status()
+            except httpx.HTTPError:
+                _LOGGER.exception("Error fetching recall details")
+                raise
+            self._count_bytes(response)
+            detailed.update(
+                (recall["id"], recall)
+                for recall in (await self._async_decode(response)).results
+            )
+
+        _LOGGER.debug("Fetched details of %d recalls", len(detailed))
+        undetailed_ids = set(undetailed)
+        await self.store.async_upsert(
+            [recall for recall in detailed.values() if recall["id"] in undetailed_ids]
+        )
+        full.update(detailed)
+        return [full.get(recall["id"], recall) for recall in recalls]
+
+    async def _async_get_stored_details(
+        self, recalls: list[dict[str, Any]]
+    ) -> list[dict[str, Any]]:
+        """Return stored recalls with all their fields, or as stored without API."""
+        try:
+            return await self.async_get_details(recalls)
+        except httpx.HTTPError as err:
+            if not is_unavailable(err):
+                raise
+            return recalls
+
+    def _count_bytes(self, response: httpx.Response) -> None:
+        """Account for the size of a response body."""
+        content = response.content
+        if isinstance(content, bytes):
+            self.bytes_received += len(content)
+
+    @contextmanager
+    def _on_loop(self) -> Iterator[None]:
+        """Account for synchronous work done on the event loop."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.loop_time += time.perf_counter() - start
+
+    async def _async_decode(self, response: httpx.Response) -> RecallPage:
+        """Decode a page of recalls, in the executor when it is large."""
+        content = response.content
+        if isinstance(content, bytes) and len(content) > DECODE_EXECUTOR_THRESHOLD:
+            self.executor_decodes += 1
+            return await self.hass.async_add_executor_job(RecallPage.from_body, content)
+        with self._on_loop():
+            return RecallPage.from_json(response.json())
+
+    async def _async_fetch_page(
+        self, offset: int, where: str | None = None
+    ) -> RecallPage:
+        """Fetch one page of recalls, newest first."""
+        params: dict[str, Any] = {
+            API_LIMIT_PARAM: FETCH_LIMIT,
+            API_OFFSET_PARAM: offset,
+            API_ORDER_PARAM: API_ORDER_BY,
+            # Only the summary fields; details are fetched on demand
+            API_SELECT_PARAM: POLL_SELECT,
+        }
+        if where:
+            params["where"] = where
+
+        _LOGGER.debug(
+            "Fetching recalls: offset=%d, limit=%d, where=%s",
+            offset,
+            FETCH_LIMIT,
+            where,
+        )
 
-                data = response.json()
-                api_response = APIResponse(**data)
-                total_count = api_response.total_count
+        response = await self.api.get(API_ENDPOINT, params=params)
+        response.raise_for_status()
+        self._count_bytes(response)
 
+        return await self._async_decode(response)
+
+    async def _async_fetch_pages(
+        self,
+        where: str | None = None,
+        max_records: int = MAX_SYNC_OFFSET,
+        stop_when_known: bool = False,
+        until: Callable[[list[dict[str, Any]]], bool] | None = None,
+    ) -> tuple[list[dict[str, Any]], int]:
+        """Fetch pages of recalls, newest first.
+
+        The first page tells how many records match, so the remaining offsets
+        are fetched concurrently in waves of at most ``max_concurrency`` pages,
+        and processed in offset order.
+
+        Args:
+            where: Optional ODSQL filter
+            max_records: Maximum number of records to fetch
+            stop_when_known: Stop after a page where less than 20% of the
+                recalls are new
+            until: Called with the recalls of each page, stops after the
+                page it returns True for
+
+        Returns:
+            The fetched recalls and the number of records matching the filter
+        """
+        first_page = await self._async_fetch_page(0, where)
+        total_count = first_page.total_count
+
+        offsets: list[int] = []
+        if len(first_page.results) == FETCH_LIMIT:
+            if total_count > MAX_SYNC_OFFSET and max_records >= MAX_SYNC_OFFSET:
+                _LOGGER.warning(
+                    "%d recalls to sync, syncing the first %d only",
+                    total_count,
+                    MAX_SYNC_OFFSET,
+                )
+            end = min(total_count, max_records, MAX_SYNC_OFFSET)
+            offsets = list(range(FETCH_LIMIT, end, FETCH_LIMIT))
+
+        all_recalls: list[dict[str, Any]] = []
+        # Offset paging repeats the boundary record of a page when a recall is
+        # published between two requests
+        seen: set[int] = set()
+        pages = [first_page]
+        while True:
+            for api_response in pages:
                 if not api_response.results:
-                    break
+                    return all_recalls, total_count
 
                 # Track new recalls (not in our cache)
-                current_page_ids = api_response.get_recall_ids()
-                new_in_page = current_page_ids - self._known_recall_ids
-                new_recall_ids.update(new_in_page)
-
-                # Add recalls to our collection
-                all_recalls.extend(
-                    recall.to_english_dict() for recall in api_response.results
+                new_in_page = self._known_recall_ids.unknown(
+                    api_response.get_recall_ids()
                 )
 
-                # Stop if we've collected enough or if most recalls are known
-                if (
-                    len(all_recalls) >= MAX_RECENT_RECALLS * 2
-                ):  # Fetch extra to ensure we get all new ones
-                    break
+                # Add recalls to our collection, once each
+                page = [
+                    recall
+                    for recall in api_response.results
+                    if recall.get("id") not in seen
+                ]
+                seen.update(recall["id"] for recall in page if "id" in recall)
+                all_recalls.extend(page)
+                if until is not None and until(page):
+                    return all_recalls, total_count
+
+                # A short page is the last one
+                if len(api_response.results) < FETCH_LIMIT:
+                    return all_recalls, total_count
 
                 # If less than 20% are new, we've probably got all recent ones
-                if len(new_in_page) < FETCH_LIMIT * 0.2:
+                if stop_when_known and len(new_in_page) < FETCH_LIMIT * 0.2:
                     _LOGGER.debug("Most recalls already known, stopping pagination")
-                    break
+                    return all_recalls, total_count
 
-                offset += FETCH_LIMIT
+            if not offsets:
+                return all_recalls, total_count
 
-            # Update our known IDs cache
-            if all_recalls:
-                self._known_recall_ids.update(
-                    recall["id"] for recall in all_recalls if "id" in recall
-                )
-                # Keep cache size reasonable (last MAX_CACHE_SIZE IDs)
-                if len(self._known_recall_ids) > MAX_CACHE_SIZE:
-                    # Remove oldest IDs (smaller numbers typically older)
-                    sorted_ids = sorted(self._known_recall_ids)
-                    self._known_recall_ids = set(sorted_ids[-MAX_CACHE_SIZE:])
+            wave = offsets[: self.max_concurrency]
+            offsets = offsets[self.max_concurrency :]
+            pages = await asyncio.gather(
+                *(self._async_fetch_page(offset, where) for offset in wave)
+            )
 
-            # Keep only most recent recalls for sensor attributes
-            recent_recalls = all_recalls[:MAX_RECENT_RECALLS]
+    async def async_bootstrap(self) -> None:
+        """Fill the local mirror with the older recalls from the export endpoint.
 
-            _LOGGER.info(
-                "Fetched %d recalls (%d new) - Total in dataset: %d",
-                len(all_recalls),
-                len(new_recall_ids),
-                total_count,
+        The JSON lines export is parsed as it streams in and stored in batches,
+        so memory use does not depend on the dataset size. The last stored ID
+        is saved after each batch, and an interrupted bootstrap resumes after
+        it. Recalls published since the first sync are left to the regular
+        refreshes.
+        """
+        checkpoint = await self.store.async_get_meta(META_BOOTSTRAP)
+        state: dict[str, Any] = json_loads(checkpoint) if checkpoint else {}
+        if state.get("done"):
+            return
+        before = state.get("before") or await self.store.async_get_watermark()
+        if before is None:
+            return
+
+        where = f"date_publication < date'{before}'"
+        if after_id := state.get("after_id"):
+            where += f" AND id > {after_id}"
+        params = {
+            API_SELECT_PARAM: POLL_SELECT,
+            API_ORDER_PARAM: "id ASC",
+            "where": where,
+        }
+
+        _LOGGER.debug("Bootstrapping the local mirror: where=%s", where)
+        batch: list[dict[str, Any]] = []
+        stored = 0
+        try:
+            await self.api.acquire()
+            async with self.api.stream(API_EXPORT_ENDPOINT, params=params) as response:
+                response.raise_for_status()
+                try:
+                    async for line in response.aiter_lines():
+                        if not line:
+                            continue
+                        with self._on_loop():
+                            batch.append(decode_recall(json_loads(line)))
+                        if len(batch) >= BOOTSTRAP_BATCH_SIZE:
+                            await self._async_store_bootstrap_batch(batch, before)
+                            stored += len(batch)
+                            batch = []
+                finally:
+                    self.bytes_received += response.num_bytes_downloaded
+            if batch:
+                await self._async_store_bootstrap_batch(batch, before)
+                stored += len(batch)
+        except httpx.HTTPError as err:
+            _LOGGER.warning(
+                "Mirror bootstrap interrupted after %d recalls, it will resume"
+                " on next start: %s",
+                stored,
+                err,
             )
+            return
+
+        await self.store.async_set_meta(
+            META_BOOTSTRAP, json_dumps({"before": before, "done": True})
+        )
+        self.bootstrap_done = True
+        self.mirror_complete = await self.store.async_is_complete()
+        self.search_cache.clear()
+        self.statistics_cache.clear()
+        await self._async_seed_counters()
+        _LOGGER.info(
+            "Mirror bootstrap stored %d recalls, mirror complete: %s",
+            stored,
+            self.mirror_complete,
+        )
+
+    async def _async_store_bootstrap_batch(
+        self, batch: list[dict[str, Any]], before: str
+    ) -> None:
+        """Store a batch of exported recalls and checkpoint the bootstrap."""
+        await self.store.async_upsert(batch, detailed=False)
+        with self._on_loop():
+            self._index_gtins(batch)
+        await self.store.async_set_meta(
+            META_BOOTSTRAP, json_dumps({"before": before, "after_id": batch[-1]["id"]})
+        )
 
-            # Fire events for each new recall
+    def reconcile_due(self) -> bool:
+        """Return True when the mirror should be reconciled with the API."""
+        # An incomplete mirror once bootstrapped is what reconciling repairs
+        if self._reconciling or not self.bootstrap_done:
+            return False
+        if not self.api.breaker.is_closed:
+            return False
+        return self.last_reconcile is None or (
+            dt_util.utcnow() - self.last_reconcile
+            >= timedelta(seconds=RECONCILE_INTERVAL)
+        )
+
+    async def async_reconcile(self) -> None:
+        """Find and repair the differences between the mirror and the dataset.
+
+        Polls only ask for recalls newer than the watermark, so recalls
+        withdrawn, back-dated or corrected in the history go unnoticed. The
+        API counts recalls per publication month in a single aggregation
+        query; the months whose count differs from the mirror's are fetched
+        again, their recalls stored and the stored ones missing removed.
+        """
+        if self._reconciling:
+            return
+        self._reconciling = True
+        try:
+            await self._async_reconcile()
+        except httpx.HTTPError as err:
+            _LOGGER.warning("Reconciliation with the API failed: %s", err)
+        finally:
+            self._reconciling = False
+
+    async def _async_fetch_month_counts(self) -> dict[str, int]:
+        """Return the number of recalls per publication month (YYYY-MM)."""
+        response = await self.api.get(
+            API_ENDPOINT,
+            params={
+                API_SELECT_PARAM: "count(*) as count",
+                API_GROUP_BY_PARAM: "date_format(date_publication, 'yyyy-MM') as month",
+                API_LIMIT_PARAM: API_GROUP_BY_LIMIT,
+            },
+        )
+        response.raise_for_status()
+        self._count_bytes(response)
+        return {
+            row["month"]: row["count"]
+            for row in response.json().get("results", [])
+            if row.get("month")
+        }
+
+    async def _async_reconcile(self) -> None:
+        """Reconcile the mirror with the month counts of the API."""
+        remote = await self._async_fetch_month_counts()
+        local = await self.store.async_count_by_month()
+        months = sorted(
+            (
+                month
+                for month in remote.keys() | local.keys()
+                if remote.get(month, 0) != local.get(month, 0)
+            ),
+            reverse=True,
+        )
+        _LOGGER.debug("Reconciling %d months: %s", len(months), months)
+
+        removed = 0
+        for month in months:
+            start, end = _month_range(month)
+            fetched: list[dict[str, Any]] = []
+            if remote.get(month):
+                fetched, _ = await self._async_fetch_pages(
+                    where=(
+                        f"date_publication >= date'{start}'"
+                        f" AND date_publication < date'{end}'"
+                    )
+                )
+            changes = await self.store.async_upsert_changes(fetched, detailed=False)
+            removed_ids = await self.store.async_delete_missing(
+                start, end, {recall["id"] for recall in fetched}
+            )
+            removed += len(removed_ids)
+            with self._on_loop():
+                self._index_gtins(fetched)
+                for recall_id in removed_ids:
+                    self.gtin_index.update(recall_id, set())
+                # Back-dated recalls are reported like the ones just published
+                new_recall_ids = self._known_recall_ids.unknown(changes.inserted) - {
+                    update.recall["id"] for update in changes.updated
+                }
+                self._remember_recall_ids(fetched)
             if new_recall_ids:
-                self._fire_new_recall_events(all_recalls, new_recall_ids)
+                self._fire_new_recall_events(fetched, new_recall_ids)
+            if changes.updated:
+                self._fire_recall_updated_events(changes.updated)
 
-            return {
-                "total_count": total_count,
-                "recent_recalls": recent_recalls,
-                "new_recalls_count": len(new_recall_ids),
-                "last_update": dt_util.utcnow().isoformat(),
-            }
+        total_count = sum(remote.values())
+        await self.store.async_set_total_count(total_count)
+        self.mirror_complete = await self.store.async_is_complete()
+        self.last_reconcile = dt_util.utcnow()
+        await self.store.async_set_meta(META_RECONCILE, self.last_reconcile.isoformat())
+        self.reconciled_months += len(months)
+        self.reconcile_removed += removed
+        _LOGGER.info(
+            "Reconciled %d months with the API, removed %d recalls",
+            len(months),
+            removed,
+        )
+
+        if months:
+            self.search_cache.clear()
+            self.statistics_cache.clear()
+            await self._async_seed_counters()
+            data = await self._async_build_data(total_count, set())
+            self._dispatch_recent_changes(data)
+            self.async_set_updated_data(data)
+
+    async def _async_probe(self) -> dict[str, Any] | None:
+        """Check whether the dataset changed since the last sync.
+
+        Fetches the newest record's id and GUID with conditional headers, and
+        compares them and the dataset size with the last synced state.
+
+        Returns:
+            The new probe state when the dataset changed, None otherwise
+        """
+        headers: dict[str, str] = {}
+        if etag := self._probe_state.get("etag"):
+            headers["If-None-Match"] = etag
+        if last_modified := self._probe_state.get("last_modified"):
+            headers["If-Modified-Since"] = last_modified
+
+        response = await self.api.get(
+            API_ENDPOINT,
+            params={
+                API_LIMIT_PARAM: 1,
+                API_ORDER_PARAM: API_ORDER_BY,
+                API_SELECT_PARAM: PROBE_SELECT,
+            },
+            headers=headers,
+        )
+        if response.status_code == HTTPStatus.NOT_MODIFIED:
+            self.probe_hits += 1
+            return None
+        response.raise_for_status()
+        self._count_bytes(response)
+
+        data = response.json()
+        top = data["results"][0] if data.get("results") else {}
+        probe: dict[str, Any] = {
+            "signature": (
+                f"{data['total_count']}:{top.get('id')}:{top.get('rappel_guid')}"
+            ),
+        }
+        for key, header in (("etag", "ETag"), ("last_modified", "Last-Modified")):
+            if isinstance(value := response.headers.get(header), str):
+                probe[key] = value
+
+        if probe["signature"] == self._probe_state.get("signature"):
+            self.probe_hits += 1
+            if probe != self._probe_state:
+                # Remember new validators so the next probe can get a 304
+                self._probe_state = probe
+                await self.store.async_set_meta(META_PROBE, json_dumps(probe))
+            return None
+
+        self.probe_misses += 1
+        return probe
+
+    def _index_gtins(self, recalls: list[dict[str, Any]]) -> None:
+        """Update the GTIN index with synced recalls."""
+        for recall in recalls:
+            if "id" in recall:
+                self.gtin_index.update(
+                    recall["id"], extract_gtins(recall.get("product_identification"))
+                )
 
+    def _remember_recall_ids(self, recalls: list[dict[str, Any]]) -> None:
+        """Add synced recall IDs to the known IDs cache."""
+        self._known_recall_ids.add(recall["id"] for recall in recalls if "id" in recall)
+
+    def _schedule_next_poll(self, found_new: bool) -> None:
+        """Adapt the polling interval to the publication cadence."""
+        self.update_interval = self.scheduler.next_interval(dt_util.utcnow(), found_new)
+        _LOGGER.debug("Next poll in %s", self.update_interval)
+
+    async def _async_build_data(
+        self, total_count: int, new_recall_ids: set[int]
+    ) -> dict[str, Any]:
+        """Build the coordinator data from the local mirror."""
+        # Sensor attributes are served from the local mirror
+        recent_recalls = await self.store.async_get_recent(MAX_RECENT_RECALLS)
+        last_update = dt_util.utcnow().isoformat()
+        await self.store.async_set_meta(META_LAST_UPDATE, last_update)
+
+        return {
+            "total_count": total_count,
+            "recent_recalls": recent_recalls,
+            "new_recalls_count": len(new_recall_ids),
+            "last_update": last_update,
+        }
+
+    def _stale_data(self, err: httpx.HTTPError) -> dict[str, Any]:
+        """Return the last good data, marked stale, while the API is down."""
+        if self.data.get("stale"):
+            _LOGGER.debug("API still unavailable: %s", err)
+        else:
+            _LOGGER.warning(
+                "Rappel Conso API unavailable, keeping the data of %s: %s",
+                self.data.get("last_update"),
+                err,
+            )
+        self._schedule_next_poll(found_new=False)
+
+        data_age = None
+        if (last_update := self.data.get("last_update")) and (
+            updated := dt_util.parse_datetime(last_update)
+        ):
+            data_age = round((dt_util.utcnow() - updated).total_seconds())
+        return {
+            **self.data,
+            "new_recalls_count": 0,
+            "stale": True,
+            "data_age": data_age,
+        }
+
+    def _dispatch_recent_changes(self, data: dict[str, Any]) -> None:
+        """Send the recalls added to, updated in or removed from the recent ones."""
+        previous = {
+            recall["id"]: recall
+            for recall in (self.data or {}).get("recent_recalls", [])
+        }
+        current = {recall["id"]: recall for recall in data["recent_recalls"]}
+        changes = {
+            "added": [
+                recall
+                for recall_id, recall in current.items()
+                if recall_id not in previous
+            ],
+            "updated": [
+                recall
+                for recall_id, recall in current.items()
+                if recall_id in previous and previous[recall_id] != recall
+            ],
+            "removed": [
+                recall_id for recall_id in previous if recall_id not in current
+            ],
+        }
+        if any(changes.values()):
+            async_dispatcher_send(self.hass, SIGNAL_RECENT_RECALLS_CHANGED, changes)
+
+    async def _async_update_data(self) -> dict[str, Any]:
+        """Sync the local store with the API and return the sensor data."""
+        try:
+            data = await self._async_sync()
         except httpx.HTTPStatusError as err:
+            if self.data is not None and is_unavailable(err):
+                return self._stale_data(err)
             raise UpdateFailed(
                 f"HTTP error occurred: {err.response.status_code}"
             ) from err
         except httpx.RequestError as err:
+            if self.data is not None:
+                return self._stale_data(err)
             raise UpdateFailed(f"Error communicating with API: {err}") from err
         except Exception as err:
             _LOGGER.exception("Unexpected error fetching recall data")
             raise UpdateFailed(f"Unexpected error: {err}") from err
 
+        self._dispatch_recent_changes(data)
+        return data
+
+    async def _async_sync(self) -> dict[str, Any]:
+        """Sync the local store with the API and build the sensor data."""
+        bytes_before = self.bytes_received
+        loop_time_before = self.loop_time
+
+        watermark = await self.store.async_get_watermark()
+        probe: dict[str, Any] | None = None
+        if watermark is not None:
+            probe = await self._async_probe()
+            if probe is None:
+                _LOGGER.debug("No change since last sync, skipping fetch")
+                self.last_poll_bytes = self.bytes_received - bytes_before
+                self.last_poll_loop_time = self.loop_time - loop_time_before
+                self._schedule_next_poll(found_new=False)
+                return await self._async_build_data(
+                    await self.store.async_get_total_count(), set()
+                )
+
+        if watermark is None:
+            # Fetch extra to ensure we get all new ones
+            fetched, total_count = await self._async_fetch_pages(
+                max_records=MAX_RECENT_RECALLS * 2, stop_when_known=True
+            )
+            changes = await self.store.async_upsert_changes(fetched, detailed=False)
+        else:
+            # Only recalls published at or after the watermark; the
+            # watermark record itself comes back, so a quiet period costs
+            # a single request for a one-record page.
+            fetched, _ = await self._async_fetch_pages(
+                where=f"date_publication >= date'{watermark}'"
+            )
+            # A filtered query only counts matching records, so the
+            # dataset size is carried forward from the previous sync.
+            changes = await self.store.async_upsert_changes(fetched, detailed=False)
+            total_count = await self.store.async_get_total_count() + len(
+                changes.inserted
+            )
+        await self.store.async_set_total_count(total_count)
+        with self._on_loop():
+            self._index_gtins(fetched)
+            self.scheduler.observe(
+                recall.get("publication_date")
+                for recall in fetched
+                if recall["id"] in changes.inserted
+            )
+        self.mirror_complete = await self.store.async_is_complete()
+        if probe is not None:
+            self._probe_state = probe
+            await self.store.async_set_meta(META_PROBE, json_dumps(probe))
+
+        with self._on_loop():
+            # A new version of a stored recall is an update, whatever its ID
+            new_recall_ids = self._known_recall_ids.unknown(
+                recall["id"] for recall in fetched if "id" in recall
+            ) - {update.recall["id"] for update in changes.updated}
+            self._remember_recall_ids(fetched)
+        if changes.inserted or changes.updated or new_recall_ids:
+            self.search_cache.clear()
+            self.statistics_cache.clear()
+        if self.counters and (changes.inserted or changes.updated):
+            # Only new and updated recalls can change the counts
+            changed = [
+                recall for recall in fetched if recall["id"] in changes.inserted
+            ] + [update.recall for update in changes.updated]
+            with self._on_loop():
+                for counter in self.counters:
+                    counter.observe(changed)
+
+        _LOGGER.info(
+            "Fetched %d recalls (%d new, %d updated, %d unchanged) - "
+            "Total in dataset: %d",
+            len(fetched),
+            len(new_recall_ids),
+            len(changes.updated),
+            changes.unchanged,
+            total_count,
+        )
+
+        # Fire events for each new recall
+        if new_recall_ids:
+            with self._on_loop():
+                self._fire_new_recall_events(fetched, new_recall_ids)
+        if changes.updated:
+            self._fire_recall_updated_events(changes.updated)
+
+        self.last_poll_bytes = self.bytes_received - bytes_before
+        self.last_poll_loop_time = self.loop_time - loop_time_before
+        _LOGGER.debug(
+            "Update blocked the event loop for %.1f ms",
+            self.last_poll_loop_time * 1000,
+        )
+        self._schedule_next_poll(found_new=bool(new_recall_ids))
+        return await self._async_build_data(total_count, new_recall_ids)
+
     async def async_shutdown(self) -> None:
         """Shutdown coordinator and cleanup resources."""
-        if self._client is not None:
-            await self._client.aclose()
-            self._client = None
+        # The HTTP client is shared and closed when Home Assistant stops
+        self.digest.async_flush()
+        await self.store.async_close()
@@ -0,0 +1,176 @@
+"""Rolling counts of the recalls published in the last days."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from datetime import date
+from typing import Any
+
+import voluptuous as vol
+from homeassistant.helpers import config_validation as cv
+from homeassistant.util import dt as dt_util
+from homeassistant.util import slugify
+
+from .const import (
+    ATTR_BRANDS,
+    ATTR_CATEGORIES,
+    ATTR_DAYS,
+    ATTR_KEYWORDS,
+    ATTR_NAME,
+    ATTR_PRODUCT_NAMES,
+    ATTR_RISKS,
+    MAX_COUNTER_DAYS,
+)
+from .scheduler import PUBLICATION_TIME_ZONE
+from .search import SearchCriteria
+from .store import recall_key
+
+# Recall fields searched by the risk terms of a counter
+_RISK_FIELDS = ("risks", "recall_reason")
+
+_TERMS = vol.All(cv.ensure_list, [cv.string])
+
+COUNTERS_SCHEMA = vol.Schema(
+    [
+        vol.Schema(
+            {
+                vol.Required(ATTR_NAME): cv.string,
+                vol.Required(ATTR_DAYS): vol.All(
+                    vol.Coerce(int), vol.Range(min=1, max=MAX_COUNTER_DAYS)
+                ),
+                vol.Optional(ATTR_PRODUCT_NAMES, default=list): _TERMS,
+                vol.Optional(ATTR_BRANDS, default=list): _TERMS,
+                vol.Optional(ATTR_CATEGORIES, default=list): _TERMS,
+                vol.Optional(ATTR_KEYWORDS, default=list): _TERMS,
+                vol.Optional(ATTR_RISKS, default=list): _TERMS,
+            }
+        )
+    ]
+)
+
+
+def validate_counters(value: object) -> list[dict[str, Any]]:
+    """Validate the recall counters of the integration options.
+
+    Names are compared as slugs, as they make the sensor unique IDs.
+
+    Raises:
+        vol.Invalid: If a counter is malformed or its name is used twice
+    """
+    counters: list[dict[str, Any]] = COUNTERS_SCHEMA(value or [])
+    slugs: set[str] = set()
+    for counter in counters:
+        if (slug := slugify(counter[ATTR_NAME])) in slugs:
+            msg = f"duplicate counter name: {counter[ATTR_NAME]}"
+            raise vol.Invalid(msg)
+        slugs.add(slug)
+    return counters
+
+
+class RecallCounter:
+    """Count the recalls matching criteria published in the last days.
+
+    Recalls are counted per publication day in a ring of ``days`` buckets, so
+    the count is kept up to date from each new or updated recall, and days
+    leaving the window are dropped by clearing their bucket. Recalls are
+    counted once per sheet, whatever their number of versions.
+    """
+
+    def __init__(self, config: dict[str, Any]) -> None:
+        """Initialize an empty counter from its validated options."""
+        self.name: str = config[ATTR_NAME]
+        self.days: int = config[ATTR_DAYS]
+        self.criteria = SearchCriteria.from_lists(
+            product_names=config[ATTR_PRODUCT_NAMES],
+            brands=config[ATTR_BRANDS],
+            categories=config[ATTR_CATEGORIES],
+            keywords=config[ATTR_KEYWORDS],
+        )
+        self.risks: tuple[str, ...] = tuple(
+            risk.casefold() for risk in config[ATTR_RISKS]
+        )
+        self._time_zone = dt_util.get_time_zone(PUBLICATION_TIME_ZONE)
+        # Day number and recall keys of each bucket, indexed by day % days
+        self._buckets: list[tuple[int, set[str]]] = [
+            (0, set()) for _ in range(self.days)
+        ]
+        self._day_of: dict[str, int] = {}
+        self._total = 0
+        self._today = self._current_day()
+
+    def _current_day(self) -> int:
+        """Return the day number of today, in French time."""
+        return dt_util.now(self._time_zone).date().toordinal()
+
+    def _day(self, value: str | None) -> int | None:
+        """Return the day number of a publication date, in French time."""
+        if not value or (moment := dt_util.parse_datetime(value)) is None:
+            return None
+        return moment.astimezone(self._time_zone).date().toordinal()
+
+    def _matches(self, recall: dict[str, Any]) -> bool:
+        """Return True when a recall matches the counter criteria."""
+        if not self.criteria.matches(recall):
+            return False
+        if not self.risks:
+            return True
+        values = [str(recall.get(field) or "").casefold() for field in _RISK_FIELDS]
+        return any(risk in value for risk in self.risks for value in values)
+
+    def _advance(self, today: int) -> None:
+        """Drop the buckets of the days that left the window."""
+        if today <= self._today:
+            return
+        for day in range(max(self._today, today - self.days) + 1, today + 1):
+            _, keys = self._buckets[day % self.days]
+            self._total -= len(keys)
+            for key in keys:
+                del self._day_of[key]
+            self._buckets[day % self.days] = (day, set())
+        self._today = today
+
+    def _discard(self, key: str) -> None:
+        """Stop counting a recall."""
+        if (day := self._day_of.pop(key, None)) is not None:
+            self._buckets[day % self.days][1].discard(key)
+            self._total -= 1
+
+    def observe(self, recalls: Iterable[dict[str, Any]]) -> None:
+        """Count new recalls, and recount updated ones."""
+        self._advance(self._current_day())
+        for recall in recalls:
+            key = recall_key(recall)
+            self._discard(key)
+            day = self._day(recall.get("publication_date"))
+            if day is None or not self._today - self.days < day <= self._today:
+                continue
+            if not self._matches(recall):
+                continue
+            bucket_day, keys = self._buckets[day % self.days]
+            if bucket_day != day:
+                # The bucket was last used by a day out of the window
+                self._total -= len(keys)
+                for old_key in keys:
+                    del self._day_of[old_key]
+                keys = set()
+                self._buckets[day % self.days] = (day, keys)
+            keys.add(key)
+            self._day_of[key] = day
+            self._total += 1
+
+    def reset(self) -> None:
+        """Forget every counted recall."""
+        self._buckets = [(0, set()) for _ in range(self.days)]
+        self._day_of.clear()
+        self._total = 0
+
+    @property
+    def count(self) -> int:
+        """Return the number of matching recalls in the window."""
+        self._advance(self._current_day())
+        return self._total
+
+    @property
+    def first_day(self) -> date:
+        """Return the first day of the window."""
+        return date.fromordinal(self._today - self.days + 1)
@@ -0,0 +1,93 @@
+"""Diagnostics support for Rappel Conso."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.util.json import json_loads
+
+from .api import HTTP2_AVAILABLE
+from .const import DOMAIN
+from .coordinator import RappelConsoCoordinator
+from .store import META_BOOTSTRAP
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator: RappelConsoCoordinator = hass.data[DOMAIN][entry.entry_id]
+    bootstrap = await coordinator.store.async_get_meta(META_BOOTSTRAP)
+
+    return {
+        "last_update_success": coordinator.last_update_success,
+        "total_count": (coordinator.data or {}).get("total_count"),
+        "mirror": {
+            "stored_recalls": await coordinator.store.async_count(),
+            "complete": coordinator.mirror_complete,
+            "watermark": await coordinator.store.async_get_watermark(),
+            "indexed_gtins": len(coordinator.gtin_index),
+            "bootstrap": json_loads(bootstrap) if bootstrap else None,
+        },
+        "polling": {
+            "interval_seconds": coordinator.update_interval.total_seconds()
+            if coordinator.update_interval
+            else None,
+            "learned_publications": coordinator.scheduler.observations,
+        },
+        "bytes_received": {
+            "total": coordinator.bytes_received,
+            "last_poll": coordinator.last_poll_bytes,
+        },
+        "probe": {
+            "hits": coordinator.probe_hits,
+            "misses": coordinator.probe_misses,
+        },
+        "event_loop": {
+            "last_poll_blocked_ms": round(coordinator.last_poll_loop_time * 1000, 3),
+            "total_blocked_ms": round(coordinator.loop_time * 1000, 3),
+            "executor_decodes": coordinator.executor_decodes,
+        },
+        "api": {
+            "requests": coordinator.api.requests,
+            "retries": coordinator.api.retries,
+            "rate_limited": coordinator.api.rate_limited,
+            "throttled": coordinator.api.limiter.throttled,
+            "queue_depth": coordinator.api.limiter.waiting,
+            "connections": coordinator.api.connections,
+            "reused_connections": coordinator.api.reused_connections,
+            "tls_handshakes": coordinator.api.tls_handshakes,
+            "http2": HTTP2_AVAILABLE,
+            "http2_responses": coordinator.api.http2_responses,
+            "circuit": coordinator.api.breaker.state,
+            "circuit_trips": coordinator.api.breaker.trips,
+            "circuit_rejected": coordinator.api.breaker.rejected,
+        },
+        "reconciliation": {
+            "last_run": (
+                coordinator.last_reconcile.isoformat()
+                if coordinator.last_reconcile
+                else None
+            ),
+            "months_refetched": coordinator.reconciled_months,
+            "recalls_removed": coordinator.reconcile_removed,
+        },
+        "events": {
+            "mode": coordinator.event_mode,
+            "digest_pending": len(coordinator.digest),
+            "updated_recalls": coordinator.updated_recalls,
+        },
+        "watchlists": {
+            "count": coordinator.watchlists.watchlists,
+            "matches": coordinator.watch_matches,
+        },
+        "counters": {counter.name: counter.count for counter in coordinator.counters},
+        "search_cache": {
+            "entries": len(coordinator.search_cache),
+            "hits": coordinator.search_cache.hits,
+            "misses": coordinator.search_cache.misses,
+            "coalesced": coordinator.search_cache.coalesced,
+        },
+    }
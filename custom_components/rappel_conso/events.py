@@ -0,0 +1,89 @@
+"""Event bus reporting of new recalls."""
+
+from __future__ import annotations
+
+import logging
+from datetime import datetime, timedelta
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.util import dt as dt_util
+
+from .const import EVENT_NEW_RECALLS
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def recall_event_data(recall: dict[str, Any]) -> dict[str, Any]:
+    """Return the event data describing a recall."""
+    return {
+        "recall_id": recall.get("id"),
+        "sheet_number": recall.get("sheet_number"),
+        "version_number": recall.get("version_number"),
+        "recall_guid": recall.get("recall_guid"),
+        "product_name": recall.get("product_name"),
+        "category": recall.get("category"),
+        "subcategory": recall.get("subcategory"),
+        "brand": recall.get("brand"),
+        "publication_date": recall.get("publication_date"),
+        "recall_reason": recall.get("recall_reason"),
+        "risks": recall.get("risks"),
+        "recall_link": recall.get("recall_link"),
+    }
+
+
+class RecallDigest:
+    """Gather new recalls and report them in one event per time window.
+
+    The window starts with the first recall added and the event is fired when
+    it ends, or when the digest is flushed on unload.
+    """
+
+    def __init__(self, hass: HomeAssistant, window: timedelta) -> None:
+        """Initialize an empty digest."""
+        self.hass = hass
+        self.window = window
+        self._recalls: list[dict[str, Any]] = []
+        self._started: datetime | None = None
+        self._cancel: CALLBACK_TYPE | None = None
+
+    def __len__(self) -> int:
+        """Return the number of recalls waiting for the digest event."""
+        return len(self._recalls)
+
+    @callback
+    def add(self, recalls: list[dict[str, Any]]) -> None:
+        """Add the event data of new recalls to the digest."""
+        if not recalls:
+            return
+        self._recalls.extend(recalls)
+        if self._cancel is None:
+            self._started = dt_util.utcnow()
+            self._cancel = async_call_later(self.hass, self.window, self._async_fire)
+
+    @callback
+    def _async_fire(self, _now: datetime) -> None:
+        """Fire the digest event at the end of the window."""
+        self._cancel = None
+        self.async_flush()
+
+    @callback
+    def async_flush(self) -> None:
+        """Fire the digest event now for the recalls gathered so far."""
+        if self._cancel is not None:
+            self._cancel()
+            self._cancel = None
+        if not self._recalls:
+            return
+        recalls, self._recalls = self._recalls, []
+        self.hass.bus.async_fire(
+            EVENT_NEW_RECALLS,
+            {
+                "recalls": recalls,
+                "count": len(recalls),
+                "window_start": self._started.isoformat() if self._started else None,
+                "window_end": dt_util.utcnow().isoformat(),
+            },
+        )
+        _LOGGER.debug("Fired a digest of %d new recalls", len(recalls))
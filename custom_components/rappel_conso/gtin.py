@@ -0,0 +1,144 @@
+"""GTIN (barcode) parsing and lookup index."""
+
+from __future__ import annotations
+
+import hashlib
+import math
+import re
+from collections.abc import Iterable
+
+# Standalone digit runs that may be a GTIN-8, -12 (UPC), -13 (EAN) or -14
+_GTIN_CANDIDATE = re.compile(r"(?<!\d)(\d{8}|\d{12,14})(?!\d)")
+_GTIN_LENGTHS = frozenset({8, 12, 13, 14})
+GTIN_LENGTH = 14
+
+BLOOM_FALSE_POSITIVE_RATE = 0.001
+_BLOOM_MIN_CAPACITY = 1024
+
+
+def _check_digit_ok(digits: str) -> bool:
+    """Return True when the last digit is the GS1 check digit of the others."""
+    total = sum(
+        int(digit) * (3 if index % 2 == 0 else 1)
+        for index, digit in enumerate(reversed(digits[:-1]))
+    )
+    return (10 - total % 10) % 10 == int(digits[-1])
+
+
+def normalize_gtin(value: str) -> str | None:
+    """Return the GTIN-14 form of a barcode, or None if it is not a valid GTIN.
+
+    Spaces and dashes are ignored, shorter GTINs are left-padded with zeros.
+    """
+    digits = value.replace(" ", "").replace("-", "")
+    if not digits.isdigit() or len(digits) not in _GTIN_LENGTHS:
+        return None
+    if not _check_digit_ok(digits):
+        return None
+    return digits.zfill(GTIN_LENGTH)
+
+
+def extract_gtins(identifications: Iterable[str] | str | None) -> set[str]:
+    """Extract the valid GTINs of a recall's ``product_identification`` field.
+
+    Entries mix GTINs with batch numbers and dates, so only digit runs of a GTIN
+    length with a valid check digit are kept.
+    """
+    if not identifications:
+        return set()
+    if isinstance(identifications, str):
+        identifications = [identifications]
+
+    gtins: set[str] = set()
+    for entry in identifications:
+        for candidate in _GTIN_CANDIDATE.findall(str(entry)):
+            if _check_digit_ok(candidate):
+                gtins.add(candidate.zfill(GTIN_LENGTH))
+    return gtins
+
+
+class BloomFilter:
+    """Probabilistic set answering "definitely absent" without a hash lookup."""
+
+    def __init__(
+        self, capacity: int, false_positive_rate: float = BLOOM_FALSE_POSITIVE_RATE
+    ) -> None:
+        """Size the filter for ``capacity`` items."""
+        self.capacity = max(capacity, 1)
+        size = math.ceil(
+            -self.capacity * math.log(false_positive_rate) / (math.log(2) ** 2)
+        )
+        self._size = max(size, 8)
+        self._hash_count = max(1, round(self._size / self.capacity * math.log(2)))
+        self._bits = bytearray((self._size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item: str) -> Iterable[int]:
+        """Return the bit positions of an item using double hashing."""
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return ((first + i * second) % self._size for i in range(self._hash_count))
+
+    def add(self, item: str) -> None:
+        """Add an item."""
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        """Return False if the item was never added, True if it may have been."""
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(item)
+        )
+
+
+class GtinIndex:
+    """In-memory GTIN to recall ID index guarded by a Bloom filter."""
+
+    def __init__(self) -> None:
+        """Initialize an empty index."""
+        self._recalls_by_gtin: dict[str, set[int]] = {}
+        self._gtins_by_recall: dict[int, set[str]] = {}
+        self._bloom = BloomFilter(_BLOOM_MIN_CAPACITY)
+
+    def __len__(self) -> int:
+        """Return the number of indexed GTINs."""
+        return len(self._recalls_by_gtin)
+
+    def _add_to_bloom(self, gtin: str) -> None:
+        """Add a GTIN to the Bloom filter, growing it when full."""
+        if self._bloom.count >= self._bloom.capacity:
+            self._bloom = BloomFilter(
+                max(self._bloom.capacity * 2, len(self._recalls_by_gtin) * 2)
+            )
+            for known in self._recalls_by_gtin:
+                self._bloom.add(known)
+        self._bloom.add(gtin)
+
+    def add(self, gtin: str, recall_id: int) -> None:
+        """Add one GTIN of a recall."""
+        self._gtins_by_recall.setdefault(recall_id, set()).add(gtin)
+        if gtin not in self._recalls_by_gtin:
+            self._add_to_bloom(gtin)
+            self._recalls_by_gtin[gtin] = set()
+        self._recalls_by_gtin[gtin].add(recall_id)
+
+    def update(self, recall_id: int, gtins: set[str]) -> None:
+        """Replace the GTINs of a recall."""
+        for gtin in self._gtins_by_recall.pop(recall_id, set()) - gtins:
+            recall_ids = self._recalls_by_gtin.get(gtin)
+            if recall_ids is not None:
+                recall_ids.discard(recall_id)
+                if not recall_ids:
+                    del self._recalls_by_gtin[gtin]
+
+        for gtin in gtins:
+            self.add(gtin, recall_id)
+
+    def lookup(self, gtin: str) -> set[int]:
+        """Return the IDs of the recalls listing a normalized GTIN."""
+        if gtin not in self._bloom:
+            return set()
+        return set(self._recalls_by_gtin.get(gtin, ()))
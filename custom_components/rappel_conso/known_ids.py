@@ -0,0 +1,71 @@
+"""Persistent set of the recall IDs already reported as new."""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from collections.abc import Iterable
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+
+STORAGE_VERSION = 1
+STORAGE_KEY = f"{DOMAIN}.known_recall_ids"
+
+
+class KnownRecallIds:
+    """Bounded set of the most recently seen recall IDs, kept across restarts.
+
+    IDs are evicted oldest first once ``maxsize`` is reached. Recall IDs grow
+    over time, so every ID up to the largest evicted one is still considered
+    known, which keeps old recalls from being reported again.
+    """
+
+    def __init__(self, hass: HomeAssistant, maxsize: int, save_delay: float) -> None:
+        """Initialize an empty set."""
+        self.maxsize = maxsize
+        self._save_delay = save_delay
+        self._store: Store[dict[str, Any]] = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+        self._ids: OrderedDict[int, None] = OrderedDict()
+        self._floor = 0
+
+    def __len__(self) -> int:
+        """Return the number of remembered IDs."""
+        return len(self._ids)
+
+    def __contains__(self, recall_id: int) -> bool:
+        """Return True when a recall ID was already seen."""
+        return recall_id <= self._floor or recall_id in self._ids
+
+    async def async_load(self) -> None:
+        """Load the IDs saved by a previous run."""
+        if (data := await self._store.async_load()) is None:
+            return
+        self._floor = data["floor"]
+        self._ids = OrderedDict.fromkeys(data["ids"])
+
+    def unknown(self, recall_ids: Iterable[int]) -> set[int]:
+        """Return the IDs that were not seen before."""
+        return {recall_id for recall_id in recall_ids if recall_id not in self}
+
+    def add(self, recall_ids: Iterable[int]) -> None:
+        """Remember recall IDs and schedule a save."""
+        added = False
+        # Oldest first, so a large batch evicts its own oldest IDs
+        for recall_id in sorted(set(recall_ids)):
+            if recall_id in self:
+                continue
+            self._ids[recall_id] = None
+            added = True
+            if len(self._ids) > self.maxsize:
+                evicted, _ = self._ids.popitem(last=False)
+                self._floor = max(self._floor, evicted)
+
+        if added:
+            self._store.async_delay_save(self._data_to_save, self._save_delay)
+
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the data to persist."""
+        return {"floor": self._floor, "ids": list(self._ids)}
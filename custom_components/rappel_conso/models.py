@@ -2,10 +2,49 @@
 
 from __future__ import annotations
 
+from dataclasses import dataclass
 from typing import Any
 
+from homeassistant.util.json import json_loads
 from pydantic import BaseModel, ConfigDict, Field
 
+# API field names mapped to English, for ALL French field names (no exceptions)
+FIELD_MAPPING: dict[str, str] = {
+    "libelle": "product_name",
+    "categorie_produit": "category",
+    "sous_categorie_produit": "subcategory",
+    "marque_produit": "brand",
+    "date_publication": "publication_date",
+    "motif_rappel": "recall_reason",
+    "risques_encourus": "risks",
+    "lien_vers_la_fiche_rappel": "recall_link",
+    "numero_fiche": "sheet_number",
+    "numero_version": "version_number",
+    "rappel_guid": "recall_guid",
+    "modeles_ou_references": "models_or_references",
+    "identification_produits": "product_identification",
+    "conditionnements": "packaging",
+    "date_debut_commercialisation": "commercialization_start_date",
+    "date_date_fin_commercialisation": "commercialization_end_date",
+    "temperature_conservation": "storage_temperature",
+    "marque_salubrite": "health_mark",
+    "informations_complementaires": "additional_information",
+    "zone_geographique_de_vente": "geographic_sales_area",
+    "distributeurs": "distributors",
+    "preconisations_sanitaires": "health_recommendations",
+    "description_complementaire_risque": "additional_risk_description",
+    "conduites_a_tenir_par_le_consommateur": "consumer_actions",
+    "numero_contact": "contact_number",
+    "modalites_de_compensation": "compensation_terms",
+    "date_de_fin_de_la_procedure_de_rappel": "recall_procedure_end_date",
+    "informations_complementaires_publiques": "public_additional_information",
+    "liens_vers_les_images": "image_links",
+    "lien_vers_la_liste_des_produits": "product_list_link",
+    "lien_vers_la_liste_des_distributeurs": "distributor_list_link",
+    "lien_vers_affichette_pdf": "poster_pdf_link",
+    "nature_juridique_rappel": "legal_recall_nature",
+}
+
 
 class RecallData(BaseModel):
     """Represent a product recall."""
@@ -54,50 +93,7 @@ class RecallData(BaseModel):
     def to_english_dict(self) -> dict[str, Any]:
         """Convert to dictionary with English field names for Home Assistant."""
         data = self.model_dump(exclude_none=True)
-
-        # Map ALL French field names to English (no exceptions)
-        field_mapping = {
-            "libelle": "product_name",
-            "categorie_produit": "category",
-            "sous_categorie_produit": "subcategory",
-            "marque_produit": "brand",
-            "date_publication": "publication_date",
-            "motif_rappel": "recall_reason",
-            "risques_encourus": "risks",
-            "lien_vers_la_fiche_rappel": "recall_link",
-            "numero_fiche": "sheet_number",
-            "numero_version": "version_number",
-            "rappel_guid": "recall_guid",
-            "modeles_ou_references": "models_or_references",
-            "identification_produits": "product_identification",
-            "conditionnements": "packaging",
-            "date_debut_commercialisation": "commercialization_start_date",
-            "date_date_fin_commercialisation": "commercialization_end_date",
-            "temperature_conservation": "storage_temperature",
-            "marque_salubrite": "health_mark",
-            "informations_complementaires": "additional_information",
-            "zone_geographique_de_vente": "geographic_sales_area",
-            "distributeurs": "distributors",
-            "preconisations_sanitaires": "health_recommendations",
-            "description_complementaire_risque": "additional_risk_description",
-            "conduites_a_tenir_par_le_consommateur": "consumer_actions",
-            "numero_contact": "contact_number",
-            "modalites_de_compensation": "compensation_terms",
-            "date_de_fin_de_la_procedure_de_rappel": "recall_procedure_end_date",
-            "informations_complementaires_publiques": "public_additional_information",
-            "liens_vers_les_images": "image_links",
-            "lien_vers_la_liste_des_produits": "product_list_link",
-            "lien_vers_la_liste_des_distributeurs": "distributor_list_link",
-            "lien_vers_affichette_pdf": "poster_pdf_link",
-            "nature_juridique_rappel": "legal_recall_nature",
-        }
-
-        english_data = {}
-        for french_key, value in data.items():
-            english_key = field_mapping.get(french_key, french_key)
-            english_data[english_key] = value
-
-        return english_data
+        return {FIELD_MAPPING.get(key, key): value for key, value in data.items()}
 
 
 class APIResponse(BaseModel):
@@ -109,3 +105,49 @@ class APIResponse(BaseModel):
     def get_recall_ids(self) -> set[int]:
         """Get set of recall IDs from results."""
         return {recall.id for recall in self.results}
+
+
+def decode_recall(record: dict[str, Any]) -> dict[str, Any]:
+    """Translate a raw API record to English field names, without None values.
+
+    Fast path equivalent to ``RecallData(**record).to_english_dict()`` for
+    well-formed records, which skips the model validation.
+    """
+    if "id" not in record:
+        msg = "Recall record without id"
+        raise ValueError(msg)
+    english_key = FIELD_MAPPING.get  # Bound once, called for every field
+    return {
+        english_key(key, key): value
+        for key, value in record.items()
+        if value is not None
+    }
+
+
+@dataclass(slots=True)
+class RecallPage:
+    """A page of recalls decoded with :func:`decode_recall`."""
+
+    total_count: int
+    results: list[dict[str, Any]]
+
+    @classmethod
+    def from_json(cls, data: dict[str, Any]) -> RecallPage:
+        """Decode an API response body."""
+        return cls(
+            total_count=int(data["total_count"]),
+            results=[decode_recall(record) for record in data.get("results", ())],
+        )
+
+    @classmethod
+    def from_body(cls, content: bytes) -> RecallPage:
+        """Parse and decode a raw API response body."""
+        data = json_loads(content)
+        if not isinstance(data, dict):
+            msg = "Unexpected API response"
+            raise TypeError(msg)
+        return cls.from_json(data)
+
+    def get_recall_ids(self) -> set[int]:
+        """Get set of recall IDs from results."""
+        return {recall["id"] for recall in self.results}
@@ -0,0 +1,54 @@
+"""Client-side rate limiting for the Rappel Conso API."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+
+class TokenBucket:
+    """Token bucket allowing ``rate`` requests per second with bursts."""
+
+    def __init__(self, rate: float, capacity: int) -> None:
+        """Initialize a full bucket."""
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+        # Callers waiting for a token, and requests that had to wait
+        self.waiting = 0
+        self.throttled = 0
+
+    def _refill(self) -> None:
+        """Add the tokens earned since the last refill."""
+        now = time.monotonic()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+    def pause(self, seconds: float) -> None:
+        """Hold every request for a while, e.g. when the server asks to."""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    async def acquire(self) -> None:
+        """Wait until a request may be sent."""
+        self.waiting += 1
+        try:
+            # Waiters queue on the lock, so tokens are handed out in FIFO order
+            async with self._lock:
+                throttled = False
+                while (pause := self._paused_until - time.monotonic()) > 0:
+                    throttled = True
+                    await asyncio.sleep(pause)
+                self._refill()
+                while self._tokens < 1:
+                    throttled = True
+                    await asyncio.sleep((1 - self._tokens) / self.rate)
+                    self._refill()
+                self._tokens -= 1
+                self.throttled += throttled
+        finally:
+            self.waiting -= 1
@@ -0,0 +1,84 @@
+"""Adaptive polling interval following the recall publication cadence."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from datetime import datetime, timedelta
+
+from homeassistant.util import dt as dt_util
+
+# Recalls are published on French business hours
+PUBLICATION_TIME_ZONE = "Europe/Paris"
+# Publications needed before the histogram is trusted
+MIN_OBSERVATIONS = 50
+_SLOTS = 7 * 24
+
+
+class AdaptiveScheduler:
+    """Pick the next polling interval from a weekly publication histogram.
+
+    Publication times are counted per (weekday, hour) slot. Polls in a slot
+    with at least the average activity use the minimum interval; in quieter
+    slots the interval doubles at each poll, up to the maximum interval, but
+    never past the start of the next active slot.
+    """
+
+    def __init__(
+        self,
+        min_interval: timedelta,
+        max_interval: timedelta,
+        default_interval: timedelta,
+    ) -> None:
+        """Initialize an empty histogram."""
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self._default_interval = self._clamp(default_interval)
+        self._time_zone = dt_util.get_time_zone(PUBLICATION_TIME_ZONE)
+        self._histogram = [0] * _SLOTS
+        self.observations = 0
+        self.interval = self._default_interval
+
+    def _clamp(self, interval: timedelta) -> timedelta:
+        """Return an interval within the configured bounds."""
+        return max(self.min_interval, min(interval, self.max_interval))
+
+    def _slot(self, moment: datetime) -> int:
+        """Return the weekly slot of a moment."""
+        local = moment.astimezone(self._time_zone)
+        return local.weekday() * 24 + local.hour
+
+    def observe(self, publication_dates: Iterable[str | None]) -> None:
+        """Count publication dates in the histogram."""
+        for value in publication_dates:
+            if value and (published := dt_util.parse_datetime(value)) is not None:
+                self._histogram[self._slot(published)] += 1
+                self.observations += 1
+
+    def _is_active(self, slot: int) -> bool:
+        """Return True for a slot with at least the average activity."""
+        return self._histogram[slot] * _SLOTS >= self.observations
+
+    def _until_next_active(self, now: datetime) -> timedelta | None:
+        """Return the time until the next active slot starts."""
+        hour_start = now.astimezone(self._time_zone).replace(
+            minute=0, second=0, microsecond=0
+        )
+        slot = self._slot(now)
+        for hours in range(1, _SLOTS + 1):
+            if self._is_active((slot + hours) % _SLOTS):
+                return hour_start + timedelta(hours=hours) - now
+        return None
+
+    def next_interval(self, now: datetime, found_new: bool) -> timedelta:
+        """Return the interval until the next poll."""
+        if self.observations < MIN_OBSERVATIONS:
+            self.interval = self._default_interval
+        elif found_new or self._is_active(self._slot(now)):
+            self.interval = self.min_interval
+        else:
+            backoff = self._clamp(max(self.interval, self.min_interval) * 2)
+            until_active = self._until_next_active(now)
+            if until_active is not None:
+                backoff = min(backoff, max(until_active, self.min_interval))
+            self.interval = backoff
+        return self.interval
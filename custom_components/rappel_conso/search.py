@@ -0,0 +1,255 @@
+"""Search criteria shared by the API and the local recall store."""
+
+from __future__ import annotations
+
+import urllib.parse
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import Any
+
+# Fields searched by keywords, as (API field, English field) pairs
+KEYWORD_FIELDS: tuple[tuple[str, str], ...] = (
+    ("libelle", "product_name"),
+    ("marque_produit", "brand"),
+    ("sous_categorie_produit", "subcategory"),
+    ("motif_rappel", "recall_reason"),
+)
+
+# Dimensions of the recall statistics, as (API expression, store SQL expression)
+GROUP_BY_FIELDS: dict[str, tuple[str, str]] = {
+    "category": ("categorie_produit", "json_extract(data, '$.category')"),
+    "subcategory": ("sous_categorie_produit", "json_extract(data, '$.subcategory')"),
+    "brand": ("marque_produit", "json_extract(data, '$.brand')"),
+    "month": (
+        "date_format(date_publication, 'yyyy-MM')",
+        "substr(publication_date, 1, 7)",
+    ),
+    "year": ("date_format(date_publication, 'yyyy')", "substr(publication_date, 1, 4)"),
+}
+
+# Dimensions whose groups are sorted newest first rather than by count
+TIME_GROUPS = frozenset({"month", "year"})
+
+# Criteria lists in the order preferred to pre-select the recalls of a batch
+# query, with the API field they match: names and brands are the most
+# selective, categories the least.
+_BATCH_ANCHORS: tuple[tuple[str, str | None], ...] = (
+    ("product_names", "libelle"),
+    ("brands", "marque_produit"),
+    ("keywords", None),
+    ("categories", "categorie_produit"),
+)
+
+# An ODSQL condition as (API field, operator, term)
+_Condition = tuple[str, str, str]
+
+
+@dataclass(frozen=True, slots=True)
+class SearchCriteria:
+    """Criteria of a recall search.
+
+    Lists are OR-ed internally and the non-empty lists are AND-ed together.
+    Product names, brands and keywords are case-insensitive partial matches,
+    categories are exact matches.
+    """
+
+    product_names: tuple[str, ...] = ()
+    brands: tuple[str, ...] = ()
+    categories: tuple[str, ...] = ()
+    keywords: tuple[str, ...] = ()
+
+    @classmethod
+    def from_lists(
+        cls,
+        product_names: list[str] | None = None,
+        brands: list[str] | None = None,
+        categories: list[str] | None = None,
+        keywords: list[str] | None = None,
+    ) -> SearchCriteria:
+        """Create criteria from the optional lists of a service call."""
+        return cls(
+            product_names=tuple(product_names or ()),
+            brands=tuple(brands or ()),
+            categories=tuple(categories or ()),
+            keywords=tuple(keywords or ()),
+        )
+
+    def __bool__(self) -> bool:
+        """Return True when at least one criterion is set."""
+        return bool(
+            self.product_names or self.brands or self.categories or self.keywords
+        )
+
+    def normalized(self) -> SearchCriteria:
+        """Return equivalent criteria in a canonical form.
+
+        Terms are de-duplicated and sorted, and partial-match terms are
+        case-folded, so equivalent searches share one cache entry.
+        """
+        return SearchCriteria(
+            product_names=_canonical(self.product_names, casefold=True),
+            brands=_canonical(self.brands, casefold=True),
+            categories=_canonical(self.categories, casefold=False),
+            keywords=_canonical(self.keywords, casefold=True),
+        )
+
+    def matches(self, recall: dict[str, Any]) -> bool:
+        """Return True when a recall with English field names matches."""
+        return (
+            _contains(recall, ("product_name",), self.product_names)
+            and _contains(recall, ("brand",), self.brands)
+            and (not self.categories or recall.get("category") in self.categories)
+            and _contains(
+                recall,
+                tuple(english for _, english in KEYWORD_FIELDS),
+                self.keywords,
+            )
+        )
+
+    def to_where(self) -> str | None:
+        """Build the ODSQL where clause for the Opendatasoft API.
+
+        Documentation: https://help.opendatasoft.com/apis/ods-explore-v2/
+        """
+        # Note: ODSQL supports SQL-like LIKE operator with wildcards (%)
+        # Case-insensitive by default
+        where_clauses = []
+
+        if self.product_names:
+            # Search in libelle field (product name)
+            # Use LIKE with wildcards for partial matching
+            product_conditions = " OR ".join(
+                f"libelle like '%{_quote(name)}%'" for name in self.product_names
+            )
+            where_clauses.append(f"({product_conditions})")
+
+        if self.brands:
+            # Search in marque_produit field (brand)
+            brand_conditions = " OR ".join(
+                f"marque_produit like '%{_quote(brand)}%'" for brand in self.brands
+            )
+            where_clauses.append(f"({brand_conditions})")
+
+        if self.categories:
+            # Search in categorie_produit field (exact match)
+            category_conditions = " OR ".join(
+                f"categorie_produit='{_quote(cat)}'" for cat in self.categories
+            )
+            where_clauses.append(f"({category_conditions})")
+
+        if self.keywords:
+            # Search across multiple fields for maximum flexibility
+            keyword_conditions = []
+            for keyword in self.keywords:
+                escaped_keyword = _quote(keyword)
+                fields = " OR ".join(
+                    f"{api_field} like '%{escaped_keyword}%'"
+                    for api_field, _ in KEYWORD_FIELDS
+                )
+                keyword_conditions.append(f"({fields})")
+            where_clauses.append(f"({' OR '.join(keyword_conditions)})")
+
+        # Combine all where clauses with AND
+        if not where_clauses:
+            return None
+        return " AND ".join(where_clauses)
+
+
+def plan_batch(
+    queries: Iterable[SearchCriteria], max_conditions: int
+) -> list[tuple[str, list[SearchCriteria]]]:
+    """Group normalized queries into as few ODSQL where clauses as possible.
+
+    Each clause ORs one criteria list of each of its queries, so it selects a
+    superset of their results; conditions shared by several queries are only
+    sent once, and a partial match is dropped when a shorter term of the same
+    field already covers it.
+
+    Returns:
+        (where clause, queries it covers) pairs
+    """
+    plans: list[tuple[set[_Condition], list[SearchCriteria]]] = []
+    for criteria in dict.fromkeys(queries):
+        conditions = _anchor_conditions(criteria)
+        for planned, covered in plans:
+            if len(planned | conditions) <= max_conditions:
+                planned.update(conditions)
+                covered.append(criteria)
+                break
+        else:
+            plans.append((conditions, [criteria]))
+
+    return [
+        (
+            " OR ".join(
+                _render(condition) for condition in sorted(_drop_covered(conditions))
+            ),
+            covered,
+        )
+        for conditions, covered in plans
+    ]
+
+
+def _anchor_conditions(criteria: SearchCriteria) -> set[_Condition]:
+    """Return conditions OR-ed by a superset of the recalls matching criteria.
+
+    Every criteria list must match, so the recalls matching any one list are a
+    superset of the result.
+    """
+    for attribute, api_field in _BATCH_ANCHORS:
+        terms: tuple[str, ...] = getattr(criteria, attribute)
+        if not terms:
+            continue
+        if api_field is None:
+            return {
+                (field, "like", term) for term in terms for field, _ in KEYWORD_FIELDS
+            }
+        operator = "=" if attribute == "categories" else "like"
+        return {(api_field, operator, term) for term in terms}
+    return set()
+
+
+def _drop_covered(conditions: set[_Condition]) -> set[_Condition]:
+    """Drop partial matches implied by a shorter term on the same field."""
+    return {
+        (field, operator, term)
+        for field, operator, term in conditions
+        if operator != "like"
+        or not any(
+            other_field == field
+            and other_operator == "like"
+            and other != term
+            and other in term
+            for other_field, other_operator, other in conditions
+        )
+    }
+
+
+def _render(condition: _Condition) -> str:
+    """Render a condition in ODSQL."""
+    field, operator, term = condition
+    if operator == "like":
+        return f"{field} like '%{_quote(term)}%'"
+    return f"{field}='{_quote(term)}'"
+
+
+def _contains(
+    recall: dict[str, Any], fields: tuple[str, ...], terms: tuple[str, ...]
+) -> bool:
+    """Return True if no terms are given or a field contains one of them."""
+    if not terms:
+        return True
+    values = [str(recall.get(field) or "").casefold() for field in fields]
+    return any(term.casefold() in value for term in terms for value in values)
+
+
+def _canonical(terms: tuple[str, ...], *, casefold: bool) -> tuple[str, ...]:
+    """Return sorted unique terms, stripped and optionally case-folded."""
+    if casefold:
+        return tuple(sorted({term.strip().casefold() for term in terms}))
+    return tuple(sorted({term.strip() for term in terms}))
+
+
+def _quote(value: str) -> str:
+    """Escape a value for an ODSQL string literal."""
+    return urllib.parse.quote(value, safe="")
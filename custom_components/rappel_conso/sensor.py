@@ -5,14 +5,26 @@ from __future__ import annotations
 import logging
 from typing import Any
 
-from homeassistant.components.sensor import SensorEntity
+from homeassistant.components.sensor import SensorEntity, SensorStateClass
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.device_registry import DeviceEntryType, DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.json import json_dumps
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
-
-from .const import ATTRIBUTION, DOMAIN, SENSOR_ICON, SENSOR_NAME
+from homeassistant.util import slugify
+
+from .const import (
+    ATTRIBUTION,
+    COMPACT_RECALL_FIELDS,
+    CONF_COMPACT_ATTRIBUTES,
+    COUNTER_SENSOR_ICON,
+    DOMAIN,
+    SENSOR_ICON,
+    SENSOR_NAME,
+)
 from .coordinator import RappelConsoCoordinator
+from .counters import RecallCounter
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -25,7 +37,27 @@ async def async_setup_entry(
     """Set up the Rappel Conso sensor."""
     coordinator: RappelConsoCoordinator = hass.data[DOMAIN][entry.entry_id]
 
-    async_add_entities([RappelConsoSensor(coordinator)], True)
+    entities: list[SensorEntity] = [
+        RappelConsoSensor(
+            coordinator, entry.options.get(CONF_COMPACT_ATTRIBUTES, False)
+        )
+    ]
+    entities.extend(
+        RappelConsoCounterSensor(coordinator, counter)
+        for counter in coordinator.counters
+    )
+    async_add_entities(entities)
+
+
+def _device_info() -> DeviceInfo:
+    """Return the device shared by the sensors."""
+    return {
+        "identifiers": {(DOMAIN, DOMAIN)},
+        "name": SENSOR_NAME,
+        "manufacturer": "data.gouv.fr",
+        "model": "RappelConso V2",
+        "entry_type": DeviceEntryType.SERVICE,
+    }
 
 
 class RappelConsoSensor(CoordinatorEntity[RappelConsoCoordinator], SensorEntity):
@@ -35,18 +67,16 @@ class RappelConsoSensor(CoordinatorEntity[RappelConsoCoordinator], SensorEntity)
     _attr_name = None
     _attr_icon = SENSOR_ICON
     _attr_native_unit_of_measurement = "recalls"
+    # Bulky or ever-changing attributes stay out of the recorder database
+    _unrecorded_attributes = frozenset({"recent_recalls", "data_age"})
 
-    def __init__(self, coordinator: RappelConsoCoordinator) -> None:
+    def __init__(self, coordinator: RappelConsoCoordinator, compact: bool) -> None:
         """Initialize the sensor."""
         super().__init__(coordinator)
+        self._compact = compact
+        self._content_hash: int | None = None
         self._attr_unique_id = DOMAIN
-        self._attr_device_info = {
-            "identifiers": {(DOMAIN, DOMAIN)},
-            "name": SENSOR_NAME,
-            "manufacturer": "data.gouv.fr",
-            "model": "RappelConso V2",
-            "entry_type": "service",
-        }
+        self._attr_device_info = _device_info()
 
     @property
     def native_value(self) -> int | None:
@@ -63,12 +93,23 @@ class RappelConsoSensor(CoordinatorEntity[RappelConsoCoordinator], SensorEntity)
                 "attribution": ATTRIBUTION,
             }
 
-        return {
+        recent_recalls = self.coordinator.data.get("recent_recalls", [])
+        if self._compact:
+            recent_recalls = [
+                {field: recall.get(field) for field in COMPACT_RECALL_FIELDS}
+                for recall in recent_recalls
+            ]
+        attributes = {
             "last_update": self.coordinator.data.get("last_update"),
             "new_recalls_count": self.coordinator.data.get("new_recalls_count", 0),
-            "recent_recalls": self.coordinator.data.get("recent_recalls", []),
+            "recent_recalls": recent_recalls,
+            "stale": self.coordinator.data.get("stale", False),
             "attribution": ATTRIBUTION,
         }
+        if attributes["stale"]:
+            # Seconds since the last successful sync while the API is down
+            attributes["data_age"] = self.coordinator.data.get("data_age")
+        return attributes
 
     @property
     def available(self) -> bool:
@@ -76,3 +117,62 @@ class RappelConsoSensor(CoordinatorEntity[RappelConsoCoordinator], SensorEntity)
         return (
             self.coordinator.last_update_success and self.coordinator.data is not None
         )
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state only when its content changed.
+
+        A poll without news only moves ``last_update`` (and ``data_age``
+        while stale), so it is not written.
+        """
+        attributes = self.extra_state_attributes
+        content_hash = hash(
+            json_dumps(
+                [
+                    self.available,
+                    self.native_value,
+                    {
+                        key: value
+                        for key, value in attributes.items()
+                        if key not in ("last_update", "data_age")
+                    },
+                ]
+            )
+        )
+        if content_hash == self._content_hash:
+            return
+        self._content_hash = content_hash
+        super()._handle_coordinator_update()
+
+
+class RappelConsoCounterSensor(CoordinatorEntity[RappelConsoCoordinator], SensorEntity):
+    """Number of recalls matching criteria published in the last days."""
+
+    _attr_has_entity_name = True
+    _attr_icon = COUNTER_SENSOR_ICON
+    _attr_native_unit_of_measurement = "recalls"
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(
+        self, coordinator: RappelConsoCoordinator, counter: RecallCounter
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        self._counter = counter
+        self._attr_name = counter.name
+        self._attr_unique_id = f"{DOMAIN}_counter_{slugify(counter.name)}"
+        self._attr_device_info = _device_info()
+
+    @property
+    def native_value(self) -> int:
+        """Return the number of matching recalls in the window."""
+        return self._counter.count
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the state attributes."""
+        return {
+            "days": self._counter.days,
+            "since": self._counter.first_day.isoformat(),
+            "attribution": ATTRIBUTION,
+        }
@@ -0,0 +1,775 @@
+"""Local SQLite mirror of the Rappel Conso dataset."""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import sqlite3
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.json import json_dumps
+from homeassistant.util.json import json_loads
+
+from .gtin import extract_gtins
+from .search import GROUP_BY_FIELDS, KEYWORD_FIELDS, TIME_GROUPS, SearchCriteria
+
+_LOGGER = logging.getLogger(__name__)
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS recalls (
+        id INTEGER PRIMARY KEY,
+        publication_date TEXT,
+        data TEXT NOT NULL,
+        detailed INTEGER NOT NULL DEFAULT 1
+    )
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS recalls_publication_date
+    ON recalls (publication_date DESC)
+    """,
+    # Trigram index over the case-folded searchable fields. The rowid is the
+    # recall id; category is kept unindexed for exact matching.
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS recalls_fts USING fts5 (
+        product_name,
+        brand,
+        subcategory,
+        recall_reason,
+        category UNINDEXED,
+        tokenize = 'trigram'
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS recall_gtins (
+        gtin TEXT NOT NULL,
+        recall_id INTEGER NOT NULL,
+        PRIMARY KEY (gtin, recall_id)
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS recall_gtins_recall_id ON recall_gtins (recall_id)
+    """,
+    # Latest stored version of each recall sheet, with a hash of its content
+    """
+    CREATE TABLE IF NOT EXISTS recall_versions (
+        key TEXT PRIMARY KEY,
+        recall_id INTEGER NOT NULL,
+        version INTEGER NOT NULL,
+        content_hash INTEGER NOT NULL
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS meta (
+        key TEXT PRIMARY KEY,
+        value TEXT
+    )
+    """,
+)
+
+META_TOTAL_COUNT = "total_count"
+META_INDEX_VERSION = "index_version"
+META_PROBE = "probe"
+META_LAST_UPDATE = "last_update"
+META_BOOTSTRAP = "bootstrap"
+META_RECONCILE = "reconcile"
+
+# Version of the recalls table layout, stored as the SQLite user_version
+SCHEMA_VERSION = 2
+
+# Bump to rebuild the derived tables (search index, GTINs, versions) on next open
+INDEX_VERSION = "3"
+
+# Trigram MATCH needs at least three characters, shorter terms use LIKE
+_MIN_MATCH_LENGTH = 3
+
+_FTS_COLUMNS = tuple(english_field for _, english_field in KEYWORD_FIELDS)
+
+# Fields whose change makes a recall updated, all part of the polling projection
+# so that summaries and full records of the same content hash alike
+HASHED_FIELDS = (
+    "version_number",
+    "product_name",
+    "category",
+    "subcategory",
+    "brand",
+    "recall_reason",
+    "risks",
+    "publication_date",
+    "recall_link",
+    "product_identification",
+)
+
+
+def recall_key(recall: dict[str, Any]) -> str:
+    """Return the key shared by the versions of a recall."""
+    if sheet_number := recall.get("sheet_number"):
+        return f"sheet:{sheet_number}"
+    if recall_guid := recall.get("recall_guid"):
+        return f"guid:{recall_guid}"
+    return f"id:{recall['id']}"
+
+
+def content_hash(recall: dict[str, Any]) -> int:
+    """Return a 64-bit hash of the tracked fields of a recall."""
+    content = json_dumps([recall.get(name) for name in HASHED_FIELDS])
+    digest = hashlib.blake2b(content.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+
+def _version(recall: dict[str, Any]) -> int:
+    """Return the version number of a recall, 0 when unknown."""
+    version = recall.get("version_number")
+    return version if isinstance(version, int) else 0
+
+
+@dataclass(slots=True)
+class RecallUpdate:
+    """A stored recall whose content changed."""
+
+    recall: dict[str, Any]
+    previous_id: int
+    # Changed fields, with their old and new values
+    changes: dict[str, dict[str, Any]]
+
+
+@dataclass(slots=True)
+class RecallChanges:
+    """Classification of the recalls written to the store."""
+
+    inserted: set[int] = field(default_factory=set)
+    updated: list[RecallUpdate] = field(default_factory=list)
+    unchanged: int = 0
+
+
+def _fts_row(recall: dict[str, Any]) -> tuple[Any, ...]:
+    """Return the full-text index row of a recall."""
+    return (
+        recall["id"],
+        *(str(recall.get(column) or "").casefold() for column in _FTS_COLUMNS),
+        recall.get("category"),
+    )
+
+
+def _index_recalls(conn: sqlite3.Connection, recalls: list[dict[str, Any]]) -> None:
+    """Write the search index and GTIN rows of stored recalls."""
+    conn.executemany(
+        "INSERT INTO recalls_fts (rowid, product_name, brand, subcategory, "
+        "recall_reason, category) VALUES (?, ?, ?, ?, ?, ?)",
+        [_fts_row(recall) for recall in recalls],
+    )
+    conn.executemany(
+        "INSERT OR IGNORE INTO recall_gtins (gtin, recall_id) VALUES (?, ?)",
+        [
+            (gtin, recall["id"])
+            for recall in recalls
+            for gtin in extract_gtins(recall.get("product_identification"))
+        ],
+    )
+    _index_versions(conn, recalls)
+
+
+def _index_versions(conn: sqlite3.Connection, recalls: list[dict[str, Any]]) -> None:
+    """Record the content hash of recalls, unless a later version is stored."""
+    conn.executemany(
+        "INSERT INTO recall_versions (key, recall_id, version, content_hash) "
+        "VALUES (?, ?, ?, ?) ON CONFLICT (key) DO UPDATE SET "
+        "recall_id = excluded.recall_id, version = excluded.version, "
+        "content_hash = excluded.content_hash "
+        "WHERE excluded.version >= recall_versions.version",
+        [
+            (recall_key(recall), recall["id"], _version(recall), content_hash(recall))
+            for recall in recalls
+        ],
+    )
+
+
+def _migrate(conn: sqlite3.Connection) -> None:
+    """Upgrade a database created by an older version of the integration."""
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    if version < 2:  # noqa: PLR2004
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(recalls)")}
+        if "detailed" not in columns:
+            # Earlier versions always stored full records
+            conn.execute(
+                "ALTER TABLE recalls ADD COLUMN detailed INTEGER NOT NULL DEFAULT 1"
+            )
+    conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+
+def _escape_like(term: str) -> str:
+    """Escape LIKE wildcards in a search term."""
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _build_search_query(criteria: SearchCriteria) -> tuple[str, list[Any]]:
+    """Translate search criteria into an SQL condition on the index."""
+    # (column, term) alternatives of each criterion, AND-ed together
+    groups: list[list[tuple[str, str]]] = [
+        [("product_name", term.casefold()) for term in criteria.product_names],
+        [("brand", term.casefold()) for term in criteria.brands],
+        [
+            (column, term.casefold())
+            for term in criteria.keywords
+            for column in _FTS_COLUMNS
+        ],
+    ]
+    groups = [group for group in groups if group]
+
+    conditions: list[str] = []
+    params: list[Any] = []
+
+    if groups and all(
+        len(term) >= _MIN_MATCH_LENGTH for group in groups for _, term in group
+    ):
+        # Answer from the trigram index in a single MATCH expression
+        expression = " AND ".join(
+            "("
+            + " OR ".join(
+                f'{column} : "{term.replace(chr(34), chr(34) * 2)}"'
+                for column, term in group
+            )
+            + ")"
+            for group in groups
+        )
+        conditions.append("recalls_fts MATCH ?")
+        params.append(expression)
+    else:
+        for group in groups:
+            conditions.append(
+                "("
+                + " OR ".join(f"{column} LIKE ? ESCAPE '\\'" for column, _ in group)
+                + ")"
+            )
+            params.extend(f"%{_escape_like(term)}%" for _, term in group)
+
+    if criteria.categories:
+        conditions.append(f"category IN ({','.join('?' * len(criteria.categories))})")
+        params.extend(criteria.categories)
+
+    return " AND ".join(conditions) or "1", params
+
+
+class RecallStore:
+    """Persist recalls on disk and expose the incremental sync watermark.
+
+    All SQLite access happens in the executor; a lock serializes it because
+    Home Assistant may run jobs on different executor threads.
+    """
+
+    def __init__(self, hass: HomeAssistant, path: str) -> None:
+        """Initialize the store."""
+        self.hass = hass
+        self.path = path
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def _db(self) -> sqlite3.Connection:
+        """Return the open connection."""
+        if self._conn is None:
+            msg = "Recall store is not open"
+            raise RuntimeError(msg)
+        return self._conn
+
+    def _open(self) -> None:
+        """Open the database and create the schema."""
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        with conn:
+            for statement in _SCHEMA:
+                conn.execute(statement)
+            _migrate(conn)
+        self._conn = conn
+        self._ensure_index()
+
+    def _ensure_index(self) -> None:
+        """Rebuild the derived tables if they are out of sync with the recalls."""
+        with self._lock, self._db as conn:
+            version = conn.execute(
+                "SELECT value FROM meta WHERE key = ?", (META_INDEX_VERSION,)
+            ).fetchone()
+            indexed = conn.execute("SELECT COUNT(*) FROM recalls_fts").fetchone()[0]
+            stored = conn.execute("SELECT COUNT(*) FROM recalls").fetchone()[0]
+            if indexed == stored and version and version[0] == INDEX_VERSION:
+                return
+            _LOGGER.info("Rebuilding search and GTIN indexes for %d recalls", stored)
+            conn.execute("DELETE FROM recalls_fts")
+            conn.execute("DELETE FROM recall_gtins")
+            conn.execute("DELETE FROM recall_versions")
+            cursor = conn.execute("SELECT data FROM recalls")
+            while rows := cursor.fetchmany(1000):
+                _index_recalls(conn, [json_loads(row[0]) for row in rows])
+            conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                (META_INDEX_VERSION, INDEX_VERSION),
+            )
+
+    def _close(self) -> None:
+        """Close the database."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _remove(self) -> None:
+        """Close the database and delete its files."""
+        self._close()
+        for suffix in ("", "-wal", "-shm", "-journal"):
+            Path(f"{self.path}{suffix}").unlink(missing_ok=True)
+
+    def _upsert(self, recalls: list[dict[str, Any]], detailed: bool) -> RecallChanges:
+        """Insert or replace recalls, classifying them as new, updated or unchanged.
+
+        Summary rows (``detailed`` False) are merged into a stored detailed
+        record of the same version, so polling never discards fetched details.
+        A recall is updated when the content hash of its sheet changed, and
+        unchanged otherwise; older versions than the stored one are neither.
+        """
+        # A repeated ID would collide on the full-text index rowid; keep the
+        # last occurrence, as a plain replace would
+        recalls = list(
+            {recall["id"]: recall for recall in recalls if "id" in recall}.values()
+        )
+        if not recalls:
+            return RecallChanges()
+
+        ids = [recall["id"] for recall in recalls]
+        placeholders = ",".join("?" * len(ids))
+        with self._lock, self._db as conn:
+            existing = {
+                row[0]: (row[1], row[2])
+                for row in conn.execute(
+                    f"SELECT id, data, detailed FROM recalls WHERE id IN ({placeholders})",  # noqa: E501, S608
+                    ids,
+                )
+            }
+
+            merged: list[dict[str, Any]] = []
+            rows = []
+            for recall in recalls:
+                record, row_detailed = recall, detailed
+                stored = existing.get(recall["id"])
+                if not detailed and stored is not None and stored[1]:
+                    stored_recall = json_loads(stored[0])
+                    if stored_recall.get("version_number") == recall.get(
+                        "version_number"
+                    ):
+                        record, row_detailed = {**stored_recall, **recall}, True
+                merged.append(record)
+                rows.append(
+                    (
+                        record["id"],
+                        record.get("publication_date"),
+                        json_dumps(record),
+                        int(row_detailed),
+                    )
+                )
+
+            changes = self._classify(conn, merged, existing)
+            changes.inserted = set(ids) - set(existing)
+
+            conn.executemany(
+                "INSERT OR REPLACE INTO recalls (id, publication_date, data, detailed) "
+                "VALUES (?, ?, ?, ?)",
+                rows,
+            )
+            conn.execute(
+                f"DELETE FROM recalls_fts WHERE rowid IN ({placeholders})",  # noqa: S608
+                ids,
+            )
+            conn.execute(
+                f"DELETE FROM recall_gtins WHERE recall_id IN ({placeholders})",  # noqa: S608
+                ids,
+            )
+            _index_recalls(conn, merged)
+        return changes
+
+    @staticmethod
+    def _classify(
+        conn: sqlite3.Connection,
+        recalls: list[dict[str, Any]],
+        existing: dict[int, tuple[str, int]],
+    ) -> RecallChanges:
+        """Compare recalls about to be written with the stored versions."""
+        keys = list({recall_key(recall) for recall in recalls})
+        placeholders = ",".join("?" * len(keys))
+        versions = {
+            row[0]: (row[1], row[2], row[3])
+            for row in conn.execute(
+                "SELECT key, recall_id, version, content_hash FROM recall_versions "  # noqa: S608
+                f"WHERE key IN ({placeholders})",
+                keys,
+            )
+        }
+        # Previous records stored under another ID, e.g. an older version
+        previous_ids = [
+            recall_id
+            for recall_id, _, _ in versions.values()
+            if recall_id not in existing
+        ]
+        placeholders = ",".join("?" * len(previous_ids))
+        previous = {
+            row[0]: row[1]
+            for row in conn.execute(
+                f"SELECT id, data FROM recalls WHERE id IN ({placeholders})",  # noqa: S608
+                previous_ids,
+            )
+        }
+        previous.update((recall_id, row[0]) for recall_id, row in existing.items())
+
+        changes = RecallChanges()
+        # Records of this write, for sheets appearing more than once
+        written: dict[int, dict[str, Any]] = {}
+        for recall in recalls:
+            key, digest = recall_key(recall), content_hash(recall)
+            stored = versions.get(key)
+            versions[key] = (recall["id"], _version(recall), digest)
+            if stored is None:
+                continue
+            stored_id, stored_version, stored_digest = stored
+            if _version(recall) < stored_version:
+                versions[key] = stored
+            elif digest == stored_digest:
+                changes.unchanged += 1
+            else:
+                if (old := written.get(stored_id)) is None:
+                    old = (
+                        json_loads(previous[stored_id]) if stored_id in previous else {}
+                    )
+                changes.updated.append(
+                    RecallUpdate(
+                        recall,
+                        stored_id,
+                        {
+                            name: {"old": old.get(name), "new": recall.get(name)}
+                            for name in HASHED_FIELDS
+                            if old.get(name) != recall.get(name)
+                        },
+                    )
+                )
+            written[recall["id"]] = recall
+        return changes
+
+    def _get_undetailed(self, recall_ids: list[int]) -> list[int]:
+        """Return the IDs among ``recall_ids`` stored as summaries only."""
+        if not recall_ids:
+            return []
+        placeholders = ",".join("?" * len(recall_ids))
+        with self._lock:
+            return [
+                row[0]
+                for row in self._db.execute(
+                    f"SELECT id FROM recalls WHERE id IN ({placeholders}) "  # noqa: S608
+                    "AND detailed = 0",
+                    recall_ids,
+                )
+            ]
+
+    def _get_recent(self, limit: int, offset: int) -> list[dict[str, Any]]:
+        """Return the most recently published recalls."""
+        with self._lock:
+            cursor = self._db.execute(
+                "SELECT data FROM recalls "
+                "ORDER BY publication_date DESC, id DESC LIMIT ? OFFSET ?",
+                (limit, offset),
+            )
+            return [json_loads(row[0]) for row in cursor]
+
+    def _get_published_since(self, since: str) -> list[dict[str, Any]]:
+        """Return the recalls published since a date, oldest first."""
+        with self._lock:
+            cursor = self._db.execute(
+                "SELECT data FROM recalls WHERE publication_date >= ? "
+                "ORDER BY publication_date, id",
+                (since,),
+            )
+            return [json_loads(row[0]) for row in cursor]
+
+    def _search(self, criteria: SearchCriteria, limit: int) -> list[dict[str, Any]]:
+        """Return recalls matching the criteria, newest first."""
+        condition, params = _build_search_query(criteria)
+        with self._lock:
+            cursor = self._db.execute(
+                "SELECT data FROM recalls WHERE id IN "  # noqa: S608
+                f"(SELECT rowid FROM recalls_fts WHERE {condition}) "
+                "ORDER BY publication_date DESC, id DESC LIMIT ?",
+                [*params, limit],
+            )
+            return [json_loads(row[0]) for row in cursor]
+
+    def _search_ids(self, queries: list[SearchCriteria], limit: int) -> list[list[int]]:
+        """Return the IDs of the recalls matching each query, newest first."""
+        results = []
+        with self._lock:
+            for criteria in queries:
+                condition, params = _build_search_query(criteria)
+                cursor = self._db.execute(
+                    "SELECT id FROM recalls WHERE id IN "  # noqa: S608
+                    f"(SELECT rowid FROM recalls_fts WHERE {condition}) "
+                    "ORDER BY publication_date DESC, id DESC LIMIT ?",
+                    [*params, limit],
+                )
+                results.append([row[0] for row in cursor])
+        return results
+
+    def _count_groups(
+        self, group_by: str, criteria: SearchCriteria, limit: int
+    ) -> list[dict[str, Any]]:
+        """Return the number of matching recalls per value of a dimension."""
+        expression = GROUP_BY_FIELDS[group_by][1]
+        condition = "1"
+        params: list[Any] = []
+        if criteria:
+            match, params = _build_search_query(criteria)
+            condition = f"id IN (SELECT rowid FROM recalls_fts WHERE {match})"  # noqa: S608
+        order = "value DESC" if group_by in TIME_GROUPS else "count DESC, value"
+        with self._lock:
+            cursor = self._db.execute(
+                f"SELECT {expression} AS value, COUNT(*) AS count FROM recalls "  # noqa: S608
+                f"WHERE {condition} GROUP BY value ORDER BY {order} LIMIT ?",
+                [*params, limit],
+            )
+            return [{"value": row[0], "count": row[1]} for row in cursor]
+
+    def _get_many(self, recall_ids: list[int]) -> list[dict[str, Any]]:
+        """Return the stored recalls with the given IDs, newest first."""
+        if not recall_ids:
+            return []
+        placeholders = ",".join("?" * len(recall_ids))
+        with self._lock:
+            cursor = self._db.execute(
+                f"SELECT data FROM recalls WHERE id IN ({placeholders}) "  # noqa: S608
+                "ORDER BY publication_date DESC, id DESC",
+                recall_ids,
+            )
+            return [json_loads(row[0]) for row in cursor]
+
+    def _get_detailed(self, recall_ids: list[int]) -> list[dict[str, Any]]:
+        """Return the stored recalls with the given IDs and all their fields."""
+        if not recall_ids:
+            return []
+        placeholders = ",".join("?" * len(recall_ids))
+        with self._lock:
+            cursor = self._db.execute(
+                f"SELECT data FROM recalls WHERE id IN ({placeholders}) "  # noqa: S608
+                "AND detailed = 1",
+                recall_ids,
+            )
+            return [json_loads(row[0]) for row in cursor]
+
+    def _get_gtins(self) -> list[tuple[str, int]]:
+        """Return every (GTIN, recall ID) pair."""
+        with self._lock:
+            return self._db.execute(
+                "SELECT gtin, recall_id FROM recall_gtins"
+            ).fetchall()
+
+    def _get_watermark(self) -> str | None:
+        """Return the publication date of the newest stored recall."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT MAX(publication_date) FROM recalls"
+            ).fetchone()
+        return row[0] if row else None
+
+    def _get_publication_dates(self, limit: int) -> list[str]:
+        """Return the publication dates of the newest stored recalls."""
+        with self._lock:
+            cursor = self._db.execute(
+                "SELECT publication_date FROM recalls "
+                "WHERE publication_date IS NOT NULL "
+                "ORDER BY publication_date DESC LIMIT ?",
+                (limit,),
+            )
+            return [row[0] for row in cursor]
+
+    def _count_by_month(self) -> dict[str, int]:
+        """Return the number of stored recalls per publication month."""
+        with self._lock:
+            return dict(
+                self._db.execute(
+                    "SELECT substr(publication_date, 1, 7) AS month, COUNT(*) "
+                    "FROM recalls WHERE publication_date IS NOT NULL GROUP BY month"
+                ).fetchall()
+            )
+
+    def _delete_missing(self, start: str, end: str, keep: set[int]) -> list[int]:
+        """Delete the recalls published in [start, end) but not in ``keep``."""
+        with self._lock, self._db as conn:
+            ids = [
+                row[0]
+                for row in conn.execute(
+                    "SELECT id FROM recalls "
+                    "WHERE publication_date >= ? AND publication_date < ?",
+                    (start, end),
+                )
+                if row[0] not in keep
+            ]
+            if not ids:
+                return []
+            placeholders = ",".join("?" * len(ids))
+            for statement in (
+                f"DELETE FROM recalls WHERE id IN ({placeholders})",  # noqa: S608
+                f"DELETE FROM recalls_fts WHERE rowid IN ({placeholders})",  # noqa: S608
+                f"DELETE FROM recall_gtins WHERE recall_id IN ({placeholders})",  # noqa: S608
+                f"DELETE FROM recall_versions WHERE recall_id IN ({placeholders})",  # noqa: S608
+            ):
+                conn.execute(statement, ids)
+        return ids
+
+    def _count(self) -> int:
+        """Return the number of stored recalls."""
+        with self._lock:
+            row = self._db.execute("SELECT COUNT(*) FROM recalls").fetchone()
+        return int(row[0])
+
+    def _get_meta(self, key: str) -> str | None:
+        """Return a metadata value."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT value FROM meta WHERE key = ?", (key,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key: str, value: str) -> None:
+        """Set a metadata value."""
+        with self._lock, self._db as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value)
+            )
+
+    async def async_open(self) -> None:
+        """Open the store."""
+        await self.hass.async_add_executor_job(self._open)
+        _LOGGER.debug("Opened recall store at %s", self.path)
+
+    async def async_close(self) -> None:
+        """Close the store."""
+        await self.hass.async_add_executor_job(self._close)
+
+    async def async_remove(self) -> None:
+        """Close the database and delete its files."""
+        await self.hass.async_add_executor_job(self._remove)
+
+    async def async_upsert(
+        self, recalls: list[dict[str, Any]], *, detailed: bool = True
+    ) -> set[int]:
+        """Store recalls and return the IDs that were newly added.
+
+        Pass ``detailed=False`` for rows fetched with the polling projection.
+        """
+        changes = await self.async_upsert_changes(recalls, detailed=detailed)
+        return changes.inserted
+
+    async def async_upsert_changes(
+        self, recalls: list[dict[str, Any]], *, detailed: bool = True
+    ) -> RecallChanges:
+        """Store recalls and return which were new, updated or unchanged."""
+        return await self.hass.async_add_executor_job(self._upsert, recalls, detailed)
+
+    async def async_get_undetailed(self, recall_ids: list[int]) -> list[int]:
+        """Return the IDs among ``recall_ids`` that lack their full details."""
+        return await self.hass.async_add_executor_job(self._get_undetailed, recall_ids)
+
+    async def async_get_detailed(self, recall_ids: list[int]) -> list[dict[str, Any]]:
+        """Return the stored recalls with the given IDs and all their fields."""
+        return await self.hass.async_add_executor_job(self._get_detailed, recall_ids)
+
+    async def async_get_recent(
+        self, limit: int, offset: int = 0
+    ) -> list[dict[str, Any]]:
+        """Return up to ``limit`` recalls, newest first, skipping ``offset``."""
+        return await self.hass.async_add_executor_job(self._get_recent, limit, offset)
+
+    async def async_get_published_since(self, since: str) -> list[dict[str, Any]]:
+        """Return the recalls published since an ISO date, oldest first."""
+        return await self.hass.async_add_executor_job(self._get_published_since, since)
+
+    async def async_get_watermark(self) -> str | None:
+        """Return the newest stored publication date, or None when empty."""
+        return await self.hass.async_add_executor_job(self._get_watermark)
+
+    async def async_get_publication_dates(self, limit: int) -> list[str]:
+        """Return the publication dates of the newest stored recalls."""
+        return await self.hass.async_add_executor_job(
+            self._get_publication_dates, limit
+        )
+
+    async def async_count_by_month(self) -> dict[str, int]:
+        """Return the number of stored recalls per publication month (YYYY-MM)."""
+        return await self.hass.async_add_executor_job(self._count_by_month)
+
+    async def async_delete_missing(
+        self, start: str, end: str, keep: set[int]
+    ) -> list[int]:
+        """Delete the recalls published in [start, end) but not in ``keep``.
+
+        Returns:
+            The IDs of the deleted recalls
+        """
+        return await self.hass.async_add_executor_job(
+            self._delete_missing, start, end, keep
+        )
+
+    async def async_count(self) -> int:
+        """Return the number of stored recalls."""
+        return await self.hass.async_add_executor_job(self._count)
+
+    async def async_search(
+        self, criteria: SearchCriteria, limit: int
+    ) -> list[dict[str, Any]]:
+        """Search the local mirror."""
+        return await self.hass.async_add_executor_job(self._search, criteria, limit)
+
+    async def async_search_ids(
+        self, queries: list[SearchCriteria], limit: int
+    ) -> list[list[int]]:
+        """Search the local mirror for several queries at once."""
+        return await self.hass.async_add_executor_job(self._search_ids, queries, limit)
+
+    async def async_count_groups(
+        self, group_by: str, criteria: SearchCriteria, limit: int
+    ) -> list[dict[str, Any]]:
+        """Count the stored recalls matching criteria per value of a dimension."""
+        return await self.hass.async_add_executor_job(
+            self._count_groups, group_by, criteria, limit
+        )
+
+    async def async_get_many(self, recall_ids: list[int]) -> list[dict[str, Any]]:
+        """Return the stored recalls with the given IDs."""
+        return await self.hass.async_add_executor_job(self._get_many, recall_ids)
+
+    async def async_get_gtins(self) -> list[tuple[str, int]]:
+        """Return every indexed (GTIN, recall ID) pair."""
+        return await self.hass.async_add_executor_job(self._get_gtins)
+
+    async def async_is_complete(self) -> bool:
+        """Return True when the mirror holds every recall of the dataset."""
+        total_count = await self.async_get_total_count()
+        return total_count > 0 and await self.async_count() >= total_count
+
+    async def async_get_meta(self, key: str) -> str | None:
+        """Return a metadata value."""
+        return await self.hass.async_add_executor_job(self._get_meta, key)
+
+    async def async_set_meta(self, key: str, value: str) -> None:
+        """Set a metadata value."""
+        await self.hass.async_add_executor_job(self._set_meta, key, value)
+
+    async def async_get_total_count(self) -> int:
+        """Return the dataset size recorded at the last sync."""
+        value = await self.hass.async_add_executor_job(self._get_meta, META_TOTAL_COUNT)
+        return int(value) if value is not None else 0
+
+    async def async_set_total_count(self, total_count: int) -> None:
+        """Record the dataset size reported by the API."""
+        await self.hass.async_add_executor_job(
+            self._set_meta, META_TOTAL_COUNT, str(total_count)
+        )
@@ -0,0 +1,185 @@
+"""Watchlists matched against new recalls."""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Iterable, Iterator
+from typing import Any
+
+import voluptuous as vol
+from homeassistant.helpers import config_validation as cv
+
+from .const import (
+    ATTR_BRANDS,
+    ATTR_CATEGORIES,
+    ATTR_GTINS,
+    ATTR_NAME,
+    ATTR_PRODUCT_NAMES,
+)
+from .gtin import extract_gtins, normalize_gtin
+
+# Watchlist terms matched as substrings, with the recall field they look in
+_SUBSTRING_FIELDS: tuple[tuple[str, str], ...] = (
+    (ATTR_BRANDS, "brand"),
+    (ATTR_PRODUCT_NAMES, "product_name"),
+)
+
+# A matched term as (watchlist name, watchlist key)
+_Match = tuple[str, str]
+
+
+def _gtin(value: object) -> str:
+    """Validate a barcode and return it as a GTIN-14."""
+    if (gtin := normalize_gtin(cv.string(value))) is None:
+        msg = f"invalid barcode: {value}"
+        raise vol.Invalid(msg)
+    return gtin
+
+
+WATCHLISTS_SCHEMA = vol.Schema(
+    [
+        vol.Schema(
+            {
+                vol.Required(ATTR_NAME): cv.string,
+                vol.Optional(ATTR_BRANDS, default=list): vol.All(
+                    cv.ensure_list, [cv.string]
+                ),
+                vol.Optional(ATTR_PRODUCT_NAMES, default=list): vol.All(
+                    cv.ensure_list, [cv.string]
+                ),
+                vol.Optional(ATTR_GTINS, default=list): vol.All(
+                    cv.ensure_list, [_gtin]
+                ),
+                vol.Optional(ATTR_CATEGORIES, default=list): vol.All(
+                    cv.ensure_list, [cv.string]
+                ),
+            }
+        )
+    ]
+)
+
+
+def validate_watchlists(value: object) -> list[dict[str, Any]]:
+    """Validate the watchlists of the integration options.
+
+    Raises:
+        vol.Invalid: If a watchlist is malformed, has no term or a duplicate name
+    """
+    watchlists: list[dict[str, Any]] = WATCHLISTS_SCHEMA(value or [])
+    names: set[str] = set()
+    for watchlist in watchlists:
+        if watchlist[ATTR_NAME] in names:
+            msg = f"duplicate watchlist name: {watchlist[ATTR_NAME]}"
+            raise vol.Invalid(msg)
+        names.add(watchlist[ATTR_NAME])
+        if not any(
+            watchlist[key]
+            for key in (ATTR_BRANDS, ATTR_PRODUCT_NAMES, ATTR_GTINS, ATTR_CATEGORIES)
+        ):
+            msg = f"watchlist without terms: {watchlist[ATTR_NAME]}"
+            raise vol.Invalid(msg)
+    return watchlists
+
+
+class AhoCorasick:
+    """Aho-Corasick automaton finding many patterns in one pass over a text.
+
+    Each pattern carries a payload, and searching yields the payload of every
+    occurrence. The search time depends on the text length and the number of
+    occurrences, not on the number of patterns.
+    """
+
+    def __init__(self, patterns: Iterable[tuple[str, _Match]]) -> None:
+        """Build the automaton."""
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._output: list[list[_Match]] = [[]]
+
+        for pattern, payload in patterns:
+            state = 0
+            for char in pattern:
+                if (next_state := self._goto[state].get(char)) is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                state = next_state
+            self._output[state].append(payload)
+
+        # Breadth-first, so failure states are complete before being followed
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(char, 0)
+                self._output[next_state] += self._output[self._fail[next_state]]
+
+    def __len__(self) -> int:
+        """Return the number of states."""
+        return len(self._goto)
+
+    def search(self, text: str) -> Iterator[_Match]:
+        """Yield the payload of each pattern occurrence in a text."""
+        goto, fail, output = self._goto, self._fail, self._output
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            yield from output[state]
+
+
+class WatchlistMatcher:
+    """Match recalls against all the watchlists at once.
+
+    Brand and product name terms are case-insensitive substrings, found by a
+    single automaton; categories (case-insensitive) and GTINs are exact
+    matches looked up in dicts. A recall matches a watchlist when any of its
+    terms matches.
+    """
+
+    def __init__(self, watchlists: list[dict[str, Any]]) -> None:
+        """Compile validated watchlists."""
+        self.watchlists = len(watchlists)
+        self._automaton = AhoCorasick(
+            (term.strip().casefold(), (watchlist[ATTR_NAME], key))
+            for watchlist in watchlists
+            for key, _ in _SUBSTRING_FIELDS
+            for term in watchlist[key]
+            if term.strip()
+        )
+        self._categories: dict[str, set[str]] = {}
+        self._gtins: dict[str, set[str]] = {}
+        for watchlist in watchlists:
+            for category in watchlist[ATTR_CATEGORIES]:
+                self._categories.setdefault(category.casefold(), set()).add(
+                    watchlist[ATTR_NAME]
+                )
+            for gtin in watchlist[ATTR_GTINS]:
+                self._gtins.setdefault(gtin, set()).add(watchlist[ATTR_NAME])
+
+    def __bool__(self) -> bool:
+        """Return True when there is at least one watchlist."""
+        return self.watchlists > 0
+
+    def match(self, recall: dict[str, Any]) -> dict[str, set[str]]:
+        """Return the keys matched by a recall, by watchlist name."""
+        matches: dict[str, set[str]] = {}
+        for key, field in _SUBSTRING_FIELDS:
+            if text := recall.get(field):
+                for name, term_key in self._automaton.search(text.casefold()):
+                    if term_key == key:
+                        matches.setdefault(name, set()).add(key)
+        if category := recall.get("category"):
+            for name in self._categories.get(category.casefold(), ()):
+                matches.setdefault(name, set()).add(ATTR_CATEGORIES)
+        if self._gtins:
+            for gtin in extract_gtins(recall.get("product_identification")):
+                for name in self._gtins.get(gtin, ()):
+                    matches.setdefault(name, set()).add(ATTR_GTINS)
+        return matches
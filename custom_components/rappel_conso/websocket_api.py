@@ -0,0 +1,99 @@
+"""Websocket commands for Rappel Conso dashboards."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import voluptuous as vol
+from homeassistant.components import websocket_api
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+
+from .const import DOMAIN, MAX_RECENT_RECALLS, SIGNAL_RECENT_RECALLS_CHANGED
+from .coordinator import RappelConsoCoordinator
+
+
+@callback
+def async_setup(hass: HomeAssistant) -> None:
+    """Register the websocket commands."""
+    websocket_api.async_register_command(hass, websocket_get_recalls)
+    websocket_api.async_register_command(hass, websocket_subscribe_recalls)
+
+
+def _get_coordinator(hass: HomeAssistant) -> RappelConsoCoordinator | None:
+    """Return the coordinator of the first loaded config entry."""
+    entry = next(
+        (
+            entry
+            for entry in hass.config_entries.async_entries(DOMAIN)
+            if entry.state == ConfigEntryState.LOADED
+        ),
+        None,
+    )
+    if entry is None:
+        return None
+    coordinator: RappelConsoCoordinator = hass.data[DOMAIN][entry.entry_id]
+    return coordinator
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{DOMAIN}/recalls",
+        vol.Optional("offset", default=0): vol.All(int, vol.Range(min=0)),
+        vol.Optional("limit", default=MAX_RECENT_RECALLS): vol.All(
+            int, vol.Range(min=1, max=1000)
+        ),
+    }
+)
+@websocket_api.async_response
+async def websocket_get_recalls(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Send a page of the stored recalls, newest first."""
+    if (coordinator := _get_coordinator(hass)) is None:
+        connection.send_error(
+            msg["id"], websocket_api.ERR_NOT_FOUND, "Rappel Conso is not loaded"
+        )
+        return
+
+    offset: int = msg["offset"]
+    recalls = await coordinator.store.async_get_recent(msg["limit"], offset)
+    total = await coordinator.store.async_count()
+    next_offset = offset + len(recalls)
+    connection.send_result(
+        msg["id"],
+        {
+            "recalls": recalls,
+            "total": total,
+            "next_offset": next_offset if next_offset < total else None,
+        },
+    )
+
+
+@websocket_api.websocket_command({vol.Required("type"): f"{DOMAIN}/subscribe"})
+@callback
+def websocket_subscribe_recalls(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Send the changes of the recent recalls after each refresh.
+
+    Each event holds the ``added`` and ``updated`` recalls and the ``removed``
+    recall IDs, so a dashboard fetches the recent recalls once with
+    ``rappel_conso/recalls`` and then only receives what changed.
+    """
+
+    @callback
+    def forward_changes(changes: dict[str, list[Any]]) -> None:
+        """Forward the changes to the subscriber."""
+        connection.send_message(websocket_api.event_message(msg["id"], changes))
+
+    # The signal outlives config entry reloads, unlike a coordinator listener
+    connection.subscriptions[msg["id"]] = async_dispatcher_connect(
+        hass, SIGNAL_RECENT_RECALLS_CHANGED, forward_changes
+    )
+    connection.send_result(msg["id"])
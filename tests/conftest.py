@@ -9,3 +9,9 @@ pytest_plugins = "pytest_homeassistant_custom_component"
 def auto_enable_custom_integrations(enable_custom_integrations):
     """Enable custom integrations."""
     return
+
+
+@pytest.fixture(autouse=True)
+def isolated_config_dir(hass, tmp_path):
+    """Keep the local recall store of each test in its own directory."""
+    hass.config.config_dir = str(tmp_path)
@@ -0,0 +1,148 @@
+"""Tests for the shared API access."""
+
+from __future__ import annotations
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from httpx import ConnectError, Response
+
+from custom_components.rappel_conso.api import ApiUnavailableError, RappelConsoApi
+from custom_components.rappel_conso.circuit import CircuitBreaker
+from custom_components.rappel_conso.ratelimit import TokenBucket
+
+pytestmark = pytest.mark.asyncio
+
+URL = "https://example.com/records"
+
+
+def _response(status_code: int, headers: dict[str, str] | None = None) -> Response:
+    """Return a response with a status and headers."""
+    response = AsyncMock(spec=Response)
+    response.status_code = status_code
+    response.headers = headers or {}
+    return response
+
+
+@pytest.fixture
+def client() -> MagicMock:
+    """Return a mock HTTP client."""
+    return MagicMock()
+
+
+@pytest.fixture
+def api(client: MagicMock) -> RappelConsoApi:
+    """Return an API access with a fast limiter."""
+    return RappelConsoApi(
+        client,
+        TokenBucket(rate=1000, capacity=10),
+        CircuitBreaker(failure_threshold=2, reset_timeout=60),
+    )
+
+
+async def test_get_honors_retry_after(api: RappelConsoApi, client: MagicMock):
+    """Test that a throttled request is retried after the asked delay."""
+    client.get = AsyncMock(
+        side_effect=[_response(429, {"Retry-After": "0"}), _response(200)]
+    )
+
+    response = await api.get(URL, params={"limit": 1})
+
+    assert response.status_code == 200
+    assert client.get.call_count == 2
+    assert (api.requests, api.retries, api.rate_limited) == (2, 1, 1)
+
+
+async def test_get_gives_up_on_long_retry_after(api: RappelConsoApi, client: MagicMock):
+    """Test that a Retry-After too far away is not waited for."""
+    client.get = AsyncMock(return_value=_response(429, {"Retry-After": "3600"}))
+
+    response = await api.get(URL, params={})
+
+    assert response.status_code == 429
+    assert client.get.call_count == 1
+    assert api.retries == 0
+
+
+async def test_get_retries_transport_errors(api: RappelConsoApi, client: MagicMock):
+    """Test that connection errors are retried a bounded number of times."""
+    client.get = AsyncMock(side_effect=ConnectError("unreachable"))
+
+    with (
+        patch("custom_components.rappel_conso.api.API_RETRY_BACKOFF", 0.001),
+        pytest.raises(ConnectError),
+    ):
+        await api.get(URL, params={})
+
+    # The first attempt and three retries
+    assert client.get.call_count == 4
+    assert api.retries == 3
+
+
+async def test_get_without_retries(api: RappelConsoApi, client: MagicMock):
+    """Test that an interactive request fails after a single short attempt."""
+    client.get = AsyncMock(side_effect=ConnectError("unreachable"))
+
+    with pytest.raises(ConnectError):
+        await api.get(URL, params={}, max_retries=0, timeout=10.0)
+
+    client.get.assert_called_once()
+    assert client.get.call_args.kwargs["timeout"] == 10.0
+    assert api.retries == 0
+
+
+async def test_get_returns_client_errors(api: RappelConsoApi, client: MagicMock):
+    """Test that a non-transient error is returned without retrying."""
+    client.get = AsyncMock(return_value=_response(400))
+
+    response = await api.get(URL, params={})
+
+    assert response.status_code == 400
+    assert api.retries == 0
+
+
+async def test_get_rejected_while_circuit_open(api: RappelConsoApi, client: MagicMock):
+    """Test that requests failing in a row open the circuit."""
+    client.get = AsyncMock(return_value=_response(500))
+
+    await api.get(URL, params={})
+    await api.get(URL, params={})
+    with pytest.raises(ApiUnavailableError):
+        await api.get(URL, params={})
+
+    assert client.get.call_count == 2
+
+
+async def test_get_counts_reused_connections(api: RappelConsoApi, client: MagicMock):
+    """Test that connections opened by the pool are traced."""
+
+    async def get(*_args, extensions, **_kwargs):
+        if not api.connections:
+            await extensions["trace"]("connection.connect_tcp.complete", {})
+            await extensions["trace"]("connection.start_tls.complete", {})
+        return _response(200)
+
+    client.get = AsyncMock(side_effect=get)
+
+    for _ in range(3):
+        await api.get(URL, params={})
+
+    assert api.connections == 1
+    assert api.tls_handshakes == 1
+    assert api.reused_connections == 2
+
+
+async def test_half_open_probe_is_a_single_attempt(
+    api: RappelConsoApi, client: MagicMock
+):
+    """Test that the probe of a half-open circuit is not retried."""
+    client.get = AsyncMock(side_effect=ConnectError("unreachable"))
+    for _ in range(api.breaker.failure_threshold):
+        api.breaker.record_failure()
+    api.breaker.reset_timeout = 0
+
+    with pytest.raises(ConnectError):
+        await api.get(URL, params={})
+
+    client.get.assert_called_once()
+    assert api.breaker.state == "open"
@@ -0,0 +1,38 @@
+"""Tests for the search result cache."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from custom_components.rappel_conso.cache import SingleFlightCache
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_cancelled_fetch_does_not_block_waiters():
+    """Test that a waiter fetches again when the shared fetch is cancelled."""
+    cache = SingleFlightCache(maxsize=8, ttl=60)
+    started = asyncio.Event()
+    fetches = 0
+
+    async def fetch():
+        nonlocal fetches
+        fetches += 1
+        if fetches == 1:
+            started.set()
+            await asyncio.sleep(10)
+        return [{"id": fetches}]
+
+    leader = asyncio.create_task(cache.async_get_or_fetch("key", fetch))
+    await started.wait()
+    follower = asyncio.create_task(cache.async_get_or_fetch("key", fetch))
+    await asyncio.sleep(0)
+
+    leader.cancel()
+    assert await asyncio.wait_for(follower, timeout=1) == [{"id": 2}]
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+    assert cache.coalesced == 1
+    assert await cache.async_get_or_fetch("key", fetch) == [{"id": 2}]
@@ -0,0 +1,58 @@
+"""Tests for the API circuit breaker."""
+
+from __future__ import annotations
+
+from unittest.mock import patch
+
+from custom_components.rappel_conso.circuit import (
+    STATE_CLOSED,
+    STATE_HALF_OPEN,
+    STATE_OPEN,
+    CircuitBreaker,
+)
+
+
+def test_opens_after_consecutive_failures():
+    """Test that the circuit opens once failures reach the threshold."""
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=60)
+
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.allow()
+
+    breaker.record_failure()
+    assert breaker.state == STATE_OPEN
+    assert breaker.trips == 1
+    assert not breaker.allow()
+    assert breaker.rejected == 1
+
+
+def test_single_half_open_probe():
+    """Test that only one request probes the API after the reset timeout."""
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+
+    with patch("custom_components.rappel_conso.circuit.time.monotonic") as monotonic:
+        monotonic.return_value = 1000.0
+        breaker.record_failure()
+
+        monotonic.return_value = 1060.0
+        assert breaker.allow()
+        assert breaker.state == STATE_HALF_OPEN
+        assert not breaker.allow()
+
+        # A failed probe opens the circuit for another reset timeout
+        breaker.record_failure()
+        assert breaker.state == STATE_OPEN
+        monotonic.return_value = 1100.0
+        assert not breaker.allow()
+
+        monotonic.return_value = 1120.0
+        assert breaker.allow()
+        breaker.record_success()
+        assert breaker.state == STATE_CLOSED
+        assert breaker.allow()
+
+    assert breaker.trips == 1
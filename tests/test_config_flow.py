@@ -9,8 +9,20 @@ from homeassistant import config_entries
 from homeassistant.core import HomeAssistant
 from homeassistant.data_entry_flow import FlowResultType
 from httpx import HTTPError, Response
-
-from custom_components.rappel_conso.const import DOMAIN
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.rappel_conso.const import (
+    CONF_COMPACT_ATTRIBUTES,
+    CONF_COUNTERS,
+    CONF_DIGEST_WINDOW,
+    CONF_EVENT_MODE,
+    CONF_MAX_CONCURRENCY,
+    CONF_MAX_SCAN_INTERVAL,
+    CONF_MIN_SCAN_INTERVAL,
+    CONF_WATCHLISTS,
+    DOMAIN,
+    EVENT_MODE_DIGEST,
+)
 
 pytestmark = pytest.mark.asyncio
 
@@ -20,6 +32,7 @@ def mock_httpx_get():
     """Mock httpx get method."""
     with patch("httpx.AsyncClient.get") as mock:
         response = AsyncMock(spec=Response)
+        response.status_code = 200
         response.json.return_value = {"total_count": 16341, "results": []}
         response.raise_for_status = AsyncMock()
         mock.return_value = response
@@ -60,6 +73,7 @@ async def test_user_flow_invalid_response(hass: HomeAssistant):
     """Test invalid response during user flow."""
     with patch("httpx.AsyncClient.get") as mock:
         response = AsyncMock(spec=Response)
+        response.status_code = 200
         response.json.return_value = {"invalid": "response"}
         response.raise_for_status = AsyncMock()
         mock.return_value = response
@@ -93,3 +107,97 @@ async def test_user_flow_already_configured(hass: HomeAssistant, mock_httpx_get)
 
     assert result["type"] == FlowResultType.ABORT
     assert result["reason"] == "already_configured"
+
+
+async def test_options_flow(hass: HomeAssistant):
+    """Test changing the options."""
+    entry = MockConfigEntry(domain=DOMAIN, title="Rappel Conso", data={}, options={})
+    entry.add_to_hass(hass)
+
+    result = await hass.config_entries.options.async_init(entry.entry_id)
+    assert result["type"] == FlowResultType.FORM
+    assert result["step_id"] == "init"
+
+    # The minimum interval cannot exceed the maximum
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        user_input={
+            CONF_MAX_CONCURRENCY: 2,
+            CONF_MIN_SCAN_INTERVAL: 120,
+            CONF_MAX_SCAN_INTERVAL: 60,
+        },
+    )
+    assert result["type"] == FlowResultType.FORM
+    assert result["errors"] == {"base": "min_above_max_interval"}
+
+    # Watchlists need terms, and valid barcodes
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        user_input={
+            CONF_MAX_CONCURRENCY: 2,
+            CONF_MIN_SCAN_INTERVAL: 10,
+            CONF_MAX_SCAN_INTERVAL: 240,
+            CONF_WATCHLISTS: [{"name": "pantry", "gtins": ["123"]}],
+        },
+    )
+    assert result["type"] == FlowResultType.FORM
+    assert result["errors"] == {CONF_WATCHLISTS: "invalid_watchlists"}
+
+    # Counter windows are bounded
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        user_input={
+            CONF_MAX_CONCURRENCY: 2,
+            CONF_MIN_SCAN_INTERVAL: 10,
+            CONF_MAX_SCAN_INTERVAL: 240,
+            CONF_WATCHLISTS: [],
+            CONF_COUNTERS: [{"name": "Listeria", "days": 0}],
+        },
+    )
+    assert result["type"] == FlowResultType.FORM
+    assert result["errors"] == {CONF_COUNTERS: "invalid_counters"}
+
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        user_input={
+            CONF_MAX_CONCURRENCY: 2,
+            CONF_MIN_SCAN_INTERVAL: 10,
+            CONF_MAX_SCAN_INTERVAL: 240,
+            CONF_COMPACT_ATTRIBUTES: True,
+            CONF_EVENT_MODE: EVENT_MODE_DIGEST,
+            CONF_DIGEST_WINDOW: 30,
+            CONF_WATCHLISTS: [
+                {"name": "pantry", "brands": ["Lidl"], "gtins": ["3017620422003"]}
+            ],
+            CONF_COUNTERS: [{"name": "Listeria", "days": "30", "risks": "listeria"}],
+        },
+    )
+    assert result["type"] == FlowResultType.CREATE_ENTRY
+    assert entry.options == {
+        CONF_MAX_CONCURRENCY: 2,
+        CONF_MIN_SCAN_INTERVAL: 10,
+        CONF_MAX_SCAN_INTERVAL: 240,
+        CONF_COMPACT_ATTRIBUTES: True,
+        CONF_EVENT_MODE: EVENT_MODE_DIGEST,
+        CONF_DIGEST_WINDOW: 30,
+        CONF_WATCHLISTS: [
+            {
+                "name": "pantry",
+                "brands": ["Lidl"],
+                "product_names": [],
+                "gtins": ["03017620422003"],
+                "categories": [],
+            }
+        ],
+        CONF_COUNTERS: [
+            {
+                "name": "Listeria",
+                "days": 30,
+                "product_names": [],
+                "brands": [],
+                "categories": [],
+                "keywords": [],
+                "risks": ["listeria"],
+            }
+        ],
+    }
@@ -0,0 +1,112 @@
+"""Tests for the recall counters."""
+
+from __future__ import annotations
+
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+import voluptuous as vol
+
+from custom_components.rappel_conso.counters import RecallCounter, validate_counters
+
+
+def _at(value: str):
+    """Patch the current time of the counters."""
+    moment = datetime.fromisoformat(value)
+    return patch(
+        "custom_components.rappel_conso.counters.dt_util.now",
+        side_effect=lambda time_zone=None: moment.astimezone(time_zone),
+    )
+
+
+def _counter(**config) -> RecallCounter:
+    """Return a counter from options."""
+    (counter,) = validate_counters([{"name": "Test", "days": 3, **config}])
+    return RecallCounter(counter)
+
+
+def _recall(sheet: int, published: str, **fields) -> dict:
+    """Return a recall of a sheet."""
+    return {
+        "id": sheet,
+        "sheet_number": f"2021-06-{sheet:04d}",
+        "publication_date": published,
+        **fields,
+    }
+
+
+def test_counter_window_expires_old_days():
+    """Test that recalls leave the count with their day."""
+    with _at("2021-06-03T12:00:00+00:00"):
+        counter = _counter()
+        counter.observe(
+            [
+                _recall(1, "2021-05-31T12:00:00+00:00"),
+                _recall(2, "2021-06-01T12:00:00+00:00"),
+                _recall(3, "2021-06-02T12:00:00+00:00"),
+                _recall(4, "2021-06-03T12:00:00+00:00"),
+            ]
+        )
+        assert counter.count == 3
+        assert counter.first_day.isoformat() == "2021-06-01"
+
+    with _at("2021-06-04T12:00:00+00:00"):
+        assert counter.count == 2
+
+    # Publication days are French ones
+    with _at("2021-06-05T22:30:00+00:00"):
+        assert counter.count == 0
+
+
+def test_counter_counts_each_sheet_once():
+    """Test that a new version replaces the previous one in the count."""
+    with _at("2021-06-03T12:00:00+00:00"):
+        counter = _counter(brands=["Lidl"])
+        counter.observe([_recall(1, "2021-06-01T12:00:00+00:00", brand="Lidl")])
+        counter.observe([_recall(1, "2021-06-03T08:00:00+00:00", brand="Lidl", id=100)])
+        assert counter.count == 1
+
+        # The corrected version no longer matches
+        counter.observe([_recall(1, "2021-06-03T08:00:00+00:00", brand="Aldi")])
+        assert counter.count == 0
+
+
+def test_counter_matches_risks():
+    """Test that risk terms look in the risks and the recall reason."""
+    with _at("2021-06-03T12:00:00+00:00"):
+        counter = _counter(risks=["Listeria"])
+        counter.observe(
+            [
+                _recall(1, "2021-06-03T08:00:00+00:00", risks="Listeria monocytogenes"),
+                _recall(2, "2021-06-03T08:00:00+00:00", recall_reason="listeria"),
+                _recall(3, "2021-06-03T08:00:00+00:00", risks="Salmonella"),
+            ]
+        )
+        assert counter.count == 2
+
+        counter.reset()
+        assert counter.count == 0
+
+
+def test_counter_ignores_future_and_undated_recalls():
+    """Test that recalls out of the window are not counted."""
+    with _at("2021-06-03T12:00:00+00:00"):
+        counter = _counter()
+        counter.observe([_recall(1, "2021-06-10T08:00:00+00:00"), _recall(2, None)])
+        assert counter.count == 0
+
+
+@pytest.mark.parametrize(
+    "counters",
+    [
+        [{"name": "no days"}],
+        [{"name": "too long", "days": 366}],
+        [{"name": "twice", "days": 7}, {"name": "twice", "days": 30}],
+        [{"name": "Lidl", "days": 7}, {"name": "lidl", "days": 30}],
+    ],
+)
+def test_invalid_counters(counters):
+    """Test that malformed counters are rejected."""
+    with pytest.raises(vol.Invalid):
+        validate_counters(counters)
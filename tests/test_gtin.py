@@ -0,0 +1,67 @@
+"""Tests for GTIN parsing and the barcode index."""
+
+from __future__ import annotations
+
+from custom_components.rappel_conso.gtin import (
+    BloomFilter,
+    GtinIndex,
+    extract_gtins,
+    normalize_gtin,
+)
+
+
+def test_normalize_gtin():
+    """Test barcode normalization to GTIN-14."""
+    assert normalize_gtin("3017620422003") == "03017620422003"
+    assert normalize_gtin("3017 6204 22003") == "03017620422003"
+    assert normalize_gtin("96385074") == "00000096385074"
+    assert normalize_gtin("036000291452") == "00036000291452"
+    # Wrong check digit, wrong length, not a number
+    assert normalize_gtin("3017620422004") is None
+    assert normalize_gtin("301762042") is None
+    assert normalize_gtin("30176204220O3") is None
+
+
+def test_extract_gtins():
+    """Test GTIN extraction from product identification entries."""
+    identifications = [
+        "3017620422003 Lot 12345678 Date limite de consommation 01/02/2024",
+        "5449000000996$L2345$2024-03-01",
+    ]
+    assert extract_gtins(identifications) == {"03017620422003", "05449000000996"}
+    assert extract_gtins("3017620422003") == {"03017620422003"}
+    assert extract_gtins(None) == set()
+    assert extract_gtins(["Lot 123456"]) == set()
+
+
+def test_bloom_filter():
+    """Test that added items are always reported as present."""
+    bloom = BloomFilter(100)
+    items = [f"{index:014d}" for index in range(100)]
+    for item in items:
+        bloom.add(item)
+
+    assert all(item in bloom for item in items)
+    false_positives = sum(f"{index:014d}" in bloom for index in range(1000, 11000))
+    assert false_positives < 100
+
+
+def test_gtin_index():
+    """Test indexing, updating and looking up recall GTINs."""
+    index = GtinIndex()
+    index.update(1, {"03017620422003", "05449000000996"})
+    index.add("03017620422003", 2)
+
+    assert index.lookup("03017620422003") == {1, 2}
+    assert index.lookup("05449000000996") == {1}
+    assert index.lookup("00000096385074") == set()
+
+    # A republished recall drops the GTINs it no longer lists
+    index.update(1, {"03017620422003"})
+    assert index.lookup("05449000000996") == set()
+    assert len(index) == 1
+
+    # The Bloom filter grows with the index
+    for recall_id in range(3000):
+        index.add(f"{recall_id:014d}", recall_id)
+    assert all(index.lookup(f"{recall_id:014d}") for recall_id in range(3000))
@@ -2,14 +2,43 @@
 
 from __future__ import annotations
 
-from unittest.mock import AsyncMock, patch
+import asyncio
+import json
+from datetime import timedelta
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from homeassistant.config_entries import ConfigEntryState
 from homeassistant.core import HomeAssistant
-from httpx import Response
-
-from custom_components.rappel_conso.const import DOMAIN
+from homeassistant.util import dt as dt_util
+from httpx import ConnectError, ReadError, Response
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.rappel_conso.api import get_api
+from custom_components.rappel_conso.const import (
+    CONF_COMPACT_ATTRIBUTES,
+    CONF_COUNTERS,
+    CONF_DIGEST_WINDOW,
+    CONF_EVENT_MODE,
+    CONF_WATCHLISTS,
+    DOMAIN,
+    EVENT_MODE_BATCH,
+    EVENT_MODE_DIGEST,
+)
+from custom_components.rappel_conso.diagnostics import (
+    async_get_config_entry_diagnostics,
+)
+from custom_components.rappel_conso.known_ids import (
+    STORAGE_KEY as KNOWN_IDS_STORAGE_KEY,
+)
+from custom_components.rappel_conso.models import decode_recall
+from custom_components.rappel_conso.ratelimit import TokenBucket
+from custom_components.rappel_conso.sensor import RappelConsoSensor
+from custom_components.rappel_conso.websocket_api import (
+    websocket_get_recalls,
+    websocket_subscribe_recalls,
+)
 
 pytestmark = pytest.mark.asyncio
 
@@ -38,17 +67,38 @@ MOCK_API_RESPONSE = {
 @pytest.fixture
 def mock_httpx_client():
     """Mock httpx client."""
-    with patch("custom_components.rappel_conso.coordinator.httpx.AsyncClient") as mock:
+    with patch("custom_components.rappel_conso.api.create_async_httpx_client") as mock:
         client = AsyncMock()
         response = AsyncMock(spec=Response)
         response.json.return_value = MOCK_API_RESPONSE
         response.raise_for_status = AsyncMock()
+        response.status_code = 200
+        response.headers = {}
         client.get.return_value = response
+        # An empty export: the bootstrap finds nothing older to store
+        client.stream = MagicMock(side_effect=lambda *_, **__: _export([]))
         client.aclose = AsyncMock()
         mock.return_value = client
         yield client
 
 
+def _export(lines: list[str], error: Exception | None = None) -> MagicMock:
+    """Return a streamed export response yielding lines, then raising error."""
+
+    async def aiter_lines():
+        for line in lines:
+            yield line
+        if error is not None:
+            raise error
+
+    response = MagicMock()
+    response.aiter_lines = aiter_lines
+    response.num_bytes_downloaded = sum(len(line) + 1 for line in lines)
+    stream = MagicMock()
+    stream.__aenter__.return_value = response
+    return stream
+
+
 @pytest.fixture
 def mock_config_entry(hass: HomeAssistant):
     """Mock config entry."""
@@ -87,6 +137,28 @@ async def test_unload_entry(hass: HomeAssistant, mock_config_entry, mock_httpx_c
     assert mock_config_entry.entry_id not in hass.data.get(DOMAIN, {})
 
 
+async def test_remove_entry_deletes_local_data(
+    hass: HomeAssistant, mock_config_entry, mock_httpx_client, hass_storage
+):
+    """Test that removing the integration deletes the mirror and known IDs."""
+    hass_storage[KNOWN_IDS_STORAGE_KEY] = {
+        "version": 1,
+        "key": KNOWN_IDS_STORAGE_KEY,
+        "data": {"floor": 0, "ids": [824]},
+    }
+    assert await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+    path = Path(hass.data[DOMAIN][mock_config_entry.entry_id].store.path)
+    assert path.exists()
+
+    assert await hass.config_entries.async_remove(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert not path.exists()
+    assert not path.with_name(f"{path.name}-wal").exists()
+    assert KNOWN_IDS_STORAGE_KEY not in hass_storage
+
+
 async def test_sensor_state(hass: HomeAssistant, mock_config_entry, mock_httpx_client):
     """Test sensor state."""
     assert await hass.config_entries.async_setup(mock_config_entry.entry_id)
@@ -101,6 +173,85 @@ async def test_sensor_state(hass: HomeAssistant, mock_config_entry, mock_httpx_c
     assert state.attributes["recent_recalls"][0]["product_name"] == "glace cookie dough"
 
 
+async def test_sensor_compact_attributes(
+    hass: HomeAssistant, mock_config_entry, mock_httpx_client
+):
+    """Test the compact attribute mode."""
+    hass.config_entries.async_update_entry(
+        mock_config_entry, options={CONF_COMPACT_ATTRIBUTES: True}
+    )
+    assert await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    state = hass.states.get("sensor.rappel_conso")
+    assert state.attributes["recent_recalls"] == [
+        {
+            "id": 824,
+            "product_name": "glace cookie dough",
+            "publication_date": "2021-06-14T10:24:15+00:00",
+        }
+    ]
+
+
+async def test_counter_sensors(
+    hass: HomeAssistant, mock_config_entry, mock_httpx_client, freezer
+):
+    """Test the sensors counting the recalls of the last days."""
+    freezer.move_to("2021-06-20T12:00:00+00:00")
+    hass.config_entries.async_update_entry(
+        mock_config_entry,
+        options={
+            CONF_COUNTERS: [
+                {"name": "Pesticides", "days": 30, "risks": ["pesticides"]},
+                {"name": "Lidl", "days": 30, "brands": ["lidl"]},
+            ]
+        },
+    )
+    assert await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    state = hass.states.get("sensor.rappel_conso_pesticides")
+    assert state.state == "1"
+    assert state.attributes["days"] == 30
+    assert state.attributes["since"] == "2021-05-22"
+    assert hass.states.get("sensor.rappel_conso_lidl").state == "0"
+
+    # The recall leaves the window a month after its publication
+    freezer.move_to("2021-07-14T12:00:00+00:00")
+    coordinator = hass.data[DOMAIN][mock_config_entry.entry_id]
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.rappel_conso_pesticides").state == "0"
+
+
+async def test_sensor_skips_unchanged_state(
+    hass: HomeAssistant, mock_config_entry, mock_httpx_client
+):
+    """Test that a poll without news does not write the state."""
+    assert await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = hass.data[DOMAIN][mock_config_entry.entry_id]
+
+    changes = []
+    hass.bus.async_listen(
+        "state_changed",
+        lambda event: (
+            changes.append(event)
+            if event.data["entity_id"] == "sensor.rappel_conso"
+            else None
+        ),
+    )
+    # The first poll reported one new recall, the next one none
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    assert len(changes) == 1
+
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    assert len(changes) == 1
+    assert "recent_recalls" in RappelConsoSensor._unrecorded_attributes
+
+
 async def test_event_firing(hass: HomeAssistant, mock_config_entry, mock_httpx_client):
     """Test that events are fired for new recalls."""
     events = []
@@ -147,6 +298,220 @@ async def test_event_firing(hass: HomeAssistant, mock_config_entry, mock_httpx_c
     assert event_data["brand"] == MOCK_API_RESPONSE["results"][0]["marque_produit"]
 
 
+async def test_recall_updated_event(
+    hass: HomeAssistant, mock_config_entry, mock_httpx_client
+):
+    """Test that a new version of a stored recall is reported as updated."""
+    assert await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    coordinator = hass.data[DOMAIN][mock_config_entry.entry_id]
+    new_events = []
+    updated_events = []
+    hass.bus.async_listen("rappel_conso_new_recall", new_events.append)
+    hass.bus.async_listen("rappel_conso_recall_updated", updated_events.append)
+
+    # Version 2 of the same sheet, under a new ID
+    new_version = {
+        **MOCK_API_RESPONSE["results"][0],
+        "id": 900,
+        "numero_version": 2,
+        "risques_encourus": "Listeria monocytogenes",
+    }
+    response = mock_httpx_client.get.return_value
+    response.json.return_value = {"total_count": 16342, "results": [new_version]}
+
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    assert new_events == []
+    assert len(updated_events) == 1
+    data = updated_events[0].data
+    assert data["recall_id"] == 900
+    assert data["previous_recall_id"] == 824
+    assert data["changed_fields"] == ["risks", "version_number"]
+    assert data["changes"]["version_number"] == {"old": None, "new": 2}
+    assert coordinator.data["new_recalls_count"] == 0
+
+    # The same content again is unchanged
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    assert len(updated_events) == 1
+
+
+async def test_reconcile_refetches_months_with_different_counts(
+    hass: HomeAssistant, mock_config_entry, mock_httpx_client
+):
+    """Test that reconciliation only fetches the months whose count differs."""
+    assert await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    coordinator = hass.data[DOMAIN][mock_config_entry.entry_id]
+    # The bootstrap is done, but the mirror is incomplete: worth reconciling
+    assert coordinator.bootstrap_done
+    assert not coordinator.mirror_complete
+    assert coordinator.reconcile_due()
+
+    # A recall withdrawn from the dataset, alone in its month
+    await coordinator.store.async_upsert(
+        [{"id": 100, "publication_date": "2021-04-02T08:00:00+00:00"}],
+        detailed=False,
+    )
+    backdated = {
+        **MOCK_API_RESPONSE["results"][0],
+        "id": 823,
+        "numero_fiche": "2021-06-0254",
+        "date_publication": "2021-06-01T08:00:00+00:00",
+    }
+    unchanged = {
+        "id": 700,
+        "numero_fiche": "2021-05-0100",
+        "date_publication": "2021-05-10T08:00:00+00:00",
+    }
+    await coordinator.store.async_upsert([decode_recall(unchanged)], detailed=False)
+    events = []
+    hass.bus.async_listen("rappel_conso_new_recall", events.append)
+
+    requests = []
+
+    async def get(url, params, headers=None, extensions=None):
+        requests.append(params)
+        response = AsyncMock(spec=Response)
+        response.status_code = 200
+        response.headers = {}
+        response.raise_for_status = MagicMock()
+        if "group_by" in params:
+            results = [
+                {"month": "2021-06", "count": 2},
+                {"month": "2021-05", "count": 1},
+            ]
+            response.json.return_value = {"total_count": 2, "results": results}
+        else:
+            june = [backdated, MOCK_API_RESPONSE["results"][0]]
+            response.json.return_value = {"total_count": 2, "results": june}
+        return response
+
+    mock_httpx_client.get.side_effect = get
+    await coordinator.async_reconcile()
+    await hass.async_block_till_done()
+
+    # One aggregation, then one page for June; April only had to be removed
+    assert len(requests) == 2
+    assert requests[0]["group_by"].startswith("date_format(date_publication")
+    assert "date'2021-06-01'" in requests[1]["where"]
+    assert "date'2021-07-01'" in requests[1]["where"]
+
+    assert await coordinator.store.async_count_by_month() == {
+        "2021-06": 2,
+        "2021-05": 1,
+    }
+    assert [event.data["recall_id"] for event in events] == [823]
+    assert coordinator.data["total_count"] == 3
+    assert coordinator.reconciled_months == 2
+    assert coordinator.reconcile_removed == 1
+    assert coordinator.last_reconcile is not None
+    # The counts now match the dataset
+    assert coordinator.mirror_complete
+
+    # Nothing is due until the next interval
+    assert not coordinator.reconcile_due()
+
+
+async def test_batch_event_mode(
+    hass: HomeAssistant, mock_config_entry, mock_httpx_client
+):
+    """Test that the batch mode fires a single event per refresh."""
+    hass.config_entries.async_update_entry(
+        mock_config_entry, options={CONF_EVENT_MODE: EVENT_MODE_BATCH}
+    )
+    events = []
+    batches = []
+    hass.bus.async_listen("rappel_conso_new_recall", events.append)
+    hass.bus.async_listen("rappel_conso_new_recalls", batches.append)
+
+    assert await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert events == []
+    assert len(batches) == 1
+    assert batches[0].data["count"] == 1
+    assert batches[0].data["recalls"][0]["recall_id"] == 824
+    assert batches[0].data["recalls"][0]["brand"] == "carrefour sensation"
+
+
+async def test_digest_event_mode(
+    hass: HomeAssistant, mock_config_entry, mock_httpx_client
+):
+    """Test that the digest mode reports new recalls at the end of its window."""
+    hass.config_entries.async_update_entry(
+        mock_config_entry,
+        options={CONF_EVENT_MODE: EVENT_MODE_DIGEST, CONF_DIGEST_WINDOW: 30},
+    )
+    batches = []
+    hass.bus.async_listen("rappel_conso_new_recalls", batches.append)
+
+    assert await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    coordinator = hass.data[DOMAIN][mock_config_entry.entry_id]
+    assert batches == []
+    assert len(coordinator.digest) == 1
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(minutes=31))
+    await hass.async_block_till_done()
+
+    assert len(batches) == 1
+    assert batches[0].data["count"] == 1
+    assert batches[0].data["window_start"] < batches[0].data["window_end"]
+    assert len(coordinator.digest) == 0
+
+
+async def test_digest_flushed_on_unload(
+    hass: HomeAssistant, mock_config_entry, mock_httpx_client
+):
+    """Test that a pending digest is reported when the entry is unloaded."""
+    hass.config_entries.async_update_entry(
+        mock_config_entry, options={CONF_EVENT_MODE: EVENT_MODE_DIGEST}
+    )
+    batches = []
+    hass.bus.async_listen("rappel_conso_new_recalls", batches.append)
+
+    assert await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+    assert batches == []
+
+    assert await hass.config_entries.async_unload(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert len(batches) == 1
+    assert batches[0].data["recalls"][0]["recall_id"] == 824
+
+
+async def test_watchlist_match_event(
+    hass: HomeAssistant, mock_config_entry, mock_httpx_client
+):
+    """Test that new recalls matching a watchlist fire a match event."""
+    hass.config_entries.async_update_entry(
+        mock_config_entry,
+        options={
+            CONF_WATCHLISTS: [
+                {"name": "ice cream", "product_names": ["glace"]},
+                {"name": "lidl", "brands": ["lidl"]},
+            ]
+        },
+    )
+    events = []
+    hass.bus.async_listen("rappel_conso_watch_match", events.append)
+
+    assert await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert len(events) == 1
+    assert events[0].data["watchlist"] == "ice cream"
+    assert events[0].data["matched"] == ["product_names"]
+    assert events[0].data["recall_id"] == 824
+
+
 async def test_english_field_mapping(
     hass: HomeAssistant, mock_config_entry, mock_httpx_client
 ):
@@ -180,3 +545,377 @@ async def test_english_field_mapping(
     assert recall["category"] == "alimentation"
     assert recall["brand"] == "carrefour sensation"
     assert recall["sheet_number"] == "2021-06-0255"
+
+
+async def test_incremental_sync_uses_watermark(
+    hass: HomeAssistant, mock_config_entry, mock_httpx_client
+):
+    """Test that refreshes after the first one only ask for newer recalls."""
+    assert await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    coordinator = hass.data[DOMAIN][mock_config_entry.entry_id]
+    probe_misses = coordinator.probe_misses
+    mock_httpx_client.get.reset_mock()
+
+    # A recall published since the first refresh
+    new_recall = {
+        **MOCK_API_RESPONSE["results"][0],
+        "id": 825,
+        "numero_fiche": "2021-06-0256",
+        "rappel_guid": "b3c41f6a-5d0e-4c36-9a0e-3f1f0b2c7d11",
+        "date_publication": "2021-06-15T08:00:00+00:00",
+    }
+    response = mock_httpx_client.get.return_value
+    response.json.return_value = {"total_count": 16342, "results": [new_recall]}
+
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    # One probe, then one page of recalls newer than the watermark
+    assert mock_httpx_client.get.call_count == 2
+    probe_params = mock_httpx_client.get.call_args_list[0][1]["params"]
+    assert probe_params["limit"] == 1
+    assert probe_params["select"] == "id,rappel_guid"
+    params = mock_httpx_client.get.call_args_list[1][1]["params"]
+    assert params["where"] == "date_publication >= date'2021-06-14T10:24:15+00:00'"
+    # Polling only downloads the summary fields
+    assert "libelle" in params["select"].split(",")
+    assert "informations_complementaires" not in params["select"]
+
+    # The dataset size is carried forward from the previous sync
+    assert coordinator.data["total_count"] == 16342
+    assert coordinator.data["new_recalls_count"] == 1
+    assert [recall["id"] for recall in coordinator.data["recent_recalls"]] == [
+        825,
+        824,
+    ]
+    assert coordinator.probe_misses == probe_misses + 1
+
+
+async def test_probe_skips_unchanged_dataset(
+    hass: HomeAssistant, mock_config_entry, mock_httpx_client
+):
+    """Test that the change probe skips the sync when nothing was published."""
+    assert await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    coordinator = hass.data[DOMAIN][mock_config_entry.entry_id]
+    response = mock_httpx_client.get.return_value
+    response.headers = {"ETag": '"v1"'}
+
+    # First probe records the validators, the second one sends them back
+    await coordinator.async_refresh()
+    probe_hits = coordinator.probe_hits
+    mock_httpx_client.get.reset_mock()
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    assert mock_httpx_client.get.call_count == 1
+    assert mock_httpx_client.get.call_args[1]["headers"] == {"If-None-Match": '"v1"'}
+    assert coordinator.probe_hits == probe_hits + 1
+    assert coordinator.data["total_count"] == 16341
+    assert coordinator.data["new_recalls_count"] == 0
+    assert len(coordinator.data["recent_recalls"]) == 1
+
+    # A 304 answer counts as a hit too
+    response.status_code = 304
+    await coordinator.async_refresh()
+    assert mock_httpx_client.get.call_count == 2
+    assert coordinator.probe_hits == probe_hits + 2
+    assert coordinator.last_update_success
+
+
+async def test_api_outage_serves_stale_data(
+    hass: HomeAssistant, mock_config_entry, mock_httpx_client
+):
+    """Test that the last sync is kept while the API is down."""
+    assert await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = hass.data[DOMAIN][mock_config_entry.entry_id]
+    coordinator.api.limiter = TokenBucket(rate=100, capacity=10)
+
+    mock_httpx_client.get.side_effect = ConnectError("unreachable")
+    with patch("custom_components.rappel_conso.api.API_RETRY_BACKOFF", 0.001):
+        for _ in range(coordinator.api.breaker.failure_threshold):
+            await coordinator.async_refresh()
+
+    assert coordinator.last_update_success
+    assert coordinator.api.breaker.state == "open"
+    state = hass.states.get("sensor.rappel_conso")
+    assert state.state == "16341"
+    assert state.attributes["stale"] is True
+    assert state.attributes["data_age"] >= 0
+
+    # The open circuit fails the next poll without a request
+    mock_httpx_client.get.reset_mock()
+    await coordinator.async_refresh()
+    mock_httpx_client.get.assert_not_called()
+    assert coordinator.data["stale"] is True
+
+
+async def test_no_events_for_recalls_known_before_restart(
+    hass: HomeAssistant, mock_config_entry, mock_httpx_client, hass_storage
+):
+    """Test that recalls reported before a restart are not reported again."""
+    hass_storage[KNOWN_IDS_STORAGE_KEY] = {
+        "version": 1,
+        "key": KNOWN_IDS_STORAGE_KEY,
+        "data": {"floor": 0, "ids": [824]},
+    }
+    events = []
+    hass.bus.async_listen("rappel_conso_new_recall", events.append)
+
+    assert await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    coordinator = hass.data[DOMAIN][mock_config_entry.entry_id]
+    assert coordinator.data["new_recalls_count"] == 0
+    assert events == []
+
+
+async def test_setup_restores_last_sync(
+    hass: HomeAssistant, mock_config_entry, mock_httpx_client
+):
+    """Test that a later setup serves stored data without waiting for the API."""
+    assert await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+    last_update = hass.states.get("sensor.rappel_conso").attributes["last_update"]
+    assert await hass.config_entries.async_unload(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    # The API now hangs
+    api_called = asyncio.Event()
+
+    async def get(*args, **kwargs):
+        api_called.set()
+        await asyncio.Event().wait()
+
+    mock_httpx_client.get.side_effect = get
+
+    assert await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    assert mock_config_entry.state == ConfigEntryState.LOADED
+
+    state = hass.states.get("sensor.rappel_conso")
+    assert state.state == "16341"
+    assert state.attributes["last_update"] == last_update
+    assert state.attributes["recent_recalls"][0]["id"] == 824
+
+    # The refresh runs in the background
+    await asyncio.wait_for(api_called.wait(), 1)
+    assert await hass.config_entries.async_unload(mock_config_entry.entry_id)
+
+
+async def test_bootstrap_resumes_after_interruption(
+    hass: HomeAssistant, mock_config_entry, mock_httpx_client
+):
+    """Test that the mirror bootstrap streams the export and can resume."""
+    # Three older recalls complete the dataset
+    mock_httpx_client.get.return_value.json.return_value = {
+        **MOCK_API_RESPONSE,
+        "total_count": 4,
+    }
+    older = [
+        json.dumps({"id": recall_id, "date_publication": "2020-01-01T00:00:00+00:00"})
+        for recall_id in (10, 11, 12)
+    ]
+    mock_httpx_client.stream.side_effect = [
+        _export(older, error=ReadError("connection lost")),
+        _export(older[2:]),
+    ]
+    # Both runs share the API rate limit, keep it from delaying the second one
+    get_api(hass).limiter = TokenBucket(rate=100, capacity=10)
+
+    with patch("custom_components.rappel_conso.coordinator.BOOTSTRAP_BATCH_SIZE", 2):
+        assert await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        await hass.async_block_till_done()
+        coordinator = hass.data[DOMAIN][mock_config_entry.entry_id]
+
+        # The first batch was stored before the connection dropped
+        params = mock_httpx_client.stream.call_args[1]["params"]
+        assert params["where"] == "date_publication < date'2021-06-14T10:24:15+00:00'"
+        assert params["order_by"] == "id ASC"
+        assert await coordinator.store.async_count() == 3
+        assert coordinator.mirror_complete is False
+
+        # After a restart, the bootstrap resumes after the last stored ID
+        assert await hass.config_entries.async_unload(mock_config_entry.entry_id)
+        assert await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        await hass.async_block_till_done()
+        coordinator = hass.data[DOMAIN][mock_config_entry.entry_id]
+
+    params = mock_httpx_client.stream.call_args[1]["params"]
+    assert params["where"] == (
+        "date_publication < date'2021-06-14T10:24:15+00:00' AND id > 11"
+    )
+    assert await coordinator.store.async_count() == 4
+    assert coordinator.mirror_complete is True
+    assert mock_httpx_client.stream.call_count == 2
+
+
+async def test_websocket_snapshot_and_subscription(
+    hass: HomeAssistant, mock_config_entry, mock_httpx_client
+):
+    """Test the recall snapshot and change subscription commands."""
+    assert await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = hass.data[DOMAIN][mock_config_entry.entry_id]
+    connection = MagicMock(subscriptions={})
+
+    websocket_get_recalls(
+        hass,
+        connection,
+        {"id": 1, "type": "rappel_conso/recalls", "offset": 0, "limit": 10},
+    )
+    await hass.async_block_till_done()
+    msg_id, result = connection.send_result.call_args[0]
+    assert msg_id == 1
+    assert [recall["id"] for recall in result["recalls"]] == [824]
+    assert result["total"] == 1
+    assert result["next_offset"] is None
+
+    websocket_subscribe_recalls(
+        hass, connection, {"id": 2, "type": "rappel_conso/subscribe"}
+    )
+    assert 2 in connection.subscriptions
+
+    # A newer recall is published
+    newer = {
+        **MOCK_API_RESPONSE["results"][0],
+        "id": 900,
+        "date_publication": "2021-06-15T08:00:00+00:00",
+    }
+    mock_httpx_client.get.return_value.json.return_value = {
+        "total_count": 16342,
+        "results": [newer, MOCK_API_RESPONSE["results"][0]],
+    }
+    await coordinator.async_refresh()
+
+    event = connection.send_message.call_args[0][0]
+    assert event["id"] == 2
+    assert event["type"] == "event"
+    assert [recall["id"] for recall in event["event"]["added"]] == [900]
+    assert event["event"]["updated"] == []
+    assert event["event"]["removed"] == []
+
+    # Unsubscribing stops the events
+    connection.subscriptions.pop(2)()
+    connection.send_message.reset_mock()
+    mock_httpx_client.get.return_value.json.return_value = {
+        "total_count": 16343,
+        "results": [{**newer, "id": 901}, newer],
+    }
+    await coordinator.async_refresh()
+    connection.send_message.assert_not_called()
+
+
+async def test_diagnostics(hass: HomeAssistant, mock_config_entry, mock_httpx_client):
+    """Test the diagnostics report."""
+    assert await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    diagnostics = await async_get_config_entry_diagnostics(hass, mock_config_entry)
+
+    assert diagnostics["total_count"] == 16341
+    assert diagnostics["mirror"]["stored_recalls"] == 1
+    assert diagnostics["mirror"]["complete"] is False
+    assert diagnostics["mirror"]["watermark"] == "2021-06-14T10:24:15+00:00"
+    assert set(diagnostics["probe"]) == {"hits", "misses"}
+    assert diagnostics["search_cache"]["entries"] == 0
+    assert diagnostics["event_loop"]["last_poll_blocked_ms"] >= 0
+    assert diagnostics["api"]["requests"] >= 1
+    assert diagnostics["api"]["queue_depth"] == 0
+    assert diagnostics["reconciliation"]["months_refetched"] == 0
+    assert diagnostics["events"] == {
+        "mode": "recall",
+        "digest_pending": 0,
+        "updated_recalls": 0,
+    }
+    assert diagnostics["watchlists"] == {"count": 0, "matches": 0}
+    assert diagnostics["counters"] == {}
+
+
+async def test_catch_up_fetches_pages_concurrently(
+    hass: HomeAssistant, mock_config_entry, mock_httpx_client
+):
+    """Test that a large catch-up fetches pages in parallel and in order."""
+    assert await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = hass.data[DOMAIN][mock_config_entry.entry_id]
+
+    # 350 recalls were published while Home Assistant was down
+    published = [
+        {"id": 10_000 - index, "date_publication": "2021-07-01T00:00:00+00:00"}
+        for index in range(350)
+    ]
+    in_flight = 0
+    max_in_flight = 0
+
+    async def get(url, params, headers=None, extensions=None):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+
+        offset = params.get("offset", 0)
+        response = AsyncMock(spec=Response)
+        response.status_code = 200
+        response.headers = {}
+        response.raise_for_status = MagicMock()
+        response.json.return_value = {
+            "total_count": 16341 + 350 if params["limit"] == 1 else 351,
+            "results": published[offset : offset + params["limit"]],
+        }
+        return response
+
+    mock_httpx_client.get.side_effect = get
+    mock_httpx_client.get.reset_mock()
+    # Start with a full rate limit budget
+    coordinator.api.limiter = TokenBucket(rate=100, capacity=10)
+
+    await coordinator.async_refresh()
+
+    # Probe, first page, then the three remaining pages at once
+    assert mock_httpx_client.get.call_count == 5
+    assert max_in_flight == 3
+    assert coordinator.data["new_recalls_count"] == 350
+    assert coordinator.data["total_count"] == 16341 + 350
+    assert [recall["id"] for recall in coordinator.data["recent_recalls"]] == [
+        recall["id"] for recall in published[:50]
+    ]
+
+
+async def test_fetch_pages_skips_shifted_records(
+    hass: HomeAssistant, mock_config_entry, mock_httpx_client
+):
+    """Test that a recall published while paging does not repeat a record."""
+    assert await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = hass.data[DOMAIN][mock_config_entry.entry_id]
+
+    published = [
+        {"id": 10_000 - index, "date_publication": "2021-07-01T00:00:00+00:00"}
+        for index in range(150)
+    ]
+    newcomer = {"id": 20_000, "date_publication": "2021-07-02T00:00:00+00:00"}
+
+    async def get(url, params, headers=None, extensions=None):
+        offset = params.get("offset", 0)
+        # Published after the first page, shifting the next ones by one
+        records = published if offset == 0 else [newcomer, *published]
+        response = AsyncMock(spec=Response)
+        response.status_code = 200
+        response.headers = {}
+        response.raise_for_status = MagicMock()
+        response.json.return_value = {
+            "total_count": len(records),
+            "results": records[offset : offset + params["limit"]],
+        }
+        return response
+
+    mock_httpx_client.get.side_effect = get
+    fetched, _ = await coordinator._async_fetch_pages()
+
+    ids = [recall["id"] for recall in fetched]
+    assert len(ids) == len(set(ids)) == 150
@@ -0,0 +1,38 @@
+"""Tests for the persistent known recall IDs."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.rappel_conso.known_ids import STORAGE_KEY, KnownRecallIds
+
+
+async def test_eviction_keeps_older_ids_known(hass: HomeAssistant):
+    """Test that evicted IDs stay known through the eviction floor."""
+    known = KnownRecallIds(hass, maxsize=3, save_delay=0)
+    known.add([5, 1, 2])
+    known.add([3, 4])
+
+    assert len(known) == 3
+    # 1 and 2 were evicted, but are below the largest evicted ID
+    assert known.unknown([1, 2, 3, 4, 5, 6]) == {6}
+
+
+async def test_saved_and_restored(hass: HomeAssistant, hass_storage: dict[str, Any]):
+    """Test that known IDs are saved with a delay and restored on load."""
+    known = KnownRecallIds(hass, maxsize=2, save_delay=10)
+    known.add([10, 11, 12])
+    assert STORAGE_KEY not in hass_storage
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=11))
+    await hass.async_block_till_done()
+    assert hass_storage[STORAGE_KEY]["data"] == {"floor": 10, "ids": [11, 12]}
+
+    restored = KnownRecallIds(hass, maxsize=2, save_delay=10)
+    await restored.async_load()
+    assert restored.unknown([9, 10, 11, 12, 13]) == {13}
@@ -0,0 +1,56 @@
+"""Tests for the Rappel Conso data models."""
+
+from __future__ import annotations
+
+import pytest
+
+from custom_components.rappel_conso.models import (
+    FIELD_MAPPING,
+    APIResponse,
+    RecallData,
+    RecallPage,
+    decode_recall,
+)
+
+RECORD = {
+    "id": 824,
+    "numero_fiche": "2021-06-0255",
+    "numero_version": 1,
+    "libelle": "glace cookie dough",
+    "categorie_produit": "alimentation",
+    "marque_produit": "carrefour sensation",
+    "identification_produits": ["3017620422003 Lot 12345"],
+    "date_publication": "2021-06-14T10:24:15+00:00",
+    "motif_rappel": None,
+    "champ_inconnu": "kept as is",
+}
+
+
+def test_decode_recall_matches_model():
+    """Test that the fast decoder gives the same result as the model."""
+    decoded = decode_recall(RECORD)
+
+    assert decoded == RecallData(**RECORD).to_english_dict()
+    assert decoded["product_name"] == "glace cookie dough"
+    assert decoded["product_identification"] == ["3017620422003 Lot 12345"]
+    assert "recall_reason" not in decoded
+    assert decoded["champ_inconnu"] == "kept as is"
+
+
+def test_every_model_field_is_mapped():
+    """Test that every French field of the model has an English name."""
+    assert set(RecallData.model_fields) - {"id"} == set(FIELD_MAPPING)
+
+
+def test_recall_page():
+    """Test decoding a whole API response."""
+    data = {"total_count": 16341, "results": [RECORD, {"id": 825}]}
+
+    page = RecallPage.from_json(data)
+
+    assert page.total_count == 16341
+    assert page.get_recall_ids() == APIResponse(**data).get_recall_ids()
+    assert page.results[1] == {"id": 825}
+
+    with pytest.raises(ValueError, match="without id"):
+        decode_recall({"libelle": "no id"})
@@ -0,0 +1,40 @@
+"""Tests for the API rate limiter."""
+
+from __future__ import annotations
+
+import time
+
+import pytest
+
+from custom_components.rappel_conso.ratelimit import TokenBucket
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_token_bucket_allows_burst_then_throttles():
+    """Test that requests beyond the burst wait for new tokens."""
+    bucket = TokenBucket(rate=50, capacity=3)
+
+    start = time.monotonic()
+    for _ in range(3):
+        await bucket.acquire()
+    assert time.monotonic() - start < 0.02
+
+    for _ in range(2):
+        await bucket.acquire()
+    # Two more tokens at 50 per second take about 40 ms
+    assert time.monotonic() - start >= 0.035
+    assert bucket.throttled == 2
+    assert bucket.waiting == 0
+
+
+async def test_token_bucket_pause_holds_requests():
+    """Test that a pause delays requests even with tokens left."""
+    bucket = TokenBucket(rate=50, capacity=3)
+
+    bucket.pause(0.05)
+    start = time.monotonic()
+    await bucket.acquire()
+
+    assert time.monotonic() - start >= 0.045
+    assert bucket.throttled == 1
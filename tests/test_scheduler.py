@@ -0,0 +1,82 @@
+"""Tests for the adaptive polling scheduler."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+from homeassistant.util import dt as dt_util
+
+from custom_components.rappel_conso.scheduler import AdaptiveScheduler
+
+PARIS = dt_util.get_time_zone("Europe/Paris")
+# A Tuesday
+TUESDAY = datetime(2024, 3, 5, tzinfo=PARIS)
+
+
+def _scheduler() -> AdaptiveScheduler:
+    """Return a scheduler that learned publications on Tuesday mornings."""
+    scheduler = AdaptiveScheduler(
+        min_interval=timedelta(minutes=15),
+        max_interval=timedelta(hours=6),
+        default_interval=timedelta(hours=1),
+    )
+    scheduler.observe(
+        (
+            TUESDAY - timedelta(weeks=week) + timedelta(hours=10, minutes=week)
+        ).isoformat()
+        for week in range(60)
+    )
+    return scheduler
+
+
+def test_default_interval_until_cadence_is_known():
+    """Test that the default interval is used with too few publications."""
+    scheduler = AdaptiveScheduler(
+        min_interval=timedelta(minutes=15),
+        max_interval=timedelta(minutes=30),
+        default_interval=timedelta(hours=1),
+    )
+    scheduler.observe([TUESDAY.isoformat(), None])
+
+    assert scheduler.observations == 1
+    # Clamped to the maximum interval
+    assert scheduler.next_interval(TUESDAY, found_new=False) == timedelta(minutes=30)
+
+
+def test_active_window_polls_often():
+    """Test that the minimum interval is used when recalls are published."""
+    scheduler = _scheduler()
+
+    now = TUESDAY + timedelta(hours=10, minutes=30)
+    assert scheduler.next_interval(now, found_new=False) == timedelta(minutes=15)
+
+
+def test_quiet_window_backs_off():
+    """Test exponential back-off at quiet times, up to the maximum interval."""
+    scheduler = _scheduler()
+    saturday_night = TUESDAY + timedelta(days=4, hours=3)
+
+    intervals = [
+        scheduler.next_interval(saturday_night, found_new=False) for _ in range(4)
+    ]
+
+    assert intervals == [
+        timedelta(hours=2),
+        timedelta(hours=4),
+        timedelta(hours=6),
+        timedelta(hours=6),
+    ]
+    # New recalls reset the back-off
+    assert scheduler.next_interval(saturday_night, found_new=True) == timedelta(
+        minutes=15
+    )
+
+
+def test_back_off_stops_at_next_active_window():
+    """Test that polling resumes when the next active window starts."""
+    scheduler = _scheduler()
+
+    early_morning = TUESDAY + timedelta(hours=8, minutes=30)
+    assert scheduler.next_interval(early_morning, found_new=False) == timedelta(
+        hours=1, minutes=30
+    )
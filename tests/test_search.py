@@ -0,0 +1,71 @@
+"""Tests for search criteria and batch query planning."""
+
+from __future__ import annotations
+
+from custom_components.rappel_conso.search import SearchCriteria, plan_batch
+
+
+def test_normalized_criteria():
+    """Test that equivalent criteria normalize to the same value."""
+    first = SearchCriteria.from_lists(brands=["Lidl", "carrefour "], categories=["B"])
+    second = SearchCriteria.from_lists(
+        brands=["carrefour", "LIDL", "lidl"], categories=["B"]
+    )
+
+    assert first.normalized() == second.normalized()
+    assert first.normalized().brands == ("carrefour", "lidl")
+    # Categories are exact matches and keep their case
+    assert SearchCriteria.from_lists(categories=["B"]).normalized().categories == ("B",)
+
+
+def test_matches():
+    """Test matching a recall with the same semantics as the API search."""
+    recall = {
+        "product_name": "Glace Cookie Dough",
+        "brand": "carrefour sensation",
+        "category": "alimentation",
+        "subcategory": "glaces",
+        "recall_reason": "listeria",
+    }
+
+    assert SearchCriteria.from_lists(product_names=["cookie"]).matches(recall)
+    assert SearchCriteria.from_lists(
+        brands=["lidl", "CARREFOUR"], categories=["alimentation"]
+    ).matches(recall)
+    assert SearchCriteria.from_lists(keywords=["listeria"]).matches(recall)
+    assert not SearchCriteria.from_lists(
+        product_names=["cookie"], brands=["lidl"]
+    ).matches(recall)
+    assert not SearchCriteria.from_lists(categories=["alim"]).matches(recall)
+
+
+def test_plan_batch_merges_terms():
+    """Test that batch queries share conditions and requests."""
+    queries = [
+        SearchCriteria.from_lists(brands=["lidl"]),
+        SearchCriteria.from_lists(brands=["lidl plus"]),
+        # Product names are preferred over categories to pre-select recalls
+        SearchCriteria.from_lists(
+            product_names=["cookie"], categories=["alimentation"]
+        ),
+        SearchCriteria.from_lists(brands=["lidl"]),
+    ]
+
+    plans = plan_batch(queries, max_conditions=10)
+
+    assert len(plans) == 1
+    where, covered = plans[0]
+    assert where == "libelle like '%cookie%' OR marque_produit like '%lidl%'"
+    assert covered == queries[:3]
+
+
+def test_plan_batch_splits_requests():
+    """Test that large batches are split on the number of conditions."""
+    queries = [SearchCriteria.from_lists(brands=[f"brand {i}"]) for i in range(5)]
+    queries.append(SearchCriteria.from_lists(keywords=["frozen"]))
+
+    plans = plan_batch(queries, max_conditions=4)
+
+    assert [len(covered) for _, covered in plans] == [4, 1, 1]
+    # A keyword is searched in four fields
+    assert plans[2][0].count(" like ") == 4
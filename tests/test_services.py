@@ -1,22 +1,31 @@
 """Tests for Rappel Conso service actions."""
 
-from unittest.mock import AsyncMock, patch
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import ServiceValidationError
-from httpx import Response
+from httpx import ConnectError, Response
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 
 from custom_components.rappel_conso.const import (
+    ATTR_BARCODES,
     ATTR_BRANDS,
     ATTR_CATEGORIES,
+    ATTR_GROUP_BY,
     ATTR_KEYWORDS,
     ATTR_LIMIT,
     ATTR_PRODUCT_NAMES,
+    ATTR_QUERIES,
     DOMAIN,
+    SERVICE_CHECK_BARCODE,
+    SERVICE_GET_RECENT_RECALLS,
+    SERVICE_RECALL_STATISTICS,
     SERVICE_SEARCH_RECALLS,
+    SERVICE_SEARCH_RECALLS_BATCH,
 )
 
 
@@ -32,12 +41,13 @@ async def init_integration(hass: HomeAssistant) -> ConfigEntry:
 
     # Mock httpx client like in test_init.py
     with patch(
-        "custom_components.rappel_conso.coordinator.httpx.AsyncClient"
+        "custom_components.rappel_conso.api.create_async_httpx_client"
     ) as mock_client_class:
         client = AsyncMock()
         response = AsyncMock(spec=Response)
+        # Only part of the dataset gets mirrored, so searches use the API
         response.json.return_value = {
-            "total_count": 1,
+            "total_count": 16341,
             "results": [
                 {
                     "id": 824,
@@ -51,11 +61,18 @@ async def init_integration(hass: HomeAssistant) -> ConfigEntry:
                     "motif_rappel": "test",
                     "risques_encourus": "test risks",
                     "lien_vers_la_fiche_rappel": "https://example.com",
+                    "identification_produits": [
+                        "3017620422003 Lot 12345 Date limite 01/07/2021"
+                    ],
                 }
             ],
         }
         response.raise_for_status = AsyncMock()
+        response.status_code = 200
+        response.headers = {}
         client.get.return_value = response
+        # The export endpoint is unreachable, so the mirror stays incomplete
+        client.stream = MagicMock(side_effect=ConnectError("export unavailable"))
         client.aclose = AsyncMock()
         mock_client_class.return_value = client
 
@@ -90,8 +107,9 @@ async def test_search_by_product_names(hass: HomeAssistant, init_integration):
     }
 
     # Get the client and patch its get method
-    client = await coordinator._get_client()
+    client = coordinator.api.client
     response = AsyncMock(spec=Response)
+    response.status_code = 200
     response.json.return_value = search_response
     response.raise_for_status = AsyncMock()
 
@@ -116,8 +134,9 @@ async def test_search_by_brands(hass: HomeAssistant, init_integration):
 
     search_response = {"total_count": 0, "results": []}
 
-    client = await coordinator._get_client()
+    client = coordinator.api.client
     response = AsyncMock(spec=Response)
+    response.status_code = 200
     response.json.return_value = search_response
     response.raise_for_status = AsyncMock()
 
@@ -140,8 +159,9 @@ async def test_search_by_categories(hass: HomeAssistant, init_integration):
 
     search_response = {"total_count": 0, "results": []}
 
-    client = await coordinator._get_client()
+    client = coordinator.api.client
     response = AsyncMock(spec=Response)
+    response.status_code = 200
     response.json.return_value = search_response
     response.raise_for_status = AsyncMock()
 
@@ -164,8 +184,9 @@ async def test_search_by_keywords(hass: HomeAssistant, init_integration):
 
     search_response = {"total_count": 0, "results": []}
 
-    client = await coordinator._get_client()
+    client = coordinator.api.client
     response = AsyncMock(spec=Response)
+    response.status_code = 200
     response.json.return_value = search_response
     response.raise_for_status = AsyncMock()
 
@@ -188,8 +209,9 @@ async def test_search_multiple_criteria(hass: HomeAssistant, init_integration):
 
     search_response = {"total_count": 0, "results": []}
 
-    client = await coordinator._get_client()
+    client = coordinator.api.client
     response = AsyncMock(spec=Response)
+    response.status_code = 200
     response.json.return_value = search_response
     response.raise_for_status = AsyncMock()
 
@@ -281,8 +303,9 @@ async def test_search_response_format(hass: HomeAssistant, init_integration):
         ],
     }
 
-    client = await coordinator._get_client()
+    client = coordinator.api.client
     response = AsyncMock(spec=Response)
+    response.status_code = 200
     response.json.return_value = search_response
     response.raise_for_status = AsyncMock()
 
@@ -319,3 +342,533 @@ async def test_search_response_format(hass: HomeAssistant, init_integration):
     assert "categorie_produit" not in recall
     assert "marque_produit" not in recall
     assert "numero_fiche" not in recall
+
+
+def _details_response() -> AsyncMock:
+    """Return an API response with the full record of recall 824."""
+    response = AsyncMock(spec=Response)
+    response.status_code = 200
+    response.json.return_value = {
+        "total_count": 1,
+        "results": [
+            {
+                "id": 824,
+                "libelle": "glace cookie dough",
+                "categorie_produit": "alimentation",
+                "marque_produit": "carrefour sensation",
+                "numero_version": 1,
+                "motif_rappel": "test",
+                "identification_produits": ["3017620422003 Lot 12345"],
+                "informations_complementaires": "details fetched on demand",
+            }
+        ],
+    }
+    response.raise_for_status = AsyncMock()
+    return response
+
+
+async def test_get_recent_recalls(hass: HomeAssistant, init_integration):
+    """Test that the recent recalls are returned with all their fields."""
+    coordinator = hass.data[DOMAIN][init_integration.entry_id]
+
+    client = coordinator.api.client
+    with patch.object(client, "get", return_value=_details_response()) as mock_get:
+        response_data = await hass.services.async_call(
+            DOMAIN,
+            SERVICE_GET_RECENT_RECALLS,
+            {ATTR_LIMIT: 5},
+            blocking=True,
+            return_response=True,
+        )
+
+    # Polled summaries are completed once, then served from the store
+    mock_get.assert_called_once()
+    assert response_data["count"] == 1
+    recall = response_data["recalls"][0]
+    assert recall["id"] == 824
+    assert recall["additional_information"] == "details fetched on demand"
+
+
+async def test_recall_statistics_api(hass: HomeAssistant, init_integration):
+    """Test that statistics are counted by the API and cached."""
+    coordinator = hass.data[DOMAIN][init_integration.entry_id]
+
+    response = AsyncMock(spec=Response)
+    response.status_code = 200
+    response.json.return_value = {
+        "results": [
+            {"value": "alimentation", "count": 9817},
+            {"value": "cosmetique", "count": 412},
+        ]
+    }
+    response.raise_for_status = AsyncMock()
+    client = coordinator.api.client
+    with patch.object(client, "get", return_value=response) as mock_get:
+        for _ in range(2):
+            result = await hass.services.async_call(
+                DOMAIN,
+                SERVICE_RECALL_STATISTICS,
+                {ATTR_GROUP_BY: "category", ATTR_KEYWORDS: ["Listeria"]},
+                blocking=True,
+                return_response=True,
+            )
+
+    mock_get.assert_called_once()
+    params = mock_get.call_args[1]["params"]
+    assert params["group_by"] == "categorie_produit as value"
+    assert params["select"] == "count(*) as count"
+    assert "listeria" in params["where"]
+    assert result == {
+        "group_by": "category",
+        "groups": [
+            {"value": "alimentation", "count": 9817},
+            {"value": "cosmetique", "count": 412},
+        ],
+        "count": 2,
+    }
+
+
+async def test_recall_statistics_local_mirror(hass: HomeAssistant, init_integration):
+    """Test that statistics are counted locally once the mirror is complete."""
+    coordinator = hass.data[DOMAIN][init_integration.entry_id]
+    coordinator.mirror_complete = True
+    await coordinator.store.async_upsert(
+        [
+            {
+                "id": 825,
+                "product_name": "Crème solaire",
+                "category": "hygiene-beaute",
+                "brand": "Soleil",
+                "publication_date": "2021-05-03T08:00:00+00:00",
+            }
+        ],
+        detailed=False,
+    )
+
+    client = coordinator.api.client
+    with patch.object(client, "get") as mock_get:
+        by_month = await hass.services.async_call(
+            DOMAIN,
+            SERVICE_RECALL_STATISTICS,
+            {ATTR_GROUP_BY: "month"},
+            blocking=True,
+            return_response=True,
+        )
+        by_brand = await hass.services.async_call(
+            DOMAIN,
+            SERVICE_RECALL_STATISTICS,
+            {ATTR_GROUP_BY: "brand", ATTR_CATEGORIES: ["alimentation"]},
+            blocking=True,
+            return_response=True,
+        )
+
+    mock_get.assert_not_called()
+    assert by_month["groups"] == [
+        {"value": "2021-06", "count": 1},
+        {"value": "2021-05", "count": 1},
+    ]
+    assert by_brand["groups"] == [{"value": "carrefour sensation", "count": 1}]
+
+
+async def test_search_local_mirror(hass: HomeAssistant, init_integration):
+    """Test that searches are answered locally once the mirror is complete."""
+    coordinator = hass.data[DOMAIN][init_integration.entry_id]
+    coordinator.mirror_complete = True
+
+    client = coordinator.api.client
+    with patch.object(client, "get", return_value=_details_response()) as mock_get:
+        by_name = await hass.services.async_call(
+            DOMAIN,
+            SERVICE_SEARCH_RECALLS,
+            {ATTR_PRODUCT_NAMES: ["COOKIE"]},
+            blocking=True,
+            return_response=True,
+        )
+        by_short_keyword = await hass.services.async_call(
+            DOMAIN,
+            SERVICE_SEARCH_RECALLS,
+            {ATTR_KEYWORDS: ["te"], ATTR_CATEGORIES: ["alimentation"]},
+            blocking=True,
+            return_response=True,
+        )
+        by_brand = await hass.services.async_call(
+            DOMAIN,
+            SERVICE_SEARCH_RECALLS,
+            {ATTR_PRODUCT_NAMES: ["cookie"], ATTR_BRANDS: ["lidl"]},
+            blocking=True,
+            return_response=True,
+        )
+        by_category = await hass.services.async_call(
+            DOMAIN,
+            SERVICE_SEARCH_RECALLS,
+            {ATTR_CATEGORIES: ["alim"]},
+            blocking=True,
+            return_response=True,
+        )
+
+    # Only the polled summary was stored: details are fetched once, by id
+    mock_get.assert_called_once()
+    assert mock_get.call_args[1]["params"]["where"] == "id=824"
+
+    assert by_name["count"] == 1
+    assert by_name["recalls"][0]["additional_information"] == (
+        "details fetched on demand"
+    )
+    assert by_name["recalls"][0]["product_name"] == "glace cookie dough"
+    assert by_name["recalls"][0]["brand"] == "carrefour sensation"
+    assert "libelle" not in by_name["recalls"][0]
+
+    # Short terms fall back to a LIKE scan with the same semantics
+    assert by_short_keyword["count"] == 1
+
+    assert by_brand["count"] == 0
+    # Categories are exact matches
+    assert by_category["count"] == 0
+
+
+async def test_search_large_response_decoded_in_executor(
+    hass: HomeAssistant, init_integration
+):
+    """Test that large responses are decoded off the event loop."""
+    coordinator = hass.data[DOMAIN][init_integration.entry_id]
+    results = [
+        {"id": recall_id, "libelle": "glace cookie dough " * 5}
+        for recall_id in range(1000)
+    ]
+
+    client = coordinator.api.client
+    response = AsyncMock(spec=Response)
+    response.status_code = 200
+    response.content = json.dumps({"total_count": 1000, "results": results}).encode()
+    response.raise_for_status = AsyncMock()
+
+    with patch.object(client, "get", return_value=response):
+        recalls = await coordinator.async_search_recalls(
+            product_names=["cookie"], limit=1000
+        )
+
+    assert coordinator.executor_decodes == 1
+    response.json.assert_not_called()
+    assert len(recalls) == 1000
+    assert recalls[0] == {"id": 0, "product_name": "glace cookie dough " * 5}
+
+
+async def test_search_cached_and_coalesced(hass: HomeAssistant, init_integration):
+    """Test that identical searches share one API request until new recalls."""
+    coordinator = hass.data[DOMAIN][init_integration.entry_id]
+
+    client = coordinator.api.client
+    response = AsyncMock(spec=Response)
+    response.status_code = 200
+    response.json.return_value = {"total_count": 0, "results": []}
+    response.raise_for_status = AsyncMock()
+
+    async def get(*args, **kwargs):
+        await asyncio.sleep(0.01)
+        return response
+
+    with patch.object(client, "get", side_effect=get) as mock_get:
+        # Same search, differently cased and ordered, issued concurrently
+        await asyncio.gather(
+            coordinator.async_search_recalls(brands=["Lidl", "carrefour"]),
+            coordinator.async_search_recalls(brands=["carrefour", "lidl", "LIDL"]),
+        )
+        assert mock_get.call_count == 1
+        assert coordinator.search_cache.coalesced == 1
+
+        await coordinator.async_search_recalls(brands=["lidl", "carrefour"])
+        assert mock_get.call_count == 1
+        assert coordinator.search_cache.hits == 1
+
+        # A different limit is a different search
+        await coordinator.async_search_recalls(brands=["lidl", "carrefour"], limit=5)
+        assert mock_get.call_count == 2
+
+        coordinator.search_cache.clear()
+        await coordinator.async_search_recalls(brands=["lidl", "carrefour"])
+        assert mock_get.call_count == 3
+
+
+async def test_complete_mirror_search_without_api(
+    hass: HomeAssistant, init_integration
+):
+    """Test that the complete mirror answers searches while the API is down."""
+    coordinator = hass.data[DOMAIN][init_integration.entry_id]
+    coordinator.mirror_complete = True
+
+    client = coordinator.api.client
+    with patch.object(client, "get", side_effect=ConnectError("down")):
+        search = await hass.services.async_call(
+            DOMAIN,
+            SERVICE_SEARCH_RECALLS,
+            {ATTR_BRANDS: ["carrefour"]},
+            blocking=True,
+            return_response=True,
+        )
+        batch = await hass.services.async_call(
+            DOMAIN,
+            SERVICE_SEARCH_RECALLS_BATCH,
+            {ATTR_QUERIES: [{"name": "carrefour", ATTR_BRANDS: ["carrefour"]}]},
+            blocking=True,
+            return_response=True,
+        )
+
+    # The stored summaries are returned without their details
+    assert [recall["id"] for recall in search["recalls"]] == [824]
+    assert [recall["id"] for recall in batch["queries"]["carrefour"]["recalls"]] == [
+        824
+    ]
+
+
+async def test_search_falls_back_to_local_data(hass: HomeAssistant, init_integration):
+    """Test that searches use the stored recalls while the API is down."""
+    coordinator = hass.data[DOMAIN][init_integration.entry_id]
+    assert coordinator.mirror_complete is False
+
+    # Failed requests in a row open the circuit breaker
+    for _ in range(coordinator.api.breaker.failure_threshold):
+        coordinator.api.breaker.record_failure()
+
+    client = coordinator.api.client
+    with patch.object(client, "get") as mock_get:
+        search = await hass.services.async_call(
+            DOMAIN,
+            SERVICE_SEARCH_RECALLS,
+            {ATTR_BRANDS: ["carrefour"]},
+            blocking=True,
+            return_response=True,
+        )
+        barcodes = await hass.services.async_call(
+            DOMAIN,
+            SERVICE_CHECK_BARCODE,
+            {ATTR_BARCODES: ["3017620422003"]},
+            blocking=True,
+            return_response=True,
+        )
+
+    mock_get.assert_not_called()
+    assert [recall["id"] for recall in search["recalls"]] == [824]
+    assert [recall["id"] for recall in barcodes["barcodes"][0]["recalls"]] == [824]
+    assert coordinator.api.breaker.rejected >= 2
+
+
+async def test_search_batch(hass: HomeAssistant, init_integration):
+    """Test that batch queries share API requests and are answered per query."""
+    coordinator = hass.data[DOMAIN][init_integration.entry_id]
+
+    superset = AsyncMock(spec=Response)
+    superset.status_code = 200
+    superset.json.return_value = {
+        "total_count": 2,
+        "results": [
+            {"id": 900, "libelle": "pâtes", "marque_produit": "lidl"},
+            {"id": 824, "libelle": "glace cookie dough", "marque_produit": "carrefour"},
+        ],
+    }
+    superset.raise_for_status = AsyncMock()
+    details = AsyncMock(spec=Response)
+    details.status_code = 200
+    details.json.return_value = {
+        "total_count": 2,
+        "results": [
+            {"id": 900, "libelle": "pâtes", "marque_produit": "lidl"},
+            {"id": 824, "libelle": "glace cookie dough", "marque_produit": "carrefour"},
+        ],
+    }
+    details.raise_for_status = AsyncMock()
+
+    def get(url, params, headers=None, extensions=None, timeout=None):
+        return superset if "select" in params else details
+
+    client = coordinator.api.client
+    with patch.object(client, "get", side_effect=get) as mock_get:
+        response_data = await hass.services.async_call(
+            DOMAIN,
+            SERVICE_SEARCH_RECALLS_BATCH,
+            {
+                ATTR_QUERIES: [
+                    {"name": "cookies", ATTR_PRODUCT_NAMES: ["Cookie"]},
+                    {"name": "lidl", ATTR_BRANDS: ["lidl"]},
+                    {
+                        "name": "lidl pasta",
+                        ATTR_BRANDS: ["LIDL"],
+                        ATTR_KEYWORDS: ["pâte"],
+                    },
+                    {"name": "nothing", ATTR_BRANDS: ["lidl"], ATTR_CATEGORIES: ["x"]},
+                ]
+            },
+            blocking=True,
+            return_response=True,
+        )
+
+    # One request selects every candidate, one fetches the matched records
+    assert mock_get.call_count == 2
+    where = mock_get.call_args_list[0][1]["params"]["where"]
+    assert where == "libelle like '%cookie%' OR marque_produit like '%lidl%'"
+    assert mock_get.call_args_list[1][1]["params"]["where"] == "id=824 OR id=900"
+
+    queries = response_data["queries"]
+    assert [recall["id"] for recall in queries["cookies"]["recalls"]] == [824]
+    assert queries["lidl"]["count"] == 1
+    assert queries["lidl pasta"]["recalls"] == queries["lidl"]["recalls"]
+    assert queries["nothing"]["count"] == 0
+    assert response_data["recall_count"] == 2
+
+
+async def test_search_batch_keeps_sync_watermark(hass: HomeAssistant, init_integration):
+    """Test that batch results newer than the last sync are not mirrored."""
+    coordinator = hass.data[DOMAIN][init_integration.entry_id]
+    newer = {
+        "id": 900,
+        "libelle": "pâtes",
+        "marque_produit": "lidl",
+        "date_publication": "2021-06-20T08:00:00+00:00",
+    }
+
+    def get(url, params, headers=None, extensions=None, timeout=None):
+        response = AsyncMock(spec=Response)
+        response.status_code = 200
+        response.json.return_value = {"total_count": 1, "results": [newer]}
+        response.raise_for_status = AsyncMock()
+        return response
+
+    client = coordinator.api.client
+    with patch.object(client, "get", side_effect=get):
+        response_data = await hass.services.async_call(
+            DOMAIN,
+            SERVICE_SEARCH_RECALLS_BATCH,
+            {ATTR_QUERIES: [{"name": "lidl", ATTR_BRANDS: ["lidl"]}]},
+            blocking=True,
+            return_response=True,
+        )
+
+    assert response_data["queries"]["lidl"]["count"] == 1
+    # The next poll still asks for everything published since the last sync
+    assert await coordinator.store.async_get_watermark() == (
+        "2021-06-14T10:24:15+00:00"
+    )
+    assert await coordinator.store.async_get_many([900]) == []
+
+
+async def test_search_batch_local_mirror(hass: HomeAssistant, init_integration):
+    """Test that batch queries are answered from the local mirror."""
+    coordinator = hass.data[DOMAIN][init_integration.entry_id]
+    coordinator.mirror_complete = True
+
+    client = coordinator.api.client
+    with patch.object(client, "get", return_value=_details_response()) as mock_get:
+        response_data = await hass.services.async_call(
+            DOMAIN,
+            SERVICE_SEARCH_RECALLS_BATCH,
+            {
+                ATTR_QUERIES: [
+                    {"name": "cookies", ATTR_PRODUCT_NAMES: ["cookie"]},
+                    {"name": "carrefour", ATTR_BRANDS: ["Carrefour"]},
+                    {"name": "lidl", ATTR_BRANDS: ["lidl"]},
+                ]
+            },
+            blocking=True,
+            return_response=True,
+        )
+
+    # The recall matched by two queries is completed once
+    mock_get.assert_called_once()
+    queries = response_data["queries"]
+    assert queries["cookies"]["recalls"][0]["additional_information"] == (
+        "details fetched on demand"
+    )
+    assert queries["carrefour"]["count"] == 1
+    assert queries["lidl"]["count"] == 0
+
+
+async def test_search_batch_invalid_queries(hass: HomeAssistant, init_integration):
+    """Test batch query validation."""
+    with pytest.raises(ServiceValidationError) as exc_info:
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_SEARCH_RECALLS_BATCH,
+            {ATTR_QUERIES: [{"name": "a", ATTR_BRANDS: ["x"]}, {"name": "a"}]},
+            blocking=True,
+            return_response=True,
+        )
+    assert exc_info.value.translation_key == "duplicate_query_name"
+
+    with pytest.raises(ServiceValidationError) as exc_info:
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_SEARCH_RECALLS_BATCH,
+            {ATTR_QUERIES: [{"name": "empty"}]},
+            blocking=True,
+            return_response=True,
+        )
+    assert exc_info.value.translation_key == "query_without_criteria"
+
+
+async def test_check_barcode_local(hass: HomeAssistant, init_integration):
+    """Test barcode lookups against the local GTIN index."""
+    coordinator = hass.data[DOMAIN][init_integration.entry_id]
+    coordinator.mirror_complete = True
+
+    client = coordinator.api.client
+    with patch.object(client, "get", return_value=_details_response()) as mock_get:
+        response_data = await hass.services.async_call(
+            DOMAIN,
+            SERVICE_CHECK_BARCODE,
+            {ATTR_BARCODES: ["3017620422003", "5449000000996", "123"]},
+            blocking=True,
+            return_response=True,
+        )
+
+    # The index answers locally; the API only completes the matched recall
+    mock_get.assert_called_once()
+
+    assert response_data["recalled_count"] == 1
+    recalled, clean, invalid = response_data["barcodes"]
+    assert recalled["barcode"] == "3017620422003"
+    assert recalled["recalled"] is True
+    assert recalled["recalls"][0]["product_name"] == "glace cookie dough"
+    assert clean == {
+        "barcode": "5449000000996",
+        "valid": True,
+        "recalled": False,
+        "recalls": [],
+    }
+    assert invalid["valid"] is False
+    assert invalid["recalled"] is False
+
+
+async def test_check_barcode_api_fallback(hass: HomeAssistant, init_integration):
+    """Test barcode lookups through the API while the mirror is incomplete."""
+    coordinator = hass.data[DOMAIN][init_integration.entry_id]
+
+    search_response = {
+        "total_count": 1,
+        "results": [
+            {
+                "id": 900,
+                "libelle": "pâte à tartiner",
+                "identification_produits": ["3017620422003 Lot A12"],
+            }
+        ],
+    }
+
+    client = coordinator.api.client
+    response = AsyncMock(spec=Response)
+    response.status_code = 200
+    response.json.return_value = search_response
+    response.raise_for_status = AsyncMock()
+
+    with patch.object(client, "get", return_value=response) as mock_get:
+        response_data = await hass.services.async_call(
+            DOMAIN,
+            SERVICE_CHECK_BARCODE,
+            {ATTR_BARCODES: "3017620422003"},
+            blocking=True,
+            return_response=True,
+        )
+
+    assert mock_get.call_args[1]["params"]["where"] == (
+        "identification_produits like '%3017620422003%'"
+    )
+    assert response_data["recalled_count"] == 1
+    assert response_data["barcodes"][0]["recalls"][0]["id"] == 900
@@ -0,0 +1,218 @@
+"""Tests for the local recall store."""
+
+from __future__ import annotations
+
+import pytest
+from homeassistant.core import HomeAssistant
+
+from custom_components.rappel_conso.search import SearchCriteria
+from custom_components.rappel_conso.store import META_INDEX_VERSION, RecallStore
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.fixture
+async def store(hass: HomeAssistant, tmp_path):
+    """Return an open recall store."""
+    recall_store = RecallStore(hass, str(tmp_path / "recalls.db"))
+    await recall_store.async_open()
+    yield recall_store
+    await recall_store.async_close()
+
+
+async def test_upsert_returns_new_ids(store: RecallStore):
+    """Test that only previously unknown recalls are reported as new."""
+    first = [
+        {"id": 1, "publication_date": "2024-01-01T00:00:00+00:00"},
+        {"id": 2, "publication_date": "2024-01-02T00:00:00+00:00"},
+    ]
+    assert await store.async_upsert(first) == {1, 2}
+
+    second = [
+        {"id": 2, "publication_date": "2024-01-02T00:00:00+00:00", "brand": "x"},
+        {"id": 3, "publication_date": "2024-01-03T00:00:00+00:00"},
+    ]
+    assert await store.async_upsert(second) == {3}
+    assert await store.async_count() == 3
+
+
+async def test_upsert_repeated_id(store: RecallStore):
+    """Test that a recall repeated in one write is stored once, as last seen."""
+    recall = {
+        "id": 1,
+        "publication_date": "2024-01-01T00:00:00+00:00",
+        "product_name": "Éclair",
+    }
+
+    changes = await store.async_upsert_changes(
+        [recall, {**recall, "product_name": "Chou"}]
+    )
+
+    assert changes.inserted == {1}
+    assert await store.async_count() == 1
+    results = await store.async_search(SearchCriteria.from_lists(["chou"]), 10)
+    assert [result["product_name"] for result in results] == ["Chou"]
+
+
+async def test_watermark_and_recent(store: RecallStore):
+    """Test the watermark and newest-first ordering."""
+    assert await store.async_get_watermark() is None
+    assert await store.async_get_recent(10) == []
+
+    await store.async_upsert(
+        [
+            {"id": 10, "publication_date": "2024-03-01T08:00:00+00:00"},
+            {"id": 11, "publication_date": "2024-03-02T08:00:00+00:00"},
+            {"id": 9, "publication_date": "2024-02-01T08:00:00+00:00"},
+        ]
+    )
+
+    assert await store.async_get_watermark() == "2024-03-02T08:00:00+00:00"
+    recent = await store.async_get_recent(2)
+    assert [recall["id"] for recall in recent] == [11, 10]
+
+
+async def test_total_count_persists(hass: HomeAssistant, tmp_path):
+    """Test that the recorded dataset size survives a reopen."""
+    path = str(tmp_path / "recalls.db")
+    recall_store = RecallStore(hass, path)
+    await recall_store.async_open()
+    assert await recall_store.async_get_total_count() == 0
+    await recall_store.async_set_total_count(16341)
+    await recall_store.async_close()
+
+    reopened = RecallStore(hass, path)
+    await reopened.async_open()
+    assert await reopened.async_get_total_count() == 16341
+    await reopened.async_close()
+
+
+async def test_search_index(store: RecallStore):
+    """Test case-insensitive partial matching through the search index."""
+    await store.async_upsert(
+        [
+            {
+                "id": 1,
+                "publication_date": "2024-01-01T00:00:00+00:00",
+                "product_name": "Éclair au chocolat",
+                "brand": "Pâtisserie Durand",
+                "category": "alimentation",
+                "recall_reason": "Présence de Listeria monocytogenes",
+            },
+            {
+                "id": 2,
+                "publication_date": "2024-01-02T00:00:00+00:00",
+                "product_name": "Crème solaire",
+                "brand": "Soleil",
+                "category": "hygiene-beaute",
+                "recall_reason": "Contamination microbiologique",
+            },
+        ]
+    )
+
+    async def search_ids(**criteria: list[str]) -> list[int]:
+        results = await store.async_search(SearchCriteria.from_lists(**criteria), 10)
+        return [recall["id"] for recall in results]
+
+    assert await search_ids(product_names=["ÉCLAIR"]) == [1]
+    assert await search_ids(keywords=["listeria"]) == [1]
+    assert await search_ids(keywords=["soleil", "chocolat"]) == [2, 1]
+    assert await search_ids(keywords=["on"], categories=["hygiene-beaute"]) == [2]
+    assert await search_ids(brands=["durand"], categories=["hygiene-beaute"]) == []
+    assert await search_ids(product_names=["100%"]) == []
+
+    # Replacing a recall keeps a single, updated index row
+    await store.async_upsert(
+        [{"id": 1, "publication_date": "2024-01-01T00:00:00+00:00", "brand": "X"}]
+    )
+    assert await search_ids(product_names=["éclair"]) == []
+    assert await search_ids(brands=["x"]) == [1]
+
+
+async def test_summary_rows_keep_details(store: RecallStore):
+    """Test that polled summaries do not discard previously fetched details."""
+    full = {
+        "id": 1,
+        "publication_date": "2024-01-01T00:00:00+00:00",
+        "version_number": 1,
+        "product_name": "Éclair",
+        "consumer_actions": "Ne plus consommer",
+    }
+    await store.async_upsert(
+        [{k: v for k, v in full.items() if k != "consumer_actions"}], detailed=False
+    )
+    assert await store.async_get_undetailed([1]) == [1]
+
+    await store.async_upsert([full])
+    assert await store.async_get_undetailed([1]) == []
+
+    # Same version: the summary is merged into the detailed record
+    await store.async_upsert(
+        [{"id": 1, "version_number": 1, "product_name": "Éclair au café"}],
+        detailed=False,
+    )
+    assert await store.async_get_undetailed([1]) == []
+    (stored,) = await store.async_get_many([1])
+    assert stored["product_name"] == "Éclair au café"
+    assert stored["consumer_actions"] == "Ne plus consommer"
+
+    # A new version needs its details fetched again
+    await store.async_upsert([{"id": 1, "version_number": 2}], detailed=False)
+    assert await store.async_get_undetailed([1]) == [1]
+
+
+async def test_upsert_classifies_changes(store: RecallStore):
+    """Test that recalls are classified by the content hash of their sheet."""
+    first = {
+        "id": 1,
+        "sheet_number": "2024-01-0001",
+        "version_number": 1,
+        "publication_date": "2024-01-01T00:00:00+00:00",
+        "risks": "Listeria",
+    }
+    changes = await store.async_upsert_changes([first], detailed=False)
+    assert changes.inserted == {1}
+    assert changes.updated == []
+
+    # Fields outside the hash do not make an update
+    changes = await store.async_upsert_changes([{**first, "packaging": "Boîte"}])
+    assert changes.unchanged == 1
+    assert changes.updated == []
+
+    # A new version under a new ID updates the sheet
+    second = {**first, "id": 2, "version_number": 2, "risks": "Salmonelle"}
+    changes = await store.async_upsert_changes([second], detailed=False)
+    assert changes.inserted == {2}
+    (update,) = changes.updated
+    assert update.recall["id"] == 2
+    assert update.previous_id == 1
+    assert update.changes == {
+        "version_number": {"old": 1, "new": 2},
+        "risks": {"old": "Listeria", "new": "Salmonelle"},
+    }
+
+    # An older version seen again, e.g. by a bootstrap, is ignored
+    changes = await store.async_upsert_changes([first])
+    assert changes.updated == []
+    assert changes.unchanged == 0
+    changes = await store.async_upsert_changes([second])
+    assert changes.unchanged == 1
+
+
+async def test_versions_rebuilt_on_open(hass: HomeAssistant, tmp_path):
+    """Test that the content hashes are rebuilt for an existing database."""
+    path = str(tmp_path / "recalls.db")
+    recall_store = RecallStore(hass, path)
+    await recall_store.async_open()
+    recall = {"id": 1, "recall_guid": "abc", "risks": "Listeria"}
+    await recall_store.async_upsert([recall])
+    await recall_store.async_set_meta(META_INDEX_VERSION, "1")
+    await recall_store.async_close()
+
+    reopened = RecallStore(hass, path)
+    await reopened.async_open()
+    changes = await reopened.async_upsert_changes([{**recall, "risks": "E. coli"}])
+    assert [update.changes for update in changes.updated] == [
+        {"risks": {"old": "Listeria", "new": "E. coli"}}
+    ]
+    await reopened.async_close()
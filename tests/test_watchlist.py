@@ -0,0 +1,75 @@
+"""Tests for the watchlist matcher."""
+
+from __future__ import annotations
+
+import pytest
+import voluptuous as vol
+
+from custom_components.rappel_conso.watchlist import (
+    AhoCorasick,
+    WatchlistMatcher,
+    validate_watchlists,
+)
+
+
+def test_aho_corasick_finds_overlapping_patterns():
+    """Test that every occurrence is found in one pass."""
+    automaton = AhoCorasick(
+        (pattern, (pattern, "term")) for pattern in ("he", "she", "his", "hers")
+    )
+
+    found = [name for name, _ in automaton.search("ushers")]
+
+    assert sorted(found) == ["he", "hers", "she"]
+
+
+def test_matcher_matches_any_term():
+    """Test that a recall matches the watchlists of any of its terms."""
+    matcher = WatchlistMatcher(
+        validate_watchlists(
+            [
+                {"name": "desserts", "product_names": ["Cookie Dough", "tiramisu"]},
+                {"name": "carrefour", "brands": ["carrefour"]},
+                {"name": "pantry", "gtins": ["3017620422003"]},
+                {"name": "food", "categories": ["Alimentation"]},
+                {"name": "other", "brands": ["lidl"], "categories": ["cosmetique"]},
+            ]
+        )
+    )
+    recall = {
+        "product_name": "Glace COOKIE DOUGH",
+        "brand": "Carrefour Sensation",
+        "category": "alimentation",
+        "product_identification": ["3017620422003 Lot 12345"],
+    }
+
+    assert matcher.match(recall) == {
+        "desserts": {"product_names"},
+        "carrefour": {"brands"},
+        "pantry": {"gtins"},
+        "food": {"categories"},
+    }
+
+
+def test_matcher_terms_only_match_their_field():
+    """Test that a brand term does not match a product name."""
+    matcher = WatchlistMatcher(
+        validate_watchlists([{"name": "brand", "brands": ["cookie"]}])
+    )
+
+    assert matcher.match({"product_name": "cookie", "brand": "other"}) == {}
+
+
+@pytest.mark.parametrize(
+    "watchlists",
+    [
+        [{"name": "empty"}],
+        [{"name": "twice", "brands": ["a"]}, {"name": "twice", "brands": ["b"]}],
+        [{"name": "barcode", "gtins": ["3017620422004"]}],
+        [{"brands": ["no name"]}],
+    ],
+)
+def test_invalid_watchlists(watchlists):
+    """Test that malformed watchlists are rejected."""
+    with pytest.raises(vol.Invalid):
+        validate_watchlists(watchlists)